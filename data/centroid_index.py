@@ -0,0 +1,153 @@
+"""
+Centroid Index for RAG System
+
+Groups chunk embeddings into clusters by cosine similarity so near-duplicate
+chunks (boilerplate headers, repeated marketing copy) can be detected at
+ingest time and left out of ChromaDB. Each cluster keeps the rolling mean of
+its members; the centroids are persisted to disk between runs. Clusters
+whose stored chunks have all been deleted are retired so they no longer
+swallow new chunks.
+"""
+
+from typing import Iterable, Optional, Tuple
+import logging
+import os
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class CentroidIndex:
+    """In-memory matrix of cluster centroids with cosine-similarity assignment"""
+
+    def __init__(self, threshold: float, path: Optional[str] = None):
+        self.threshold = threshold
+        self.path = path
+        self._lock = threading.Lock()
+
+        self._centroids = np.empty((0, 0), dtype=np.float32)
+        self._counts = np.empty(0, dtype=np.int64)
+        self._active = np.empty(0, dtype=bool)
+
+        if path and os.path.exists(path):
+            with np.load(path) as data:
+                self._centroids = data['centroids'].astype(np.float32)
+                self._counts = data['counts'].astype(np.int64)
+                if 'active' in data:
+                    self._active = data['active'].astype(bool)
+                else:
+                    self._active = np.ones(len(self._counts), dtype=bool)
+            logger.info(f"Loaded {len(self._counts)} centroids from {path}")
+
+        logger.info(f"Semantic deduplication enabled (threshold={threshold})")
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """Scale rows to unit length, leaving zero rows as zero"""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def assign(self, embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Assign each embedding to its nearest cluster, creating clusters as needed
+
+        Embeddings within threshold of an existing centroid join that cluster
+        and are flagged as duplicates; the rest start new clusters.
+
+        Args:
+            embeddings: float32 array of shape (n, dim)
+
+        Returns:
+            Tuple of (centroid id per row, boolean duplicate mask)
+        """
+        n = len(embeddings)
+        centroid_ids = np.empty(n, dtype=np.int64)
+        duplicate = np.zeros(n, dtype=bool)
+        if n == 0:
+            return centroid_ids, duplicate
+
+        unit = self._normalize(embeddings.astype(np.float32, copy=False))
+
+        with self._lock:
+            if self._centroids.shape[1:] != unit.shape[1:]:
+                if len(self._counts):
+                    logger.warning("Embedding dimension changed, discarding stored centroids")
+                self._centroids = np.empty((0, unit.shape[1]), dtype=np.float32)
+                self._counts = np.empty(0, dtype=np.int64)
+                self._active = np.empty(0, dtype=bool)
+
+            # Match against existing centroids with one matrix product
+            existing = len(self._counts)
+            if existing and self._active.any():
+                sims = unit @ self._normalize(self._centroids).T
+                sims[:, ~self._active] = -2.0
+                best = sims.argmax(axis=1)
+                matched = sims[np.arange(n), best] >= self.threshold
+                centroid_ids[matched] = best[matched]
+                duplicate[matched] = True
+            else:
+                matched = np.zeros(n, dtype=bool)
+
+            # Rows that matched nothing may still repeat each other within the batch
+            new_rows = []
+            for i in np.flatnonzero(~matched):
+                if new_rows:
+                    sims = unit[new_rows] @ unit[i]
+                    j = int(sims.argmax())
+                    if sims[j] >= self.threshold:
+                        centroid_ids[i] = existing + j
+                        duplicate[i] = True
+                        continue
+                centroid_ids[i] = existing + len(new_rows)
+                new_rows.append(i)
+
+            self._centroids = np.vstack([self._centroids, embeddings[new_rows].astype(np.float32)])
+            self._counts = np.concatenate([self._counts, np.zeros(len(new_rows), dtype=np.int64)])
+            self._active = np.concatenate([self._active, np.ones(len(new_rows), dtype=bool)])
+
+            # Rolling mean over cluster members
+            for i in range(n):
+                c = centroid_ids[i]
+                self._counts[c] += 1
+                if self._counts[c] > 1:
+                    self._centroids[c] += (embeddings[i] - self._centroids[c]) / self._counts[c]
+
+        return centroid_ids, duplicate
+
+    def retire(self, centroid_ids: Iterable[int]) -> None:
+        """
+        Stop matching new embeddings against the given clusters
+
+        Cluster IDs stay reserved, since stored chunks reference them.
+
+        Args:
+            centroid_ids: IDs of clusters with no stored chunks left
+        """
+        with self._lock:
+            ids = [c for c in centroid_ids if 0 <= c < len(self._active)]
+            self._active[ids] = False
+        if ids:
+            logger.info(f"Retired {len(ids)} centroids")
+
+    def reset(self) -> None:
+        """Forget every cluster, e.g. after the collection was cleared"""
+        with self._lock:
+            self._centroids = np.empty((0, 0), dtype=np.float32)
+            self._counts = np.empty(0, dtype=np.int64)
+            self._active = np.empty(0, dtype=bool)
+        logger.info("Cleared centroid index")
+
+    def save(self) -> None:
+        """Persist the centroids to path, if one was given"""
+        if not self.path:
+            return
+
+        path_dir = os.path.dirname(self.path)
+        if path_dir:
+            os.makedirs(path_dir, exist_ok=True)
+
+        with self._lock:
+            with open(self.path, 'wb') as f:
+                np.savez(f, centroids=self._centroids, counts=self._counts, active=self._active)
+        logger.info(f"Saved {len(self._counts)} centroids to {self.path}")
@@ -1,4 +1,4 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -8,6 +8,12 @@ class Settings(BaseSettings):
     CHROMADB_HOST: str = "localhost"
     CHROMADB_PORT: int = 8000
     CHROMA_COLLECTION_NAME: str = "rag_documents"
+    CHROMA_DOCUMENTS_COLLECTION_NAME: str = "rag_documents_meta"
+    CHROMA_ADD_BATCH_SIZE: int = 200
+    INGEST_FLUSH_SIZE: int = 5000  # Chunks buffered across documents before writing to ChromaDB
+    CHROMA_SCAN_PAGE_SIZE: int = 10000  # Records fetched per page when scanning metadata
+    CHROMA_MAX_CONCURRENT_ADDS: int = 4  # Batched add calls kept in flight at once
+    DOCUMENT_CACHE_TTL_SECONDS: float = 60.0  # Max age of cached list_documents/get_stats results
 
     # NVIDIA NIM Configuration
     NVIDIA_API_KEY: str = ""
@@ -17,21 +23,59 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str = "nvidia/nv-embed-v1"
     VISION_MODEL: str = "microsoft/phi-3-vision-128k-instruct"
 
+    # Embedding Dispatch
+    EMBEDDING_SUB_BATCH_SIZE: int = 64  # Chunks per embedding request
+    EMBEDDING_MAX_INFLIGHT: int = 5  # Concurrent embedding requests
+    EMBEDDING_DTYPE: str = "float32"  # Precision sent to ChromaDB: "float32", "float16" or "int8" (Chroma stores float32 either way; float16 saves nothing, int8 needs a cosine collection)
+
     # Document Processing
+    PDF_BACKEND: str = "pymupdf"  # Text extraction backend: "pymupdf", "pypdfium2" or "pypdf"
     CHUNK_SIZE: int = 1500
     CHUNK_OVERLAP: int = 300
+    PARALLEL_EXTRACTION_MIN_PAGES: int = 4  # Use a process pool for PDFs with at least this many pages
+    MAX_PAGES_PER_PDF: int = 2000  # Pages beyond this are not indexed
+    PAGE_EXTRACTION_TIMEOUT_SECONDS: float = 30.0  # Pages taking longer than this are skipped
+    PAGES_PER_EXTRACTION_TASK: int = 16  # Pages handed to each parallel extraction task
+    PDF_EXTRACTION_EXECUTOR: str = "process"  # "process" or "thread" (thread is ignored for pypdfium2)
+    PDF_BATCH_WORKERS: int = 4  # Worker processes extracting PDFs in batch runs (capped at the CPU count)
 
     # Upload Settings
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE_MB: int = 100
+    BATCH_MAX_CONCURRENCY: int = 8  # Files processed at once by the async batch endpoints
+    MAX_CONCURRENT_INGESTS: int = 4  # Upload/batch requests indexed at once by the API; the rest wait
+    CSV_CHUNK_ROWS: int = 10000  # Rows read per block when streaming CSV files
+    IN_MEMORY_UPLOAD_MAX_MB: int = 32  # JSON/CSV uploads up to this size are processed without a temp file
+
+    # Embedding Cache
+    ENABLE_EMBEDDING_CACHE: bool = True
+    EMBEDDING_CACHE_PATH: str = "embedding_cache.db"
+    EMBEDDING_MODEL_VERSION: str = ""  # Bump when the model behind EMBEDDING_MODEL changes to stop reusing old vectors
+    ENABLE_NEAR_DUPLICATE_CACHE: bool = True
+    NEAR_DUPLICATE_THRESHOLD: float = 0.95  # Minimum MinHash Jaccard similarity to reuse an embedding
+    SEMANTIC_DEDUPE_THRESHOLD: float = 0.0  # Cosine similarity to a cluster centroid above which a chunk isn't stored (0 disables)
+    CENTROID_INDEX_PATH: str = "centroids.npz"
 
     # Multimodal Settings
     ENABLE_OCR: bool = True
     ENABLE_IMAGE_CAPTIONING: bool = False  # Set to True to use NVIDIA vision model for image descriptions
     IMAGE_STORAGE_PATH: str = "image_store"
+    PERSIST_IMAGES: bool = False  # Write images extracted from PDFs to IMAGE_STORAGE_PATH
+    IMAGE_STORE_FORMAT: str = "native"  # Persisted image format: "native" (extracted bytes as-is), "webp" or "raw" (.npy pixels)
     MAX_IMAGE_SIZE_MB: int = 10
     SUPPORTED_IMAGE_FORMATS: list = ["jpg", "jpeg", "png", "webp"]
     TESSERACT_CMD: str = r"C:\Program Files\Tesseract-OCR\tesseract.exe"  # Path to Tesseract executable
+    OCR_BACKEND: str = "tesseract"  # "tesseract" or "paddle_gpu" (PaddleOCR on a local GPU, Tesseract fallback)
+    OCR_WORKERS: int = 0  # OCR processes per PDF (0 = CPU count)
+    CAPTION_WORKERS: int = 8  # Captioning threads per PDF
+    CAPTION_MAX_CONCURRENCY: int = 16  # Concurrent async captioning requests per PDF
+    MIN_OCR_SIDE: int = 32  # PDF images with a shorter side (px) are skipped as icons/spacers (keep small: text banners and labels can be narrow)
+    MAX_OCR_SIDE: int = 2000  # Longest image side (px) passed to OCR
+    MAX_CAPTION_SIDE: int = 1024  # Longest image side (px) sent to the vision model
+    ENABLE_IMAGE_TEXT_CACHE: bool = True  # Reuse OCR/caption results for identical images
+    IMAGE_TEXT_CACHE_PATH: str = "image_text_cache.db"
+    IMAGE_TEXT_CACHE_TTL_DAYS: int = 30  # 0 = never expire
+    IMAGE_PHASH_MAX_DISTANCE: int = -1  # Max pHash bit difference to treat same-sized images in a PDF as duplicates (-1 = off, exact bytes only; >0 may copy text between different images)
 
     # Service Configuration
     LOG_LEVEL: str = "INFO"
@@ -42,9 +86,7 @@ class Settings(BaseSettings):
         """Get ChromaDB URL"""
         return f"http://{self.CHROMADB_HOST}:{self.CHROMADB_PORT}"
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, frozen=True)
 
 
 settings = Settings()
@@ -1,48 +1,547 @@
+import asyncio
 import chromadb
-from pypdf import PdfReader
-from typing import List, Dict, Any, Optional
+import contextvars
+import multiprocessing
+import hashlib
+import io
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Union
 import logging
 import os
+import queue
+import threading
 import uuid
-import json
+import orjson
+import time
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    TimeoutError as FuturesTimeoutError,
+    as_completed,
+    wait as wait_futures
+)
+from datetime import datetime, timezone
 from config import settings
 from embedding_service import EmbeddingService
+from embedding_cache import EmbeddingCache
+from centroid_index import CentroidIndex
 from multimodal_processor import MultimodalProcessor
+from pdf_reader import open_pdf
 
 logger = logging.getLogger(__name__)
 
+# Registry collection metadata; "index_version" is added on every change so
+# the query service knows when to drop its cached answers
+_REGISTRY_METADATA = {"description": "RAG document registry"}
+
+# Who buffered a record, so a failed write is reported to the caller whose
+# documents it held; async batches set their own owner, which their worker
+# threads inherit, and everything else is identified by its thread
+_write_owner: contextvars.ContextVar[Optional[object]] = contextvars.ContextVar("write_owner", default=None)
+
+
+def _current_write_owner() -> Any:
+    """Return the owner of records buffered from the current context"""
+    owner = _write_owner.get()
+    return owner if owner is not None else threading.get_ident()
+
+
+# Worker processes are spawned, not forked: this process runs the ChromaDB
+# writer and other threads holding locks a forked child could inherit held
+_PROCESS_CONTEXT = multiprocessing.get_context("spawn")
+
+# Chunking parameters, resolved once at import
+_CHUNK_SIZE = settings.CHUNK_SIZE
+_CHUNK_STEP = settings.CHUNK_SIZE - settings.CHUNK_OVERLAP
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# ASCII whitespace code points (space, \t, \n, \v, \f, \r)
+_WHITESPACE_CODEPOINTS = np.array([0x20, 0x09, 0x0a, 0x0b, 0x0c, 0x0d], dtype=np.uint32)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _plan_chunks_jit(codepoints, size, step):
+        """Walk the windows once, keeping those with a non-whitespace code point"""
+        n = codepoints.shape[0]
+        count = (n + step - 1) // step
+        starts = np.empty(count, np.int64)
+        ends = np.empty(count, np.int64)
+        k = 0
+        for start in range(0, n, step):
+            end = min(start + size, n)
+            for j in range(start, end):
+                c = codepoints[j]
+                if c != 0x20 and (c < 0x09 or c > 0x0d):
+                    starts[k] = start
+                    ends[k] = end
+                    k += 1
+                    break
+        return starts[:k], ends[:k]
+
+    # Compile (or load from cache) at import rather than on the first document
+    _plan_chunks_jit(np.zeros(1, dtype=np.uint32), _CHUNK_SIZE, _CHUNK_STEP)
+else:
+    _plan_chunks_jit = None
+
+
+def _plan_chunks(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the boundaries of every non-blank overlapping chunk window
+
+    Args:
+        text: Text to chunk
+
+    Returns:
+        Tuple of (starts, ends) index arrays for the windows to emit
+    """
+    # Code points rather than UTF-8 bytes, so indices line up with str slicing
+    codepoints = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    if _plan_chunks_jit is not None:
+        return _plan_chunks_jit(codepoints, _CHUNK_SIZE, _CHUNK_STEP)
+
+    n = len(text)
+    starts = np.arange(0, n, _CHUNK_STEP, dtype=np.int64)
+    ends = np.minimum(starts + _CHUNK_SIZE, n)
+
+    # A window is kept if it contains any non-whitespace character, which a
+    # prefix sum over the code points answers for all windows at once
+    content = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(~np.isin(codepoints, _WHITESPACE_CODEPOINTS), out=content[1:])
+    keep = content[ends] > content[starts]
+
+    return starts[keep], ends[keep]
+
+
+def _quantize_embeddings(embeddings: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Reduce embedding precision before shipping vectors to ChromaDB
+
+    The chromadb HttpClient serializes embeddings as JSON floats and the
+    server stores them as float32, so "float16" only rounds the values; it
+    saves neither bandwidth nor storage. "int8" shrinks the JSON payload but
+    drops vector norms, so it needs a cosine-space collection.
+
+    Args:
+        embeddings: float32 embedding array
+        dtype: Target precision ("float32", "float16" or "int8")
+
+    Returns:
+        Tuple of (quantized embeddings, per-vector int8 scales or None)
+    """
+    if dtype == "float16":
+        return embeddings.astype(np.float16), None
+
+    if dtype == "int8":
+        scales = np.abs(embeddings).max(axis=1) / 127
+        scales[scales == 0] = 1.0
+        quantized = np.round(embeddings / scales[:, None]).astype(np.int8)
+        return quantized, scales
+
+    return embeddings, None
+
+
+def _resolve_pdf_backend(backend: str) -> str:
+    """Return the PDF backend to use, falling back to pypdf if unavailable"""
+    if backend == "pypdfium2" and pdfium is None:
+        logger.warning("pypdfium2 not available, falling back to pypdf for text extraction")
+        return "pypdf"
+    if backend == "pymupdf" and pymupdf is None:
+        logger.warning("pymupdf not available, falling back to pypdf for text extraction")
+        return "pypdf"
+    return backend
+
+
+def _extract_page_texts(file_path: str, page_nums: List[int], backend: str) -> List[str]:
+    """
+    Extract text from the given PDF pages with a single open document
+
+    Args:
+        file_path: Path to the PDF file
+        page_nums: Zero-based page indices
+        backend: PDF backend name ("pymupdf", "pypdfium2" or "pypdf")
+
+    Returns:
+        Extracted text for each requested page
+    """
+    if backend == "pymupdf":
+        try:
+            doc = pymupdf.open(file_path)
+        except Exception as e:
+            # Encrypted or unusual files MuPDF rejects are retried with pypdf
+            logger.warning(f"pymupdf could not open {file_path}, falling back to pypdf: {e}")
+            return _extract_page_texts(file_path, page_nums, "pypdf")
+        try:
+            return [doc[page_num].get_text("text") for page_num in page_nums]
+        finally:
+            doc.close()
+
+    if backend == "pypdfium2":
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            texts = []
+            for page_num in page_nums:
+                page = pdf[page_num]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+            return texts
+        finally:
+            pdf.close()
+
+    with open_pdf(file_path) as reader:
+        return [reader.pages[page_num].extract_text() for page_num in page_nums]
+
+
+def _pdf_page_count(file_path: str, backend: str) -> int:
+    """
+    Count a PDF's pages with the backend that will extract its text
+
+    Args:
+        file_path: Path to the PDF file
+        backend: PDF backend name ("pymupdf", "pypdfium2" or "pypdf")
+
+    Returns:
+        Number of pages
+    """
+    if backend == "pymupdf":
+        try:
+            with pymupdf.open(file_path) as doc:
+                return doc.page_count
+        except Exception as e:
+            # Extraction falls back to pypdf for the same files
+            logger.warning(f"pymupdf could not open {file_path}, falling back to pypdf: {e}")
+
+    elif backend == "pypdfium2":
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    with open_pdf(file_path) as reader:
+        return len(reader.pages)
+
+
+def _join_page_texts(page_texts: List[Optional[str]]) -> str:
+    """Assemble page texts with [Page N] markers in a single join"""
+    return "".join(
+        f"\n\n[Page {page_num + 1}]\n{text or ''}"
+        for page_num, text in enumerate(page_texts)
+    )
+
+
+_IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.webp'})
+_PDF_EXTENSIONS = frozenset({'.pdf'})
+
+
+def _list_files(directory: str, extensions: frozenset) -> List[str]:
+    """
+    List the names of regular files in a directory with one of the given extensions
+
+    Files are ordered largest first, so batch workers start on the slowest
+    files and the smallest ones fill in at the end instead of leaving a
+    single straggler.
+
+    Args:
+        directory: Directory to scan
+        extensions: Lowercase extensions including the dot
+
+    Returns:
+        Matching filenames, by descending size
+    """
+    with os.scandir(directory) as entries:
+        files = [
+            (entry.name, entry.stat().st_size) for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions
+        ]
+    files.sort(key=lambda item: item[1], reverse=True)
+    return [name for name, _ in files]
+
+
+def _open_source(source: Union[str, bytes]):
+    """Open a file path, or wrap an in-memory upload, as a binary file object"""
+    return io.BytesIO(source) if isinstance(source, bytes) else open(source, 'rb')
+
+
+def _source_name(source: Union[str, bytes], source_name: Optional[str]) -> str:
+    """Name recorded as source_file: the given name, else the file's basename"""
+    if source_name:
+        return source_name
+    return os.path.basename(source) if isinstance(source, str) else "upload"
+
+
+def _iter_json_records(source: Union[str, bytes]) -> Iterator[Any]:
+    """
+    Iterate the records of a JSON file without loading it all at once
+
+    Args:
+        source: Path to JSON file, or its raw bytes, holding an array of
+            records or a single record
+
+    Yields:
+        Each array item, or the top-level value if it is not an array
+    """
+    if ijson is None:
+        with _open_source(source) as f:
+            data = orjson.loads(f.read())
+        yield from (data if isinstance(data, list) else [data])
+        return
+
+    with _open_source(source) as f:
+        # Peek at the first significant byte to tell an array from a single record
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+
+        yield from ijson.items(f, 'item' if first == b'[' else '', use_float=True)
+
+
+def _check_pdf_size(file_path: str, filename: str) -> None:
+    """Raise ValueError if a PDF exceeds MAX_UPLOAD_SIZE_MB"""
+    size_mb = os.path.getsize(file_path) / (1024 * 1024)
+    if size_mb > settings.MAX_UPLOAD_SIZE_MB:
+        raise ValueError(
+            f"{filename} is {size_mb:.1f} MB, exceeding the {settings.MAX_UPLOAD_SIZE_MB} MB limit"
+        )
+
+
+def _file_digest(file_path: str) -> str:
+    """Return the blake2b content hash of a file, read in 1 MB blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _pdf_batch_workers(num_workers: Optional[int] = None) -> int:
+    """Number of extraction processes for a batch run (defaults to PDF_BATCH_WORKERS)"""
+    return max(1, min(num_workers or settings.PDF_BATCH_WORKERS, os.cpu_count() or 1))
+
+
+# Per-process MultimodalProcessor for batch extraction workers
+_worker_multimodal_processor = None
+
+
+def _init_pdf_worker() -> None:
+    """Create the MultimodalProcessor used by a batch extraction worker"""
+    global _worker_multimodal_processor
+    # The batch already runs one PDF per process, so OCR stays in-process
+    _worker_multimodal_processor = MultimodalProcessor(settings, ocr_workers=1)
+
+
+def _extract_pdf_content(file_path: str, document_id: str, backend: str) -> Dict[str, Any]:
+    """
+    Extract the text and image descriptions of a PDF
+
+    Runs in a batch worker process, so it only returns plain picklable values.
+
+    Args:
+        file_path: Path to the PDF file
+        document_id: Document ID used to name extracted images
+        backend: PDF backend name ("pymupdf", "pypdfium2" or "pypdf")
+
+    Returns:
+        Dictionary with content, page_count, has_images and image_count
+    """
+    # The document is only parsed by the backend doing the extraction
+    if backend == "pypdf":
+        with open_pdf(file_path) as reader:
+            page_count = min(len(reader.pages), settings.MAX_PAGES_PER_PDF)
+            page_texts = [reader.pages[page_num].extract_text() for page_num in range(page_count)]
+    else:
+        page_count = min(_pdf_page_count(file_path, backend), settings.MAX_PAGES_PER_PDF)
+        page_texts = _extract_page_texts(file_path, list(range(page_count)), backend)
+
+    all_text = _join_page_texts(page_texts)
+
+    multimodal_result = _worker_multimodal_processor.process_pdf_with_images(
+        file_path, document_id, all_text
+    )
+
+    return {
+        "content": multimodal_result['content'],
+        "page_count": page_count,
+        "has_images": multimodal_result['has_images'],
+        "image_count": multimodal_result['image_count']
+    }
+
 
 class DocumentService:
     """Service for managing documents and indexing into ChromaDB"""
 
-    def __init__(self, embedding_service: EmbeddingService):
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        embed_batch_size: Optional[int] = None,
+        dedupe_threshold: Optional[float] = None,
+        chroma_batch_size: Optional[int] = None,
+        embedding_dtype: Optional[str] = None
+    ):
         self.embedding_service = embedding_service
 
+        # Precision of vectors sent to ChromaDB ("float32", "float16" or "int8")
+        self.embedding_dtype = embedding_dtype or settings.EMBEDDING_DTYPE
+
+        # Chunks per embedding request; callers such as bulk ingestion can
+        # raise this above EMBEDDING_SUB_BATCH_SIZE to cut request overhead
+        self.embed_batch_size = embed_batch_size or settings.EMBEDDING_SUB_BATCH_SIZE
+
         # Initialize multimodal processor
         self.multimodal_processor = MultimodalProcessor(settings)
 
-        # Connect to ChromaDB
+        # Connect to ChromaDB; one client (and connection pool) is shared by
+        # every call, and telemetry is off to avoid an extra request per operation
         self.chroma_client = chromadb.HttpClient(
             host=settings.CHROMADB_HOST,
-            port=settings.CHROMADB_PORT
+            port=settings.CHROMADB_PORT,
+            settings=chromadb.config.Settings(anonymized_telemetry=False)
         )
 
         # Get or create collection
         try:
             self.collection = self.chroma_client.get_or_create_collection(
                 name=settings.CHROMA_COLLECTION_NAME,
-                metadata={"description": "RAG document collection"}
+                metadata=self._collection_metadata()
             )
             logger.info(f"Connected to collection: {settings.CHROMA_COLLECTION_NAME}")
+
+            # Compact registry with one row per document
+            self.docs_collection = self.chroma_client.get_or_create_collection(
+                name=settings.CHROMA_DOCUMENTS_COLLECTION_NAME,
+                metadata=_REGISTRY_METADATA
+            )
+            if self.docs_collection.count() == 0 and self.collection.count() > 0:
+                self._backfill_document_registry()
         except Exception as e:
             logger.error(f"Failed to connect to ChromaDB: {e}")
             raise
 
+        if (self.embedding_dtype == "int8"
+                and (self.collection.metadata or {}).get("hnsw:space") != "cosine"):
+            raise ValueError(
+                "int8 embeddings need a cosine-space collection; rebuild the index to switch distance"
+            )
+
+        # Never send more records per add call than the server accepts
+        self._add_batch_size = chroma_batch_size or settings.CHROMA_ADD_BATCH_SIZE
+        try:
+            self._add_batch_size = min(self._add_batch_size, self.chroma_client.get_max_batch_size())
+        except Exception as e:
+            logger.debug(f"Could not query ChromaDB max batch size: {e}")
+
+        # Records buffered across documents until the next flush
+        self._pending_lock = threading.Lock()
+        self._pending_ids = []
+        self._pending_embeddings = []
+        self._pending_docs = []
+        self._pending_meta = []
+        self._pending_registry = []
+        self._pending_owners = set()  # Owners (see _current_write_owner) of the buffered records
+
+        # Background writer so ChromaDB writes overlap the next document's embedding
+        self._write_queue = queue.Queue(maxsize=4)
+        self._last_write = None
+        # First failed write per owner that buffered records into it, raised
+        # by that owner's next waiting flush
+        self._write_errors: Dict[Any, Exception] = {}
+        self._writer = threading.Thread(target=self._writer_loop, name="chroma-writer", daemon=True)
+        self._writer.start()
+
         # Ensure upload directory exists
         os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 
+        # Cached list_documents/get_stats results, invalidated on every write
+        self._version = 0
+        self._doc_cache = None
+        self._stats_cache = None
+
+        # Persistent chunk embedding cache, namespaced by model and model version
+        self.embedding_cache = None
+        if settings.ENABLE_EMBEDDING_CACHE:
+            cache_namespace = settings.EMBEDDING_MODEL
+            if settings.EMBEDDING_MODEL_VERSION:
+                cache_namespace = f"{cache_namespace}@{settings.EMBEDDING_MODEL_VERSION}"
+            self.embedding_cache = EmbeddingCache(
+                settings.EMBEDDING_CACHE_PATH,
+                cache_namespace,
+                near_duplicate_threshold=(
+                    settings.NEAR_DUPLICATE_THRESHOLD
+                    if settings.ENABLE_NEAR_DUPLICATE_CACHE else None
+                )
+            )
+
+        # Optional centroid index that keeps near-duplicate chunks out of the collection
+        self.centroid_index = None
+        dedupe_threshold = dedupe_threshold if dedupe_threshold is not None else settings.SEMANTIC_DEDUPE_THRESHOLD
+        if dedupe_threshold > 0:
+            self.centroid_index = CentroidIndex(dedupe_threshold, settings.CENTROID_INDEX_PATH)
+
+    def _collection_metadata(self) -> Dict[str, Any]:
+        """Metadata for the chunk collection, matching the configured embedding precision"""
+        metadata = {"description": "RAG document collection"}
+        if self.embedding_dtype == "int8":
+            # Per-vector int8 scales only preserve angles, not L2 distances
+            metadata["hnsw:space"] = "cosine"
+        return metadata
+
+    def iter_chunks(self, text: str) -> Iterator[str]:
+        """
+        Lazily split text into chunks with overlap
+
+        Args:
+            text: Text to chunk
+
+        Yields:
+            Non-blank text chunks
+        """
+        starts, ends = _plan_chunks(text)
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            yield text[start:end]
+
+    @staticmethod
+    def _unique_chunks(chunk_iter: Iterator[str], positions: Dict[str, List[int]]) -> Iterator[str]:
+        """
+        Drop exact-duplicate chunks, recording every position each chunk occurs at
+
+        Args:
+            chunk_iter: Iterator of text chunks
+            positions: Filled with chunk text -> chunk indices, in order
+
+        Yields:
+            First occurrence of each distinct chunk
+        """
+        for i, chunk in enumerate(chunk_iter):
+            indices = positions.setdefault(chunk, [])
+            indices.append(i)
+            if len(indices) == 1:
+                yield chunk
+
     def chunk_text(self, text: str) -> List[str]:
         """
         Split text into chunks with overlap
@@ -53,133 +552,864 @@ class DocumentService:
         Returns:
             List of text chunks
         """
-        chunks = []
-        chunk_size = settings.CHUNK_SIZE
-        overlap = settings.CHUNK_OVERLAP
-
-        for i in range(0, len(text), chunk_size - overlap):
-            chunk = text[i:i + chunk_size]
-            if chunk.strip():
-                chunks.append(chunk)
+        chunks = list(self.iter_chunks(text))
 
         logger.info(f"Created {len(chunks)} chunks from text")
         return chunks
 
-    def process_pdf(self, file_path: str, filename: str) -> Dict[str, Any]:
+    def _embed_concurrent(
+        self,
+        chunks: List[str],
+        sub_batch: Optional[int] = None,
+        max_inflight: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Embed chunks as concurrent sub-batches to overlap API round-trips
+
+        Args:
+            chunks: Text chunks to embed
+            sub_batch: Chunks per embed_batch call (defaults to embed_batch_size)
+            max_inflight: Maximum concurrent requests (defaults to EMBEDDING_MAX_INFLIGHT;
+                ignored when the embedding service's persistent pool is running)
+
+        Returns:
+            float32 embedding array, in the same order as chunks
+        """
+        sub_batch = sub_batch or self.embed_batch_size
+        max_inflight = max_inflight or settings.EMBEDDING_MAX_INFLIGHT
+
+        if len(chunks) <= sub_batch:
+            return self.embedding_service.embed_batch(chunks)
+
+        # Prefer the embedding service's persistent pool when one is running
+        shared_pool = self.embedding_service.pool
+        executor = shared_pool or ThreadPoolExecutor(max_workers=max_inflight)
+        try:
+            futures = [
+                executor.submit(self.embedding_service.embed_batch, chunks[start:start + sub_batch])
+                for start in range(0, len(chunks), sub_batch)
+            ]
+
+            return np.concatenate([future.result() for future in futures])
+        finally:
+            if executor is not shared_pool:
+                executor.shutdown(wait=True)
+
+    def _embed_chunks(self, chunks: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for chunks, embedding each distinct text only once
+
+        Args:
+            chunks: Text chunks to embed
+
+        Returns:
+            float32 embedding array, in the same order as chunks
+        """
+        unique = list(dict.fromkeys(chunks))
+        if len(unique) == len(chunks):
+            return self._embed_unique(chunks)
+
+        logger.info(f"Skipping {len(chunks) - len(unique)} repeated chunks in batch")
+        positions = {chunk: i for i, chunk in enumerate(unique)}
+        embeddings = self._embed_unique(unique)
+        return embeddings[[positions[chunk] for chunk in chunks]]
+
+    def _embed_unique(self, chunks: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for distinct chunks, reusing cached vectors where possible
+
+        Args:
+            chunks: Distinct text chunks to embed
+
+        Returns:
+            float32 embedding array, in the same order as chunks
+        """
+        if not self.embedding_cache:
+            return self._embed_concurrent(chunks)
+
+        hashes = [EmbeddingCache.hash_text(chunk) for chunk in chunks]
+        cached = self.embedding_cache.get_many(hashes)
+
+        embeddings = [cached.get(h) for h in hashes]
+        missed_idx = [i for i, h in enumerate(hashes) if h not in cached]
+
+        # Reuse embeddings of near-identical cached chunks
+        near_duplicates = self.embedding_cache.get_near_duplicates([chunks[i] for i in missed_idx])
+        for pos, embedding in near_duplicates.items():
+            embeddings[missed_idx[pos]] = embedding
+
+        uncached_idx = [i for pos, i in enumerate(missed_idx) if pos not in near_duplicates]
+        uncached_texts = [chunks[i] for i in uncached_idx]
+
+        logger.info(
+            f"Embedding cache: {len(cached)} exact hits, {len(near_duplicates)} near-duplicate hits, "
+            f"{len(uncached_idx)} misses"
+        )
+
+        if uncached_texts:
+            new_embeddings = self._embed_concurrent(uncached_texts)
+            for i, embedding in zip(uncached_idx, new_embeddings):
+                embeddings[i] = embedding
+            self.embedding_cache.put_many(
+                [hashes[i] for i in uncached_idx],
+                new_embeddings,
+                texts=uncached_texts
+            )
+
+        return np.stack(embeddings)
+
+    def _embed_stream(self, chunk_iter: Iterator[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        Embed chunks while they are still being produced
+
+        A background thread drains chunk_iter into sub-batches on a bounded
+        queue; each batch is submitted for embedding as soon as it arrives.
+
+        Args:
+            chunk_iter: Iterator of text chunks
+
+        Returns:
+            Tuple of (chunks, float32 embedding array), in chunk order
+        """
+        sub_batch = self.embed_batch_size
+        batch_queue = queue.Queue(maxsize=4)
+        producer_errors = []
+
+        def produce():
+            try:
+                batch = []
+                for chunk in chunk_iter:
+                    batch.append(chunk)
+                    if len(batch) == sub_batch:
+                        batch_queue.put(batch)
+                        batch = []
+                if batch:
+                    batch_queue.put(batch)
+            except Exception as e:
+                producer_errors.append(e)
+            finally:
+                batch_queue.put(None)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+
+        chunks = []
+        futures = []
+        with ThreadPoolExecutor(max_workers=settings.EMBEDDING_MAX_INFLIGHT) as executor:
+            for batch in iter(batch_queue.get, None):
+                chunks.extend(batch)
+                futures.append(executor.submit(self._embed_chunks, batch))
+
+        producer.join()
+        if producer_errors:
+            raise producer_errors[0]
+
+        if not futures:
+            return chunks, np.empty((0, 0), dtype=np.float32)
+
+        return chunks, np.concatenate([future.result() for future in futures])
+
+    def _add_in_batches(
+        self,
+        ids: List[str],
+        embeddings: np.ndarray,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Add records to ChromaDB in fixed-size batches
+
+        Args:
+            ids: Chunk IDs
+            embeddings: float32 embedding array, quantized to embedding_dtype before sending
+            documents: Chunk texts
+            metadatas: Chunk metadata
+            batch_size: Records per add call (defaults to chroma_batch_size or
+                CHROMA_ADD_BATCH_SIZE, capped by the server)
+
+        Returns:
+            Number of records added
+
+        Raises:
+            Exception: The first failed add call; earlier batches may already be stored
+        """
+        assert embeddings.dtype == np.float32, f"Expected float32 embeddings, got {embeddings.dtype}"
+        embeddings, scales = _quantize_embeddings(embeddings, self.embedding_dtype)
+        if scales is not None:
+            for metadata, scale in zip(metadatas, scales.tolist()):
+                metadata["embedding_scale"] = scale
+
+        batch_size = batch_size or self._add_batch_size
+        starts = range(0, len(ids), batch_size)
+
+        def add_batch(start: int) -> int:
+            end = start + batch_size
+            try:
+                self.collection.add(
+                    ids=ids[start:end],
+                    embeddings=embeddings[start:end],
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end]
+                )
+                return len(ids[start:end])
+            except Exception as e:
+                logger.error(f"Error adding batch {start}-{min(end, len(ids))} to ChromaDB: {e}")
+                raise
+
+        if len(starts) <= 1:
+            return sum(add_batch(start) for start in starts)
+
+        # Overlap the HTTP round-trips of independent batches
+        max_workers = min(settings.CHROMA_MAX_CONCURRENT_ADDS, len(starts))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return sum(executor.map(add_batch, starts))
+
+    def _buffer_records(
+        self,
+        ids: List[str],
+        embeddings: np.ndarray,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        document_id: str,
+        registry_metadata: Dict[str, Any]
+    ) -> None:
+        """
+        Queue one document's records for the next flush, flushing once the buffer is full
+
+        Args:
+            ids: Chunk IDs
+            embeddings: Embedding array, stored as contiguous float32
+            documents: Chunk texts
+            metadatas: Chunk metadata
+            document_id: Document ID
+            registry_metadata: Document-level metadata for the registry row
+        """
+        if self.centroid_index is not None:
+            ids, embeddings, documents, metadatas = self._drop_semantic_duplicates(
+                ids, embeddings, documents, metadatas
+            )
+            registry_metadata = {**registry_metadata, "chunks_count": len(ids)}
+
+        with self._pending_lock:
+            self._pending_ids.extend(ids)
+            self._pending_embeddings.append(np.ascontiguousarray(embeddings, dtype=np.float32))
+            self._pending_docs.extend(documents)
+            self._pending_meta.extend(metadatas)
+            self._pending_registry.append((document_id, registry_metadata))
+            self._pending_owners.add(_current_write_owner())
+            full = len(self._pending_ids) >= settings.INGEST_FLUSH_SIZE
+
+        if full:
+            self._flush(wait=False)
+
+    def _drop_semantic_duplicates(
+        self,
+        ids: List[str],
+        embeddings: np.ndarray,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ) -> Tuple[List[str], np.ndarray, List[str], List[Dict[str, Any]]]:
+        """
+        Remove chunks that fall within SEMANTIC_DEDUPE_THRESHOLD of an existing cluster
+
+        Kept chunks record their cluster as centroid_id metadata.
+
+        Args:
+            ids: Chunk IDs
+            embeddings: Embedding array
+            documents: Chunk texts
+            metadatas: Chunk metadata
+
+        Returns:
+            The kept (ids, embeddings, documents, metadatas)
+        """
+        centroid_ids, duplicate = self.centroid_index.assign(np.asarray(embeddings, dtype=np.float32))
+        if duplicate.any():
+            logger.info(f"Skipping {int(duplicate.sum())} near-duplicate chunks")
+
+        keep = np.flatnonzero(~duplicate)
+        kept_metadatas = []
+        for i in keep:
+            metadata = metadatas[i]
+            metadata["centroid_id"] = int(centroid_ids[i])
+            kept_metadatas.append(metadata)
+
+        return (
+            [ids[i] for i in keep],
+            embeddings[keep],
+            [documents[i] for i in keep],
+            kept_metadatas
+        )
+
+    def _flush(self, wait: bool = True) -> Optional[Future]:
+        """
+        Hand all buffered records to the background writer
+
+        Args:
+            wait: Block until this and every earlier write has reached ChromaDB
+
+        Returns:
+            Future resolving to the number of records added, or None if nothing was queued
+
+        Raises:
+            Exception: When waiting, the first failed write that held records
+                buffered by the caller
+        """
+        with self._pending_lock:
+            if not self._pending_registry:
+                future = None
+            else:
+                future = Future()
+                batch = {
+                    "ids": self._pending_ids,
+                    "embeddings": self._pending_embeddings,
+                    "documents": self._pending_docs,
+                    "metadatas": self._pending_meta,
+                    "registry": self._pending_registry
+                }
+                owners = self._pending_owners
+                self._pending_ids = []
+                self._pending_embeddings = []
+                self._pending_docs = []
+                self._pending_meta = []
+                self._pending_registry = []
+                self._pending_owners = set()
+                self._write_queue.put((batch, owners, future))
+                self._last_write = future
+            last_write = self._last_write
+
+        # The writer is FIFO, so the most recent write finishing implies all earlier ones did
+        if wait and last_write is not None:
+            # A failed write of another caller's records is reported to that caller, not here
+            wait_futures([last_write])
+            with self._pending_lock:
+                error = self._write_errors.pop(_current_write_owner(), None)
+            if error is not None:
+                raise error
+        return future
+
+    def _writer_loop(self) -> None:
+        """Drain the write queue, adding each batch to ChromaDB"""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+
+            batch, owners, future = item
+            try:
+                future.set_result(self._write_batch(**batch))
+            except Exception as e:
+                logger.error(f"Error writing batch to ChromaDB: {e}")
+                with self._pending_lock:
+                    for owner in owners:
+                        self._write_errors.setdefault(owner, e)
+                future.set_exception(e)
+
+    def _write_batch(
+        self,
+        ids: List[str],
+        embeddings: List[np.ndarray],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        registry: List[Tuple[str, Dict[str, Any]]]
+    ) -> int:
+        """
+        Add one flushed batch of chunk records and registry rows to ChromaDB
+
+        Registry rows are only written once every chunk is stored; on failure the
+        batch's chunks are removed again so no document is left half-indexed.
+
+        Returns:
+            Number of records added
+
+        Raises:
+            RuntimeError: If any chunk could not be added
+        """
+        start = time.perf_counter()
+        try:
+            added = self._add_in_batches(ids, np.concatenate(embeddings), documents, metadatas)
+            if added != len(ids):
+                raise RuntimeError(f"Only {added} of {len(ids)} chunks were added")
+        except Exception as e:
+            try:
+                self.collection.delete(ids=ids)
+            except Exception as cleanup_error:
+                logger.warning(f"Could not remove partially added chunks: {cleanup_error}")
+            raise RuntimeError(
+                f"Failed to index {len(registry)} documents ({len(ids)} chunks): {e}"
+            ) from e
+
+        self._register_documents(registry)
+        self._invalidate_caches()
+        elapsed = time.perf_counter() - start
+
+        logger.info(
+            f"Flushed {added} chunks from {len(registry)} documents to ChromaDB "
+            f"in {elapsed:.2f}s ({added / max(elapsed, 1e-9):.0f} inserts/s)"
+        )
+        return added
+
+    def close(self) -> None:
+        """Write any buffered records, stop the background writer and release resources"""
+        try:
+            self._flush()
+        finally:
+            self._write_queue.put(None)
+            self._writer.join()
+            if self.embedding_cache:
+                self.embedding_cache.close()
+            if self.centroid_index is not None:
+                self.centroid_index.save()
+            MultimodalProcessor.shutdown_executors()
+
+    def _extract_text_backend(self, file_path: str) -> List[str]:
+        """
+        Extract the text of every page using the configured PDF backend
+
+        Pages are counted with that backend too, so pypdf only parses the
+        file when it is the configured (or fallback) backend.
+
+        Args:
+            file_path: Path to the PDF file
+
+        Returns:
+            List of page texts, in page order
+        """
+        backend = _resolve_pdf_backend(settings.PDF_BACKEND)
+
+        def capped(page_count: int) -> int:
+            if page_count > settings.MAX_PAGES_PER_PDF:
+                logger.warning(
+                    f"PDF has {page_count} pages, only the first {settings.MAX_PAGES_PER_PDF} will be indexed"
+                )
+            return min(page_count, settings.MAX_PAGES_PER_PDF)
+
+        if backend == "pypdf":
+            with open_pdf(file_path) as reader:
+                page_count = capped(len(reader.pages))
+                if page_count < settings.PARALLEL_EXTRACTION_MIN_PAGES:
+                    return [reader.pages[page_num].extract_text() for page_num in range(page_count)]
+        else:
+            page_count = capped(_pdf_page_count(file_path, backend))
+            if page_count < settings.PARALLEL_EXTRACTION_MIN_PAGES:
+                return _extract_page_texts(file_path, list(range(page_count)), backend)
+
+        # Each task covers a run of pages so workers open the document once per run
+        step = settings.PAGES_PER_EXTRACTION_TASK
+        page_ranges = [
+            list(range(start, min(start + step, page_count)))
+            for start in range(0, page_count, step)
+        ]
+
+        # MuPDF is native code and can run in threads; pdfium is not thread-safe
+        if settings.PDF_EXTRACTION_EXECUTOR == "thread" and backend != "pypdfium2":
+            executor = ThreadPoolExecutor(max_workers=min(8, os.cpu_count()))
+        else:
+            executor = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_PROCESS_CONTEXT)
+
+        timeout = settings.PAGE_EXTRACTION_TIMEOUT_SECONDS
+        try:
+            futures = [
+                (pages, executor.submit(_extract_page_texts, file_path, pages, backend))
+                for pages in page_ranges
+            ]
+
+            texts = []
+            for pages, future in futures:
+                try:
+                    texts.extend(future.result(timeout=timeout * len(pages)))
+                except FuturesTimeoutError:
+                    logger.warning(
+                        f"Timed out extracting pages {pages[0] + 1}-{pages[-1] + 1} of {file_path}, skipping"
+                    )
+                    texts.extend([""] * len(pages))
+            return texts
+        finally:
+            # Don't block on workers still stuck on a timed-out page
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def process_pdf(self, file_path: str, filename: str, flush: bool = True) -> Dict[str, Any]:
         """
         Process a PDF file: extract text, images, chunk, embed, and store in ChromaDB
 
         Args:
             file_path: Path to the PDF file
             filename: Original filename
+            flush: Write to ChromaDB immediately; batch callers pass False and flush once
 
         Returns:
             Dictionary with processing results
         """
+        _check_pdf_size(file_path, filename)
+
+        content_hash = _file_digest(file_path)
+        existing = self._find_by_content_hash(content_hash)
+        if existing:
+            return self._skipped_result(filename, existing)
+
         try:
             # Generate document ID early for image extraction
             document_id = f"doc_{uuid.uuid4().hex[:12]}"
 
-            # Extract text from PDF
-            reader = PdfReader(file_path)
-            all_text = ""
-            page_count = len(reader.pages)
-
-            for page_num, page in enumerate(reader.pages):
-                text = page.extract_text()
-                all_text += f"\n\n[Page {page_num + 1}]\n{text}"
-
-            logger.info(f"Extracted text from {page_count} pages of {filename}")
+            page_count, all_text = self._read_pdf_text(file_path, filename)
 
             # Process images and convert to text
             multimodal_result = self.multimodal_processor.process_pdf_with_images(
                 file_path, document_id, all_text
             )
-            all_text = multimodal_result['content']
-            has_images = multimodal_result['has_images']
-            image_count = multimodal_result['image_count']
+            logger.info(f"Multimodal processing: {multimodal_result['image_count']} images found")
 
-            logger.info(f"Multimodal processing: {image_count} images found")
+            return self._index_pdf_content(document_id, filename, {
+                "content": multimodal_result['content'],
+                "page_count": page_count,
+                "has_images": multimodal_result['has_images'],
+                "image_count": multimodal_result['image_count'],
+                "content_hash": content_hash
+            }, flush=flush)
 
-            # Chunk the text
-            chunks = self.chunk_text(all_text)
+        except Exception as e:
+            logger.error(f"Error processing PDF {filename}: {e}")
+            raise
 
-            if not chunks:
-                logger.warning(f"No chunks created from {filename}")
-                return {
-                    "document_id": None,
-                    "filename": filename,
-                    "status": "failed",
-                    "error": "No text content found in PDF"
-                }
+    async def process_pdf_async(self, file_path: str, filename: str, flush: bool = True) -> Dict[str, Any]:
+        """
+        Process a PDF file without blocking the event loop
 
-            # Generate embeddings for all chunks
-            logger.info(f"Generating embeddings for {len(chunks)} chunks...")
-            embeddings = self.embedding_service.embed_batch(chunks)
+        Same as process_pdf, but image captions are requested concurrently with
+        the async vision client while extraction, OCR and indexing run in
+        worker threads.
 
-            # Prepare data for ChromaDB
-            ids = [f"{document_id}_chunk_{i}" for i in range(len(chunks))]
-            metadatas = [
-                {
-                    "document_id": document_id,
-                    "filename": filename,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks),
-                    "indexed_at": datetime.utcnow().isoformat(),
-                    "has_images": has_images,
-                    "image_count": image_count
-                }
-                for i in range(len(chunks))
-            ]
+        Args:
+            file_path: Path to the PDF file
+            filename: Original filename
+            flush: Write to ChromaDB immediately; batch callers pass False and flush once
+
+        Returns:
+            Dictionary with processing results
+        """
+        _check_pdf_size(file_path, filename)
 
-            # Add to ChromaDB
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=chunks,
-                metadatas=metadatas
+        content_hash = await asyncio.to_thread(_file_digest, file_path)
+        existing = await asyncio.to_thread(self._find_by_content_hash, content_hash)
+        if existing:
+            return self._skipped_result(filename, existing)
+
+        try:
+            document_id = f"doc_{uuid.uuid4().hex[:12]}"
+
+            page_count, all_text = await asyncio.to_thread(self._read_pdf_text, file_path, filename)
+
+            multimodal_result = await self.multimodal_processor.process_pdf_with_images_async(
+                file_path, document_id, all_text
             )
+            logger.info(f"Multimodal processing: {multimodal_result['image_count']} images found")
+
+            return await asyncio.to_thread(self._index_pdf_content, document_id, filename, {
+                "content": multimodal_result['content'],
+                "page_count": page_count,
+                "has_images": multimodal_result['has_images'],
+                "image_count": multimodal_result['image_count'],
+                "content_hash": content_hash
+            }, flush)
+
+        except Exception as e:
+            logger.error(f"Error processing PDF {filename}: {e}")
+            raise
+
+    def _read_pdf_text(self, file_path: str, filename: str) -> Tuple[int, str]:
+        """
+        Extract the text of a PDF with [Page N] markers
+
+        Args:
+            file_path: Path to the PDF file
+            filename: Original filename, for logging
+
+        Returns:
+            Tuple of (page count, joined page text)
+        """
+        page_texts = self._extract_text_backend(file_path)
+        page_count = len(page_texts)
+
+        logger.info(f"Extracted text from {page_count} pages of {filename}")
 
-            logger.info(f"Successfully indexed {filename} with {len(chunks)} chunks")
+        return page_count, _join_page_texts(page_texts)
 
+    def _index_pdf_content(
+        self,
+        document_id: str,
+        filename: str,
+        extracted: Dict[str, Any],
+        flush: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Chunk, embed and store already-extracted PDF content
+
+        Args:
+            document_id: Document ID
+            filename: Original filename
+            extracted: Output of _extract_pdf_content (content, page_count, has_images,
+                image_count), optionally with the file's content_hash
+            flush: Write to ChromaDB immediately
+
+        Returns:
+            Dictionary with processing results
+        """
+        all_text = extracted['content']
+        page_count = extracted['page_count']
+        has_images = extracted['has_images']
+        image_count = extracted['image_count']
+        content_hash = extracted.get('content_hash')
+
+        # Chunk the text and embed chunks as they are produced,
+        # embedding repeated chunks (headers, footers) only once
+        logger.info(f"Chunking and embedding {filename}...")
+        positions = {}
+        chunks, embeddings = self._embed_stream(
+            self._unique_chunks(self.iter_chunks(all_text), positions)
+        )
+
+        if not chunks:
+            logger.warning(f"No chunks created from {filename}")
             return {
-                "document_id": document_id,
+                "document_id": None,
                 "filename": filename,
-                "status": "indexed",
-                "chunks_count": len(chunks),
-                "page_count": page_count,
-                "has_images": has_images,
-                "image_count": image_count
+                "status": "failed",
+                "error": "No text content found in PDF"
             }
 
+        total_chunks = sum(len(indices) for indices in positions.values())
+        logger.info(
+            f"Generated embeddings for {len(chunks)} unique chunks "
+            f"({total_chunks - len(chunks)} duplicates skipped)"
+        )
+
+        # Prepare data for ChromaDB
+        base_metadata = {
+            "document_id": document_id,
+            "filename": filename,
+            "total_chunks": total_chunks,
+            "indexed_at": datetime.now(timezone.utc).isoformat(),
+            "has_images": has_images,
+            "image_count": image_count
+        }
+        if content_hash:
+            base_metadata["content_hash"] = content_hash
+        id_prefix = f"{document_id}_chunk_"
+        ids = []
+        metadatas = []
+        for chunk in chunks:
+            indices = positions[chunk]
+            ids.append(id_prefix + str(indices[0]))
+            metadata = base_metadata.copy()
+            metadata["chunk_index"] = indices[0]
+            if len(indices) > 1:
+                # Chroma metadata values must be scalars
+                metadata["chunk_indices"] = ",".join(map(str, indices))
+            metadatas.append(metadata)
+
+        # Add to ChromaDB
+        self._buffer_records(ids, embeddings, chunks, metadatas, document_id, {
+            "filename": filename,
+            "chunks_count": len(chunks),
+            "indexed_at": base_metadata["indexed_at"],
+            "has_images": has_images,
+            "image_count": image_count,
+            "content_hash": content_hash
+        })
+        if flush:
+            self._flush()
+
+        logger.info(f"Successfully indexed {filename} with {len(chunks)} chunks")
+
+        return {
+            "document_id": document_id,
+            "filename": filename,
+            "status": "indexed",
+            "chunks_count": len(chunks),
+            "page_count": page_count,
+            "has_images": has_images,
+            "image_count": image_count
+        }
+
+    def _find_by_content_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an already-registered document by the hash of its source file
+
+        A registry row whose chunks are missing from the collection (e.g. left
+        by an interrupted write) is dropped rather than trusted.
+
+        Args:
+            content_hash: blake2b digest from _file_digest
+
+        Returns:
+            The document's registry metadata, or None if no indexed document has that hash
+        """
+        result = self.docs_collection.get(
+            where={"content_hash": content_hash},
+            limit=1,
+            include=["metadatas"]
+        )
+        if not result['metadatas']:
+            return None
+
+        existing = result['metadatas'][0]
+        if existing.get('chunks_count', 0) > 0:
+            chunks = self.collection.get(
+                where={"document_id": existing['document_id']},
+                limit=1,
+                include=[]
+            )
+            if not chunks['ids']:
+                logger.warning(
+                    f"Registry entry {existing['document_id']} has no chunks in ChromaDB; re-indexing"
+                )
+                self.docs_collection.delete(ids=[existing['document_id']])
+                return None
+
+        return existing
+
+    @staticmethod
+    def _skipped_result(filename: str, existing: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the result for a file whose content is already indexed"""
+        logger.info("Skipping duplicate %s: already indexed as %s", filename, existing['document_id'])
+        return {
+            "document_id": existing['document_id'],
+            "filename": filename,
+            "status": "skipped",
+            "chunks_count": existing.get('chunks_count', 0)
+        }
+
+    def _register_documents(self, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Upsert the registry rows describing a set of documents
+
+        Args:
+            entries: (document_id, document-level metadata) pairs, with
+                metadata such as filename, chunks_count and indexed_at
+        """
+        if not entries:
+            return
+
+        self.docs_collection.upsert(
+            ids=[document_id for document_id, _ in entries],
+            embeddings=[[0.0]] * len(entries),
+            metadatas=[
+                {
+                    "document_id": document_id,
+                    **{key: value for key, value in metadata.items() if value is not None}
+                }
+                for document_id, metadata in entries
+            ]
+        )
+
+    @staticmethod
+    def _iter_metadatas(collection, page_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every record's metadata from a collection, one page at a time
+
+        Args:
+            collection: ChromaDB collection to scan
+            page_size: Records fetched per request (defaults to CHROMA_SCAN_PAGE_SIZE)
+
+        Yields:
+            Record metadata dictionaries
+        """
+        page_size = page_size or settings.CHROMA_SCAN_PAGE_SIZE
+        offset = 0
+        while True:
+            page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            if not page['metadatas']:
+                return
+            yield from page['metadatas']
+            offset += page_size
+
+    def _backfill_document_registry(self) -> None:
+        """Populate the document registry from existing chunk metadata"""
+        logger.info("Backfilling document registry from chunk metadata...")
+
+        documents = {}
+        for metadata in self._iter_metadatas(self.collection):
+            doc_id = metadata.get('document_id')
+            if not doc_id:
+                continue
+            if doc_id not in documents:
+                documents[doc_id] = {
+                    "filename": metadata.get('filename') or metadata.get('source_file'),
+                    "chunks_count": 0,
+                    "indexed_at": metadata.get('indexed_at')
+                }
+            documents[doc_id]["chunks_count"] += 1
+
+        self._register_documents(list(documents.items()))
+
+        logger.info(f"Registered {len(documents)} existing documents")
+
+    def _invalidate_caches(self) -> None:
+        """Mark cached document listings and stats, and the query service's cached answers, as stale"""
+        self._version += 1
+        try:
+            self.docs_collection.modify(
+                metadata={**_REGISTRY_METADATA, "index_version": uuid.uuid4().hex}
+            )
         except Exception as e:
-            logger.error(f"Error processing PDF {filename}: {e}")
-            raise
+            logger.warning(f"Could not publish index version: {e}")
 
-    def list_documents(self) -> List[Dict[str, Any]]:
+    def _get_cached(self, cache: Optional[Tuple[int, float, Any]]) -> Optional[Any]:
         """
-        List all indexed documents
+        Return a cached value if it matches the current version and TTL
+
+        Args:
+            cache: Tuple of (version, timestamp, value) or None
+
+        Returns:
+            Cached value, or None if missing or stale
+        """
+        if cache is None:
+            return None
+
+        version, cached_at, value = cache
+        if version != self._version:
+            return None
+        if time.monotonic() - cached_at > settings.DOCUMENT_CACHE_TTL_SECONDS:
+            return None
+        return value
+
+    def list_documents(self, document_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        List indexed documents
+
+        Args:
+            document_ids: Only return these documents (defaults to all)
 
         Returns:
             List of document metadata
         """
+        if document_ids is None:
+            cached = self._get_cached(self._doc_cache)
+            if cached is not None:
+                return list(cached)
+
         try:
-            # Get all items from collection
-            results = self.collection.get()
-
-            # Group by document_id
-            documents = {}
-            for i, metadata in enumerate(results['metadatas']):
-                doc_id = metadata.get('document_id')
-                if doc_id and doc_id not in documents:
-                    documents[doc_id] = {
-                        "document_id": doc_id,
-                        "filename": metadata.get('filename'),
-                        "chunks_count": metadata.get('total_chunks', 0),
-                        "indexed_at": metadata.get('indexed_at')
-                    }
-
-            return list(documents.values())
+            version = self._version
+            # One registry row per document, looked up by id when filtering
+            if document_ids is not None:
+                metadatas = self.docs_collection.get(ids=document_ids, include=["metadatas"])['metadatas']
+            else:
+                metadatas = self._iter_metadatas(self.docs_collection)
+
+            documents = [
+                {
+                    "document_id": metadata.get('document_id'),
+                    "filename": metadata.get('filename'),
+                    "chunks_count": metadata.get('chunks_count', 0),
+                    "indexed_at": metadata.get('indexed_at')
+                }
+                for metadata in metadatas
+            ]
+            if document_ids is None:
+                self._doc_cache = (version, time.monotonic(), documents)
+            return list(documents)
 
         except Exception as e:
             logger.error(f"Error listing documents: {e}")
@@ -196,12 +1426,22 @@ class DocumentService:
             Dictionary with deletion results
         """
         try:
-            # Get all chunk IDs for this document
-            results = self.collection.get(
-                where={"document_id": document_id}
-            )
-
-            if not results['ids']:
+            # Chunk count comes from the registry row; for documents indexed
+            # before the registry existed, diff the collection size instead.
+            # A registered document may have no chunks (semantic dedupe can
+            # drop them all), so it exists if either is present
+            centroid_ids = self._document_centroid_ids(document_id)
+            entry = self.docs_collection.get(ids=[document_id], include=["metadatas"])
+            registered = bool(entry['ids'])
+            if registered:
+                chunks_deleted = entry['metadatas'][0].get('chunks_count', 0)
+                self.collection.delete(where={"document_id": document_id})
+            else:
+                count_before = self.collection.count()
+                self.collection.delete(where={"document_id": document_id})
+                chunks_deleted = count_before - self.collection.count()
+
+            if not registered and not chunks_deleted:
                 logger.warning(f"Document {document_id} not found")
                 return {
                     "status": "not_found",
@@ -209,21 +1449,54 @@ class DocumentService:
                     "chunks_deleted": 0
                 }
 
-            # Delete all chunks
-            self.collection.delete(ids=results['ids'])
+            if registered:
+                self.docs_collection.delete(ids=[document_id])
+            self._retire_orphaned_centroids(centroid_ids)
+            self._invalidate_caches()
 
-            logger.info(f"Deleted document {document_id} with {len(results['ids'])} chunks")
+            logger.info(f"Deleted document {document_id} with {chunks_deleted} chunks")
 
             return {
                 "status": "deleted",
                 "document_id": document_id,
-                "chunks_deleted": len(results['ids'])
+                "chunks_deleted": chunks_deleted
             }
 
         except Exception as e:
             logger.error(f"Error deleting document {document_id}: {e}")
             raise
 
+    def _document_centroid_ids(self, document_id: str) -> List[int]:
+        """Return the dedupe clusters a document's stored chunks belong to"""
+        if self.centroid_index is None:
+            return []
+
+        result = self.collection.get(where={"document_id": document_id}, include=["metadatas"])
+        return sorted({
+            metadata["centroid_id"] for metadata in result['metadatas'] if "centroid_id" in metadata
+        })
+
+    def _retire_orphaned_centroids(self, centroid_ids: List[int]) -> None:
+        """
+        Retire dedupe clusters that no longer have any stored chunk
+
+        Otherwise new chunks matching a deleted document's content would be
+        dropped as duplicates of chunks that are gone.
+
+        Args:
+            centroid_ids: Clusters of the deleted chunks
+        """
+        if self.centroid_index is None or not centroid_ids:
+            return
+
+        remaining = self.collection.get(
+            where={"centroid_id": {"$in": centroid_ids}},
+            include=["metadatas"]
+        )
+        still_used = {metadata["centroid_id"] for metadata in remaining['metadatas']}
+        self.centroid_index.retire(c for c in centroid_ids if c not in still_used)
+        self.centroid_index.save()
+
     def rebuild_index(self) -> Dict[str, Any]:
         """
         Delete all documents and rebuild index from scratch
@@ -231,15 +1504,27 @@ class DocumentService:
         Returns:
             Dictionary with rebuild results
         """
+        collection_name = settings.CHROMA_COLLECTION_NAME
+        docs_collection_name = settings.CHROMA_DOCUMENTS_COLLECTION_NAME
+
         try:
-            # Delete collection
-            self.chroma_client.delete_collection(name=settings.CHROMA_COLLECTION_NAME)
+            # Delete collections
+            self.chroma_client.delete_collection(name=collection_name)
+            self.chroma_client.delete_collection(name=docs_collection_name)
 
-            # Recreate collection
+            # Recreate collections
             self.collection = self.chroma_client.create_collection(
-                name=settings.CHROMA_COLLECTION_NAME,
-                metadata={"description": "RAG document collection"}
+                name=collection_name,
+                metadata=self._collection_metadata()
             )
+            self.docs_collection = self.chroma_client.create_collection(
+                name=docs_collection_name,
+                metadata=_REGISTRY_METADATA
+            )
+            if self.centroid_index is not None:
+                self.centroid_index.reset()
+                self.centroid_index.save()
+            self._invalidate_caches()
 
             logger.info("Successfully rebuilt index")
 
@@ -259,35 +1544,43 @@ class DocumentService:
         Returns:
             Dictionary with stats
         """
-        try:
-            results = self.collection.get()
+        cached = self._get_cached(self._stats_cache)
+        if cached is not None:
+            return dict(cached)
 
-            # Count unique documents
-            unique_docs = set()
-            for metadata in results['metadatas']:
-                doc_id = metadata.get('document_id')
-                if doc_id:
-                    unique_docs.add(doc_id)
+        collection_name = settings.CHROMA_COLLECTION_NAME
 
-            return {
-                "total_documents": len(unique_docs),
-                "total_chunks": len(results['ids']),
-                "collection_name": settings.CHROMA_COLLECTION_NAME
+        try:
+            version = self._version
+            total_documents = 0
+            total_chunks = 0
+            for metadata in self._iter_metadatas(self.docs_collection):
+                total_documents += 1
+                total_chunks += metadata.get('chunks_count', 0)
+
+            stats = {
+                "total_documents": total_documents,
+                "total_chunks": total_chunks,
+                "collection_name": collection_name
             }
+            self._stats_cache = (version, time.monotonic(), stats)
+            return dict(stats)
 
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
             return {
                 "total_documents": 0,
                 "total_chunks": 0,
-                "collection_name": settings.CHROMA_COLLECTION_NAME
+                "collection_name": collection_name
             }
 
     def process_text_data(
         self,
         text_content: str,
         document_id: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        flush: bool = True,
+        indexed_at: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Process plain text or structured text data and add to ChromaDB
@@ -296,27 +1589,16 @@ class DocumentService:
             text_content: The text content to process
             document_id: Optional custom document ID
             metadata: Optional metadata to attach to chunks
+            flush: Write to ChromaDB immediately; batch callers pass False and flush once
+            indexed_at: ISO timestamp shared by a batch (defaults to now)
 
         Returns:
             Dictionary with processing results
         """
         try:
-            # Generate document ID if not provided
-            if not document_id:
-                document_id = f"doc_{uuid.uuid4().hex[:12]}"
-
-            # Initialize metadata if not provided
-            if metadata is None:
-                metadata = {}
-
-            # Add default metadata
-            metadata.update({
-                "document_id": document_id,
-                "indexed_at": datetime.utcnow().isoformat()
-            })
-
-            # Chunk the text
-            chunks = self.chunk_text(text_content)
+            document_id, chunks, metadata = self._prepare_text_record(
+                text_content, document_id, metadata, indexed_at
+            )
 
             if not chunks:
                 logger.warning(f"No chunks created from text content")
@@ -328,26 +1610,11 @@ class DocumentService:
 
             # Generate embeddings for all chunks
             logger.info(f"Generating embeddings for {len(chunks)} chunks...")
-            embeddings = self.embedding_service.embed_batch(chunks)
+            embeddings = self._embed_chunks(chunks)
 
-            # Prepare data for ChromaDB
-            ids = [f"{document_id}_chunk_{i}" for i in range(len(chunks))]
-            metadatas = [
-                {
-                    **metadata,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks)
-                }
-                for i in range(len(chunks))
-            ]
-
-            # Add to ChromaDB
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=chunks,
-                metadatas=metadatas
-            )
+            self._buffer_text_document(document_id, chunks, embeddings, metadata)
+            if flush:
+                self._flush()
 
             logger.info(f"Successfully indexed document {document_id} with {len(chunks)} chunks")
 
@@ -361,7 +1628,116 @@ class DocumentService:
             logger.error(f"Error processing text data: {e}")
             raise
 
-    def process_json(self, file_path: str) -> Dict[str, Any]:
+    def _prepare_text_record(
+        self,
+        text_content: str,
+        document_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        indexed_at: Optional[str] = None
+    ) -> Tuple[str, List[str], Dict[str, Any]]:
+        """
+        Assign an ID and default metadata to a text document and chunk it
+
+        Args:
+            text_content: The text content to process
+            document_id: Optional custom document ID
+            metadata: Optional metadata to attach to chunks
+            indexed_at: ISO timestamp shared by a batch (defaults to now)
+
+        Returns:
+            Tuple of (document_id, chunks, metadata)
+        """
+        # Generate document ID if not provided
+        if not document_id:
+            document_id = f"doc_{uuid.uuid4().hex[:12]}"
+
+        # Initialize metadata if not provided
+        if metadata is None:
+            metadata = {}
+
+        # Add default metadata
+        metadata.update({
+            "document_id": document_id,
+            "indexed_at": indexed_at or datetime.now(timezone.utc).isoformat()
+        })
+
+        return document_id, self.chunk_text(text_content), metadata
+
+    def _buffer_text_document(
+        self,
+        document_id: str,
+        chunks: List[str],
+        embeddings: np.ndarray,
+        metadata: Dict[str, Any]
+    ) -> None:
+        """
+        Buffer an embedded text document for the next ChromaDB write
+
+        Args:
+            document_id: Document ID
+            chunks: Text chunks of the document
+            embeddings: float32 embedding array, aligned with chunks
+            metadata: Document metadata from _prepare_text_record
+        """
+        base_metadata = {**metadata, "total_chunks": len(chunks)}
+        id_prefix = f"{document_id}_chunk_"
+        ids = [id_prefix + str(i) for i in range(len(chunks))]
+        metadatas = []
+        for i in range(len(chunks)):
+            chunk_metadata = base_metadata.copy()
+            chunk_metadata["chunk_index"] = i
+            metadatas.append(chunk_metadata)
+
+        self._buffer_records(ids, embeddings, chunks, metadatas, document_id, {
+            "filename": metadata.get('filename') or metadata.get('source_file'),
+            "chunks_count": len(chunks),
+            "indexed_at": metadata["indexed_at"]
+        })
+
+    def _text_batch_limit(self) -> int:
+        """Chunks collected across records before one embedding pass"""
+        return self.embed_batch_size * settings.EMBEDDING_MAX_INFLIGHT
+
+    def _index_text_batch(
+        self,
+        batch: List[Tuple[str, str, List[str], Dict[str, Any]]]
+    ) -> Tuple[int, int, List[str]]:
+        """
+        Embed the chunks of many small documents together and buffer them
+
+        Records from JSON and CSV files are usually only a chunk or two long,
+        so embedding them one record at a time would send one small request
+        per record; this embeds the whole batch in embed_batch_size requests.
+
+        Args:
+            batch: (label, document_id, chunks, metadata) tuples, where label
+                names the record in error messages (e.g. "record 3")
+
+        Returns:
+            Tuple of (documents indexed, chunks indexed, error messages)
+        """
+        if not batch:
+            return 0, 0, []
+
+        all_chunks = [chunk for _, _, chunks, _ in batch for chunk in chunks]
+        try:
+            embeddings = self._embed_chunks(all_chunks)
+        except Exception as e:
+            errors = [f"Error processing {label}: {str(e)}" for label, _, _, _ in batch]
+            logger.error(f"Error embedding batch of {len(batch)} records: {e}")
+            return 0, 0, errors
+
+        offset = 0
+        for _, document_id, chunks, metadata in batch:
+            self._buffer_text_document(
+                document_id, chunks, embeddings[offset:offset + len(chunks)], metadata
+            )
+            offset += len(chunks)
+
+        logger.info(f"Indexed {len(batch)} records with {len(all_chunks)} chunks")
+        return len(batch), len(all_chunks), []
+
+    def process_json(self, source: Union[str, bytes], source_name: Optional[str] = None) -> Dict[str, Any]:
         """
         Process a JSON file and add documents to ChromaDB
 
@@ -385,24 +1761,31 @@ class DocumentService:
         ]
 
         Args:
-            file_path: Path to JSON file
+            source: Path to JSON file, or the file's contents for small uploads
+            source_name: Filename recorded as source_file (defaults to the path's basename)
 
         Returns:
             Dictionary with processing results
         """
         try:
-            logger.info(f"Processing JSON file: {file_path}")
+            source_file = _source_name(source, source_name)
+            logger.info(f"Processing JSON file: {source_file}")
 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Records are parsed lazily so embedding starts before the whole file is read
+            data = _iter_json_records(source)
 
-            if not isinstance(data, list):
-                data = [data]
+            # One timestamp for every record in the file
+            indexed_at = datetime.now(timezone.utc).isoformat()
 
             total_docs = 0
             total_chunks = 0
             errors = []
 
+            # Records are embedded together in batches rather than one by one
+            batch = []
+            batch_chunks = 0
+            batch_limit = self._text_batch_limit()
+
             for idx, item in enumerate(data):
                 try:
                     # Handle synthetic data format
@@ -427,7 +1810,7 @@ class DocumentService:
                             "company_name": client_data.get('company_name', ''),
                             "industry": client_data.get('industry', ''),
                             "contact_email": client_data.get('contact_email', ''),
-                            "source_file": os.path.basename(file_path)
+                            "source_file": source_file
                         }
 
                         # Add PDF path if present
@@ -444,25 +1827,24 @@ class DocumentService:
                     elif 'content' in item:
                         content = item['content']
                         doc_metadata = item.get('metadata', {})
-                        doc_metadata['source_file'] = os.path.basename(file_path)
+                        doc_metadata['source_file'] = source_file
 
                     else:
                         # Fallback: use entire item as text
-                        content = json.dumps(item, indent=2)
+                        content = orjson.dumps(item, option=orjson.OPT_INDENT_2).decode('utf-8')
                         doc_metadata = {
-                            "source_file": os.path.basename(file_path),
+                            "source_file": source_file,
                             "record_index": idx
                         }
 
-                    # Process the document
-                    result = self.process_text_data(
-                        text_content=content,
-                        metadata=doc_metadata
+                    # Queue the document for the next embedding batch
+                    document_id, chunks, doc_metadata = self._prepare_text_record(
+                        content, metadata=doc_metadata, indexed_at=indexed_at
                     )
-
-                    if result['status'] == 'indexed':
-                        total_docs += 1
-                        total_chunks += result['chunks_count']
+                    if not chunks:
+                        continue
+                    batch.append((f"record {idx}", document_id, chunks, doc_metadata))
+                    batch_chunks += len(chunks)
 
                 except Exception as e:
                     error_msg = f"Error processing record {idx}: {str(e)}"
@@ -470,9 +1852,24 @@ class DocumentService:
                     errors.append(error_msg)
                     continue
 
+                if batch_chunks >= batch_limit:
+                    docs, chunk_count, batch_errors = self._index_text_batch(batch)
+                    total_docs += docs
+                    total_chunks += chunk_count
+                    errors.extend(batch_errors)
+                    batch = []
+                    batch_chunks = 0
+
+            docs, chunk_count, batch_errors = self._index_text_batch(batch)
+            total_docs += docs
+            total_chunks += chunk_count
+            errors.extend(batch_errors)
+
+            self._flush()
+
             return {
                 "status": "completed",
-                "source_file": os.path.basename(file_path),
+                "source_file": source_file,
                 "documents_processed": total_docs,
                 "total_chunks": total_chunks,
                 "errors": errors
@@ -482,69 +1879,111 @@ class DocumentService:
             logger.error(f"Error processing JSON file: {e}")
             raise
 
-    def process_csv(self, file_path: str, text_columns: Optional[List[str]] = None) -> Dict[str, Any]:
+    def process_csv(
+        self,
+        source: Union[str, bytes],
+        text_columns: Optional[List[str]] = None,
+        source_name: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Process a CSV file and add documents to ChromaDB
 
         Args:
-            file_path: Path to CSV file
+            source: Path to CSV file, or the file's contents for small uploads
             text_columns: List of column names to combine as content (if None, uses all)
+            source_name: Filename recorded as source_file (defaults to the path's basename)
 
         Returns:
             Dictionary with processing results
         """
         try:
-            logger.info(f"Processing CSV file: {file_path}")
+            source_file = _source_name(source, source_name)
+            logger.info(f"Processing CSV file: {source_file}")
 
-            df = pd.read_csv(file_path)
+            # One timestamp for every record in the file
+            indexed_at = datetime.now(timezone.utc).isoformat()
 
             total_docs = 0
             total_chunks = 0
             errors = []
 
-            for idx, row in df.iterrows():
-                try:
-                    # Determine which columns to use
-                    if text_columns:
-                        content_parts = [str(row[col]) for col in text_columns if col in df.columns]
-                    else:
-                        content_parts = [f"{col}: {str(row[col])}" for col in df.columns]
-
-                    content = "\n".join(content_parts)
-
-                    # Create metadata from all columns
-                    doc_metadata = {
-                        "source": "csv",
-                        "source_file": os.path.basename(file_path),
-                        "row_index": int(idx)
-                    }
-
-                    # Add all row data as metadata (convert to strings)
-                    for col in df.columns:
-                        try:
-                            doc_metadata[col] = str(row[col])
-                        except:
-                            pass
-
-                    # Process the document
-                    result = self.process_text_data(
-                        text_content=content,
-                        metadata=doc_metadata
-                    )
+            # Rows are embedded together in batches rather than one by one
+            batch = []
+            batch_chunks = 0
+            batch_limit = self._text_batch_limit()
+
+            # Stream the file in row blocks, reading every cell as its raw string
+            reader = pd.read_csv(
+                io.BytesIO(source) if isinstance(source, bytes) else source,
+                chunksize=settings.CSV_CHUNK_ROWS,
+                dtype=str,
+                keep_default_na=False
+            )
 
-                    if result['status'] == 'indexed':
-                        total_docs += 1
-                        total_chunks += result['chunks_count']
+            row_offset = 0
+            for df in reader:
+                columns = list(df.columns)
+                content_columns = (
+                    [col for col in text_columns if col in df.columns]
+                    if text_columns else columns
+                )
+                column_values = {col: df[col].to_numpy() for col in columns}
+
+                for pos in range(len(df)):
+                    idx = row_offset + pos
+                    try:
+                        # Determine which columns to use
+                        if text_columns:
+                            content = "\n".join(column_values[col][pos] for col in content_columns)
+                        else:
+                            content = "\n".join(f"{col}: {column_values[col][pos]}" for col in columns)
+
+                        # Create metadata from all columns
+                        doc_metadata = {
+                            "source": "csv",
+                            "source_file": source_file,
+                            "row_index": idx
+                        }
 
-                except Exception as e:
-                    error_msg = f"Error processing row {idx}: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-                    continue
+                        # Add all row data as metadata
+                        for col in columns:
+                            doc_metadata[col] = column_values[col][pos]
+
+                        # Queue the document for the next embedding batch
+                        document_id, chunks, doc_metadata = self._prepare_text_record(
+                            content, metadata=doc_metadata, indexed_at=indexed_at
+                        )
+                        if not chunks:
+                            continue
+                        batch.append((f"row {idx}", document_id, chunks, doc_metadata))
+                        batch_chunks += len(chunks)
+
+                    except Exception as e:
+                        error_msg = f"Error processing row {idx}: {str(e)}"
+                        logger.error(error_msg)
+                        errors.append(error_msg)
+                        continue
+
+                    if batch_chunks >= batch_limit:
+                        docs, chunk_count, batch_errors = self._index_text_batch(batch)
+                        total_docs += docs
+                        total_chunks += chunk_count
+                        errors.extend(batch_errors)
+                        batch = []
+                        batch_chunks = 0
+
+                row_offset += len(df)
+
+            docs, chunk_count, batch_errors = self._index_text_batch(batch)
+            total_docs += docs
+            total_chunks += chunk_count
+            errors.extend(batch_errors)
+
+            self._flush()
 
             return {
                 "status": "completed",
-                "source_file": os.path.basename(file_path),
+                "source_file": source_file,
                 "documents_processed": total_docs,
                 "total_chunks": total_chunks,
                 "errors": errors
@@ -554,13 +1993,19 @@ class DocumentService:
             logger.error(f"Error processing CSV file: {e}")
             raise
 
-    def process_image(self, image_path: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def process_image(
+        self,
+        image_path: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        flush: bool = True
+    ) -> Dict[str, Any]:
         """
         Process a single image file (PNG, JPG, etc.) using OCR
 
         Args:
             image_path: Path to image file
             metadata: Optional metadata to attach
+            flush: Write to ChromaDB immediately; batch callers pass False and flush once
 
         Returns:
             Dictionary with processing results
@@ -584,20 +2029,11 @@ class DocumentService:
                     "error": "No text extracted from image"
                 }
 
-            # Prepare metadata
-            if metadata is None:
-                metadata = {}
-
-            metadata.update({
-                "source": "image",
-                "image_path": image_path,
-                "filename": os.path.basename(image_path)
-            })
-
             # Process the extracted text
             result = self.process_text_data(
                 text_content=image_text,
-                metadata=metadata
+                metadata=self._image_metadata(image_path, metadata),
+                flush=flush
             )
 
             return result
@@ -606,12 +2042,59 @@ class DocumentService:
             logger.error(f"Error processing image {image_path}: {e}")
             raise
 
-    def process_batch_images(self, image_directory: str) -> Dict[str, Any]:
+    @staticmethod
+    def _image_metadata(image_path: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Add the image source fields to a chunk metadata dictionary"""
+        if metadata is None:
+            metadata = {}
+
+        metadata.update({
+            "source": "image",
+            "image_path": image_path,
+            "filename": os.path.basename(image_path)
+        })
+        return metadata
+
+    @staticmethod
+    def _image_file_metadata(image_directory: str, image_file: str) -> Dict[str, Any]:
+        """
+        Build metadata for an image from its directory and filename
+
+        Args:
+            image_directory: Directory containing the image
+            image_file: Image filename
+
+        Returns:
+            Metadata dictionary
+        """
+        # Extract metadata from filename if it follows pattern
+        # e.g., "brochure_001.png" or "flyer_025.png"
+        file_metadata = {
+            "source_directory": os.path.basename(image_directory)
+        }
+
+        # Try to extract type and index from filename
+        base_name = os.path.splitext(image_file)[0]
+        if '_' in base_name:
+            parts = base_name.rsplit('_', 1)
+            file_metadata['material_type'] = parts[0]
+            try:
+                file_metadata['material_index'] = int(parts[1])
+            except ValueError:
+                pass
+
+        return file_metadata
+
+    def process_batch_images(self, image_directory: str, ocr_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Process multiple image files from a directory
 
+        Images are OCR'd concurrently in a thread pool (Tesseract runs outside
+        the GIL), then their text is embedded together in batches.
+
         Args:
             image_directory: Path to directory containing image files
+            ocr_workers: OCR threads (defaults to the CPU count)
 
         Returns:
             Dictionary with batch processing results
@@ -620,11 +2103,7 @@ class DocumentService:
             logger.info(f"Processing images from directory: {image_directory}")
 
             # Get all image files
-            image_extensions = ['.png', '.jpg', '.jpeg', '.webp']
-            image_files = [
-                f for f in os.listdir(image_directory)
-                if os.path.splitext(f.lower())[1] in image_extensions
-            ]
+            image_files = _list_files(image_directory, _IMAGE_EXTENSIONS)
 
             if not image_files:
                 return {
@@ -638,40 +2117,63 @@ class DocumentService:
             total_chunks = 0
             errors = []
 
-            for image_file in image_files:
-                try:
-                    image_path = os.path.join(image_directory, image_file)
-                    logger.info(f"Processing image: {image_file}")
-
-                    # Extract metadata from filename if it follows pattern
-                    # e.g., "brochure_001.png" or "flyer_025.png"
-                    file_metadata = {
-                        "source_directory": os.path.basename(image_directory)
-                    }
-
-                    # Try to extract type and index from filename
-                    base_name = os.path.splitext(image_file)[0]
-                    if '_' in base_name:
-                        parts = base_name.rsplit('_', 1)
-                        file_metadata['material_type'] = parts[0]
-                        try:
-                            file_metadata['material_index'] = int(parts[1])
-                        except ValueError:
-                            pass
-
-                    result = self.process_image(image_path, file_metadata)
-
-                    if result['status'] == 'indexed':
-                        total_docs += 1
-                        total_chunks += result['chunks_count']
-                    else:
-                        errors.append(f"{image_file}: {result.get('error', 'Unknown error')}")
+            # One timestamp for every image in the batch
+            indexed_at = datetime.now(timezone.utc).isoformat()
+            batch = []
+            batch_chunks = 0
+            batch_limit = self._text_batch_limit()
+
+            with ThreadPoolExecutor(max_workers=ocr_workers or os.cpu_count()) as executor:
+                futures = {
+                    executor.submit(
+                        self.multimodal_processor.process_image_to_text,
+                        os.path.join(image_directory, image_file)
+                    ): image_file
+                    for image_file in image_files
+                }
 
-                except Exception as e:
-                    error_msg = f"Error processing {image_file}: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-                    continue
+                for future in as_completed(futures):
+                    image_file = futures[future]
+                    try:
+                        image_text = future.result()
+                        if not image_text or not image_text.strip():
+                            logger.warning("No text extracted from image: %s", image_file)
+                            errors.append(f"{image_file}: No text extracted from image")
+                            continue
+
+                        image_path = os.path.join(image_directory, image_file)
+                        metadata = self._image_metadata(
+                            image_path, self._image_file_metadata(image_directory, image_file)
+                        )
+                        document_id, chunks, metadata = self._prepare_text_record(
+                            image_text, metadata=metadata, indexed_at=indexed_at
+                        )
+                        if not chunks:
+                            errors.append(f"{image_file}: No text content to process")
+                            continue
+                        batch.append((image_file, document_id, chunks, metadata))
+                        batch_chunks += len(chunks)
+
+                    except Exception as e:
+                        error_msg = f"Error processing {image_file}: {str(e)}"
+                        logger.error(error_msg)
+                        errors.append(error_msg)
+                        continue
+
+                    if batch_chunks >= batch_limit:
+                        docs, chunk_count, batch_errors = self._index_text_batch(batch)
+                        total_docs += docs
+                        total_chunks += chunk_count
+                        errors.extend(batch_errors)
+                        batch = []
+                        batch_chunks = 0
+
+            docs, chunk_count, batch_errors = self._index_text_batch(batch)
+            total_docs += docs
+            total_chunks += chunk_count
+            errors.extend(batch_errors)
+
+            self._flush()
 
             return {
                 "status": "completed",
@@ -686,12 +2188,13 @@ class DocumentService:
             logger.error(f"Error processing batch images: {e}")
             raise
 
-    def process_batch_pdfs(self, pdf_directory: str) -> Dict[str, Any]:
+    def process_batch_pdfs(self, pdf_directory: str, num_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Process multiple PDF files from a directory
 
         Args:
             pdf_directory: Path to directory containing PDF files
+            num_workers: Extraction processes (defaults to PDF_BATCH_WORKERS)
 
         Returns:
             Dictionary with batch processing results
@@ -699,7 +2202,7 @@ class DocumentService:
         try:
             logger.info(f"Processing PDFs from directory: {pdf_directory}")
 
-            pdf_files = [f for f in os.listdir(pdf_directory) if f.endswith('.pdf')]
+            pdf_files = _list_files(pdf_directory, _PDF_EXTENSIONS)
 
             if not pdf_files:
                 return {
@@ -711,31 +2214,72 @@ class DocumentService:
 
             total_docs = 0
             total_chunks = 0
+            skipped = 0
             errors = []
 
-            for pdf_file in pdf_files:
-                try:
+            # Extract text and images in worker processes; embedding and
+            # ChromaDB writes stay in this process
+            backend = _resolve_pdf_backend(settings.PDF_BACKEND)
+            seen_hashes = set()
+            with ProcessPoolExecutor(
+                max_workers=_pdf_batch_workers(num_workers),
+                initializer=_init_pdf_worker,
+                mp_context=_PROCESS_CONTEXT
+            ) as executor:
+                futures = {}
+                for pdf_file in pdf_files:
                     pdf_path = os.path.join(pdf_directory, pdf_file)
-                    logger.info(f"Processing PDF: {pdf_file}")
-
-                    result = self.process_pdf(pdf_path, pdf_file)
-
-                    if result['status'] == 'indexed':
-                        total_docs += 1
-                        total_chunks += result['chunks_count']
-                    else:
-                        errors.append(f"{pdf_file}: {result.get('error', 'Unknown error')}")
-
-                except Exception as e:
-                    error_msg = f"Error processing {pdf_file}: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-                    continue
+                    try:
+                        _check_pdf_size(pdf_path, pdf_file)
+                        content_hash = _file_digest(pdf_path)
+                        # Files repeated within this run aren't registered until the final flush
+                        if content_hash in seen_hashes:
+                            logger.info("Skipping duplicate %s: repeated in this batch", pdf_file)
+                            skipped += 1
+                            continue
+                        existing = self._find_by_content_hash(content_hash)
+                        if existing:
+                            self._skipped_result(pdf_file, existing)
+                            skipped += 1
+                            continue
+                        seen_hashes.add(content_hash)
+                    except Exception as e:
+                        error_msg = f"Error processing {pdf_file}: {str(e)}"
+                        logger.error(error_msg)
+                        errors.append(error_msg)
+                        continue
+
+                    document_id = f"doc_{uuid.uuid4().hex[:12]}"
+                    future = executor.submit(_extract_pdf_content, pdf_path, document_id, backend)
+                    futures[future] = (pdf_file, document_id, content_hash)
+
+                for future in as_completed(futures):
+                    pdf_file, document_id, content_hash = futures[future]
+                    try:
+                        logger.info("Indexing PDF: %s", pdf_file)
+                        extracted = future.result()
+                        extracted['content_hash'] = content_hash
+                        result = self._index_pdf_content(document_id, pdf_file, extracted, flush=False)
+
+                        if result['status'] == 'indexed':
+                            total_docs += 1
+                            total_chunks += result['chunks_count']
+                        else:
+                            errors.append(f"{pdf_file}: {result.get('error', 'Unknown error')}")
+
+                    except Exception as e:
+                        error_msg = f"Error processing {pdf_file}: {str(e)}"
+                        logger.error(error_msg)
+                        errors.append(error_msg)
+                        continue
+
+            self._flush()
 
             return {
                 "status": "completed",
                 "source_directory": pdf_directory,
                 "documents_processed": total_docs,
+                "documents_skipped": skipped,
                 "total_chunks": total_chunks,
                 "total_files": len(pdf_files),
                 "errors": errors
@@ -745,6 +2289,187 @@ class DocumentService:
             logger.error(f"Error processing batch PDFs: {e}")
             raise
 
+    async def process_batch_images_async(self, image_directory: str) -> Dict[str, Any]:
+        """
+        Process multiple image files from a directory without blocking the event loop
+
+        Images are OCR'd concurrently in worker threads, bounded by BATCH_MAX_CONCURRENCY.
+
+        Args:
+            image_directory: Path to directory containing image files
+
+        Returns:
+            Dictionary with batch processing results
+        """
+        # Writes of this batch's records, buffered from worker threads, report failures here
+        owner_token = _write_owner.set(object())
+        try:
+            logger.info(f"Processing images from directory: {image_directory}")
+
+            image_files = _list_files(image_directory, _IMAGE_EXTENSIONS)
+
+            if not image_files:
+                return {
+                    "status": "completed",
+                    "message": "No image files found in directory",
+                    "documents_processed": 0,
+                    "total_chunks": 0
+                }
+
+            semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+
+            async def index_image(image_file: str) -> Dict[str, Any]:
+                async with semaphore:
+                    logger.info("Processing image: %s", image_file)
+                    return await asyncio.to_thread(
+                        self.process_image,
+                        os.path.join(image_directory, image_file),
+                        self._image_file_metadata(image_directory, image_file),
+                        False
+                    )
+
+            results = await asyncio.gather(
+                *(index_image(image_file) for image_file in image_files),
+                return_exceptions=True
+            )
+            await asyncio.to_thread(self._flush)
+
+            return {
+                "status": "completed",
+                "source_directory": image_directory,
+                "total_files": len(image_files),
+                **self._summarize_batch(image_files, results)
+            }
+
+        except Exception as e:
+            logger.error(f"Error processing batch images: {e}")
+            raise
+        finally:
+            _write_owner.reset(owner_token)
+
+    async def process_batch_pdfs_async(
+        self,
+        pdf_directory: str,
+        num_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Process multiple PDF files from a directory without blocking the event loop
+
+        Extraction runs in a process pool and indexing in worker threads, with at
+        most BATCH_MAX_CONCURRENCY files in flight.
+
+        Args:
+            pdf_directory: Path to directory containing PDF files
+            num_workers: Extraction processes (defaults to PDF_BATCH_WORKERS)
+
+        Returns:
+            Dictionary with batch processing results
+        """
+        # Writes of this batch's records, buffered from worker threads, report failures here
+        owner_token = _write_owner.set(object())
+        try:
+            logger.info(f"Processing PDFs from directory: {pdf_directory}")
+
+            pdf_files = _list_files(pdf_directory, _PDF_EXTENSIONS)
+
+            if not pdf_files:
+                return {
+                    "status": "completed",
+                    "message": "No PDF files found in directory",
+                    "documents_processed": 0,
+                    "total_chunks": 0
+                }
+
+            loop = asyncio.get_running_loop()
+            semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+            backend = _resolve_pdf_backend(settings.PDF_BACKEND)
+            seen_hashes = set()
+
+            with ProcessPoolExecutor(
+                max_workers=_pdf_batch_workers(num_workers),
+                initializer=_init_pdf_worker,
+                mp_context=_PROCESS_CONTEXT
+            ) as executor:
+                async def index_pdf(pdf_file: str) -> Dict[str, Any]:
+                    pdf_path = os.path.join(pdf_directory, pdf_file)
+                    async with semaphore:
+                        _check_pdf_size(pdf_path, pdf_file)
+                        content_hash = await asyncio.to_thread(_file_digest, pdf_path)
+                        # Files repeated within this run aren't registered until the final flush
+                        if content_hash in seen_hashes:
+                            logger.info("Skipping duplicate %s: repeated in this batch", pdf_file)
+                            return {"filename": pdf_file, "status": "skipped", "chunks_count": 0}
+                        seen_hashes.add(content_hash)
+                        existing = await asyncio.to_thread(self._find_by_content_hash, content_hash)
+                        if existing:
+                            return self._skipped_result(pdf_file, existing)
+
+                        document_id = f"doc_{uuid.uuid4().hex[:12]}"
+                        extracted = await loop.run_in_executor(
+                            executor, _extract_pdf_content, pdf_path, document_id, backend
+                        )
+                        extracted['content_hash'] = content_hash
+                        logger.info("Indexing PDF: %s", pdf_file)
+                        return await asyncio.to_thread(
+                            self._index_pdf_content, document_id, pdf_file, extracted, False
+                        )
+
+                results = await asyncio.gather(
+                    *(index_pdf(pdf_file) for pdf_file in pdf_files),
+                    return_exceptions=True
+                )
+            await asyncio.to_thread(self._flush)
+
+            return {
+                "status": "completed",
+                "source_directory": pdf_directory,
+                "total_files": len(pdf_files),
+                **self._summarize_batch(pdf_files, results)
+            }
+
+        except Exception as e:
+            logger.error(f"Error processing batch PDFs: {e}")
+            raise
+        finally:
+            _write_owner.reset(owner_token)
+
+    @staticmethod
+    def _summarize_batch(files: List[str], results: List[Any]) -> Dict[str, Any]:
+        """
+        Tally per-file results (or exceptions) from an async batch
+
+        Args:
+            files: Filenames, aligned with results
+            results: Result dictionaries or exceptions from asyncio.gather
+
+        Returns:
+            Dictionary with documents_processed, documents_skipped, total_chunks and errors
+        """
+        total_docs = 0
+        total_chunks = 0
+        skipped = 0
+        errors = []
+
+        for filename, result in zip(files, results):
+            if isinstance(result, Exception):
+                error_msg = f"Error processing {filename}: {str(result)}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+            elif result['status'] == 'indexed':
+                total_docs += 1
+                total_chunks += result['chunks_count']
+            elif result['status'] == 'skipped':
+                skipped += 1
+            else:
+                errors.append(f"{filename}: {result.get('error', 'Unknown error')}")
+
+        return {
+            "documents_processed": total_docs,
+            "documents_skipped": skipped,
+            "total_chunks": total_chunks,
+            "errors": errors
+        }
+
     def health_check(self) -> bool:
         """
         Check if ChromaDB connection is healthy
@@ -0,0 +1,232 @@
+"""
+Embedding Cache for RAG System
+
+Persists chunk embeddings keyed by the SHA-256 of the normalized chunk text
+and the embedding model namespace (model name, plus an optional version), so
+re-indexing unchanged content skips the embedding API.
+Optionally keeps a MinHash signature per chunk so near-identical chunks
+(whitespace or punctuation edits) can reuse an existing embedding too.
+"""
+
+from typing import List, Dict, Optional
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import unicodedata
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """SQLite-backed (chunk hash, model) -> embedding vector cache"""
+
+    # SQLite limits the number of host parameters per statement
+    _MAX_QUERY_PARAMS = 900
+
+    # MinHash parameters for near-duplicate detection
+    _NUM_PERM = 64
+    _SHINGLE_SIZE = 5
+
+    def __init__(self, db_path: str, model: str, near_duplicate_threshold: Optional[float] = None):
+        self.db_path = db_path
+        self.model = model
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                hash BLOB NOT NULL,
+                model TEXT NOT NULL,
+                vec BLOB NOT NULL,
+                minhash BLOB,
+                PRIMARY KEY (hash, model)
+            )
+            """
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(embedding_cache)")]
+        if 'minhash' not in columns:
+            self._conn.execute("ALTER TABLE embedding_cache ADD COLUMN minhash BLOB")
+        self._conn.commit()
+
+        # Initialize near-duplicate index if enabled
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self._lsh = None
+        self._signatures = {}
+        if near_duplicate_threshold:
+            try:
+                from datasketch import MinHash, MinHashLSH
+                self._MinHash = MinHash
+                self._lsh = MinHashLSH(threshold=near_duplicate_threshold, num_perm=self._NUM_PERM)
+                self._load_signatures()
+                logger.info(f"Near-duplicate embedding reuse enabled (threshold={near_duplicate_threshold})")
+            except ImportError:
+                logger.warning("datasketch not available, near-duplicate embedding reuse disabled")
+                self._lsh = None
+
+        logger.info(f"Embedding cache ready at {db_path}")
+
+    def _load_signatures(self) -> None:
+        """Rebuild the in-memory LSH index from persisted MinHash signatures"""
+        rows = self._conn.execute(
+            "SELECT hash, minhash FROM embedding_cache WHERE model = ? AND minhash IS NOT NULL",
+            [self.model]
+        )
+        for key, signature in rows:
+            self._index_signature(key, self._minhash_from_bytes(signature))
+
+    def _minhash_from_bytes(self, signature: bytes):
+        """Restore a MinHash from its persisted hash values"""
+        return self._MinHash(
+            num_perm=self._NUM_PERM,
+            hashvalues=np.frombuffer(signature, dtype=np.uint64)
+        )
+
+    def _index_signature(self, key: bytes, minhash) -> None:
+        """Add a signature to the LSH index"""
+        if key in self._signatures:
+            return
+        self._signatures[key] = minhash
+        self._lsh.insert(key, minhash)
+
+    def compute_minhash(self, text: str):
+        """
+        Compute the MinHash signature of a chunk over character shingles
+
+        Args:
+            text: Chunk text
+
+        Returns:
+            MinHash signature, or None if near-duplicate reuse is disabled
+        """
+        if self._lsh is None:
+            return None
+
+        size = self._SHINGLE_SIZE
+        shingles = {text[i:i + size] for i in range(max(len(text) - size + 1, 1))}
+        minhash = self._MinHash(num_perm=self._NUM_PERM)
+        minhash.update_batch([shingle.encode('utf-8') for shingle in shingles])
+        return minhash
+
+    @staticmethod
+    def hash_text(text: str) -> bytes:
+        """
+        Return the SHA-256 digest used as the cache key for a chunk
+
+        The text is NFC-normalized and its whitespace collapsed first, so chunks
+        that differ only in Unicode composition or spacing share an entry.
+        """
+        normalized = " ".join(unicodedata.normalize("NFC", text).split())
+        return hashlib.sha256(normalized.encode('utf-8')).digest()
+
+    def get_many(self, hashes: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look up cached embeddings
+
+        Args:
+            hashes: Chunk hashes to look up
+
+        Returns:
+            Mapping of hash to embedding for every cache hit
+        """
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+
+        with self._lock:
+            for start in range(0, len(unique), self._MAX_QUERY_PARAMS):
+                window = unique[start:start + self._MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(window))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM embedding_cache "
+                    f"WHERE model = ? AND hash IN ({placeholders})",
+                    [self.model, *window]
+                ).fetchall()
+                for key, vec in rows:
+                    found[key] = np.frombuffer(vec, dtype=np.float32)
+
+        return found
+
+    def get_near_duplicates(self, texts: List[str]) -> Dict[int, np.ndarray]:
+        """
+        Find cached embeddings for chunks that are near-duplicates of cached chunks
+
+        Args:
+            texts: Chunk texts that missed the exact-hash lookup
+
+        Returns:
+            Mapping of position in texts to the reused embedding
+        """
+        if self._lsh is None or not texts:
+            return {}
+
+        matches = {}
+        with self._lock:
+            for i, text in enumerate(texts):
+                minhash = self.compute_minhash(text)
+                best_key, best_score = None, 0.0
+                for key in self._lsh.query(minhash):
+                    score = minhash.jaccard(self._signatures[key])
+                    if score >= self.near_duplicate_threshold and score > best_score:
+                        best_key, best_score = key, score
+                if best_key is not None:
+                    matches[i] = best_key
+
+        if not matches:
+            return {}
+
+        vectors = self.get_many(list(matches.values()))
+        return {
+            i: vectors[key]
+            for i, key in matches.items()
+            if key in vectors
+        }
+
+    def put_many(
+        self,
+        hashes: List[bytes],
+        embeddings: np.ndarray,
+        texts: Optional[List[str]] = None
+    ) -> None:
+        """
+        Store embeddings for the given chunk hashes
+
+        Args:
+            hashes: Chunk hashes
+            embeddings: float32 embedding array, aligned with hashes
+            texts: Optional chunk texts, used to index MinHash signatures
+        """
+        minhashes = [None] * len(hashes)
+        if self._lsh is not None and texts is not None:
+            minhashes = [self.compute_minhash(text) for text in texts]
+
+        rows = [
+            (
+                key,
+                self.model,
+                vec.tobytes(),
+                minhash.hashvalues.astype(np.uint64).tobytes() if minhash is not None else None
+            )
+            for key, vec, minhash in zip(hashes, embeddings, minhashes)
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embedding_cache (hash, model, vec, minhash) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            for key, minhash in zip(hashes, minhashes):
+                if minhash is not None:
+                    self._index_signature(key, minhash)
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -1,6 +1,9 @@
 from openai import OpenAI
-from typing import List
+from typing import List, Optional
+import base64
 import logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -15,8 +18,30 @@ class EmbeddingService:
             api_key=settings.NVIDIA_API_KEY
         )
         self.model = settings.EMBEDDING_MODEL
+        self.pool: Optional[ThreadPoolExecutor] = None
         logger.info(f"Initialized NVIDIA Embedding Service with model: {self.model}")
 
+    def start_pool(self, n_workers: Optional[int] = None) -> None:
+        """
+        Start a persistent pool of request threads shared by every embedding call
+
+        Meant for long ingestion runs, where it saves creating a pool per
+        document and caps concurrent requests across all callers.
+
+        Args:
+            n_workers: Concurrent requests (defaults to EMBEDDING_MAX_INFLIGHT)
+        """
+        if self.pool is None:
+            n_workers = n_workers or settings.EMBEDDING_MAX_INFLIGHT
+            self.pool = ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="embed")
+            logger.info(f"Started embedding pool with {n_workers} workers")
+
+    def stop_pool(self) -> None:
+        """Shut down the persistent request pool, if started"""
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
     def embed_text(self, text: str) -> List[float]:
         """
         Generate embedding for a single text string
@@ -38,7 +63,7 @@ class EmbeddingService:
             logger.error(f"Error generating embedding: {e}")
             raise
 
-    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for a batch of texts
 
@@ -46,19 +71,28 @@ class EmbeddingService:
             texts: List of texts to embed
 
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dim)
         """
         try:
+            # base64 carries the raw float32 bytes: a third of the size of the
+            # JSON float lists, and decoded without parsing every number
             response = self.client.embeddings.create(
                 model=self.model,
                 input=texts,
-                encoding_format="float"
+                encoding_format="base64"
             )
-            return [item.embedding for item in response.data]
+            return np.stack([self._decode_embedding(item.embedding) for item in response.data])
         except Exception as e:
             logger.error(f"Error generating batch embeddings: {e}")
             raise
 
+    @staticmethod
+    def _decode_embedding(embedding) -> np.ndarray:
+        """Decode a base64 embedding, accepting plain float lists from servers that ignore the format"""
+        if isinstance(embedding, str):
+            return np.frombuffer(base64.b64decode(embedding), dtype=np.float32)
+        return np.asarray(embedding, dtype=np.float32)
+
     def health_check(self) -> bool:
         """
         Check if the embedding service is accessible
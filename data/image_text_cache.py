@@ -0,0 +1,111 @@
+"""
+Image Text Cache for RAG System
+
+Persists the OCR text and vision-model captions of images keyed by the
+SHA-256 of the encoded image bytes, so logos, letterheads and template
+diagrams shared across documents are only OCR'd and captioned once.
+Entries expire after a configurable TTL.
+"""
+
+from typing import List, Dict, Optional
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ImageTextCache:
+    """SQLite-backed (image hash, kind) -> text cache"""
+
+    # SQLite limits the number of host parameters per statement
+    _MAX_QUERY_PARAMS = 900
+
+    def __init__(self, db_path: str, ttl_seconds: Optional[float] = None):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        # Batch extraction workers share the file, so wait on locks instead of failing
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS image_text_cache (
+                hash BLOB NOT NULL,
+                kind TEXT NOT NULL,
+                text TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (hash, kind)
+            )
+            """
+        )
+        self._conn.commit()
+
+        logger.info(f"Image text cache ready at {db_path}")
+
+    @staticmethod
+    def hash_image(data: bytes) -> bytes:
+        """Return the SHA-256 digest used as the cache key for encoded image bytes"""
+        return hashlib.sha256(data).digest()
+
+    def get_many(self, hashes: List[bytes], kind: str) -> Dict[bytes, str]:
+        """
+        Look up cached texts
+
+        Args:
+            hashes: Image hashes to look up
+            kind: Result kind, e.g. "ocr" or "caption:<model>"
+
+        Returns:
+            Mapping of hash to text for every unexpired cache hit
+        """
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        min_created_at = time.time() - self.ttl_seconds if self.ttl_seconds else 0.0
+
+        with self._lock:
+            for start in range(0, len(unique), self._MAX_QUERY_PARAMS):
+                window = unique[start:start + self._MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(window))
+                rows = self._conn.execute(
+                    f"SELECT hash, text FROM image_text_cache "
+                    f"WHERE kind = ? AND created_at >= ? AND hash IN ({placeholders})",
+                    [kind, min_created_at, *window]
+                ).fetchall()
+                found.update(rows)
+
+        return found
+
+    def put_many(self, texts: Dict[bytes, str], kind: str) -> None:
+        """
+        Store texts for the given image hashes
+
+        Args:
+            texts: Mapping of image hash to text
+            kind: Result kind, e.g. "ocr" or "caption:<model>"
+        """
+        if not texts:
+            return
+
+        now = time.time()
+        rows = [(key, kind, text, now) for key, text in texts.items()]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO image_text_cache (hash, kind, text, created_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -6,6 +6,7 @@ import os
 import sys
 import json
 import argparse
+import asyncio
 import logging
 from pathlib import Path
 
@@ -23,6 +24,35 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# --precision choices mapped to DocumentService embedding dtypes
+PRECISION_DTYPES = {
+    'fp32': 'float32',
+    'fp16': 'float16',
+    'int8': 'int8'
+}
+
+
+# Section separator for log output
+_BANNER = "=" * 70
+
+
+def _log_result(result: dict, noun: str):
+    """
+    Log an ingestion result and a preview of its errors
+
+    Args:
+        result: Result dictionary from a DocumentService process_* call
+        noun: What was ingested, e.g. "documents" or "PDFs"
+    """
+    logger.info("✓ Ingested %d %s with %d chunks", result['documents_processed'], noun, result['total_chunks'])
+
+    errors = result.get('errors')
+    if errors:
+        logger.warning("Encountered %d errors during ingestion", len(errors))
+        for error in errors[:5]:  # Show first 5 errors
+            logger.warning("  - %s", error)
+
+
 def get_project_root():
     """Get the project root directory"""
     return Path(__file__).parent.parent
@@ -36,25 +66,20 @@ def ingest_json_file(document_service: DocumentService, json_path: str):
         document_service: DocumentService instance
         json_path: Path to JSON file
     """
-    logger.info(f"Ingesting JSON file: {json_path}")
+    logger.info("Ingesting JSON file: %s", json_path)
 
     if not os.path.exists(json_path):
-        logger.error(f"File not found: {json_path}")
+        logger.error("File not found: %s", json_path)
         return None
 
     try:
         result = document_service.process_json(json_path)
-        logger.info(f"✓ Ingested {result['documents_processed']} documents with {result['total_chunks']} chunks")
-
-        if result.get('errors'):
-            logger.warning(f"Encountered {len(result['errors'])} errors during ingestion")
-            for error in result['errors'][:5]:  # Show first 5 errors
-                logger.warning(f"  - {error}")
+        _log_result(result, "documents")
 
         return result
 
     except Exception as e:
-        logger.error(f"Error ingesting JSON file: {e}")
+        logger.error("Error ingesting JSON file: %s", e)
         return None
 
 
@@ -66,89 +91,76 @@ def ingest_csv_file(document_service: DocumentService, csv_path: str):
         document_service: DocumentService instance
         csv_path: Path to CSV file
     """
-    logger.info(f"Ingesting CSV file: {csv_path}")
+    logger.info("Ingesting CSV file: %s", csv_path)
 
     if not os.path.exists(csv_path):
-        logger.error(f"File not found: {csv_path}")
+        logger.error("File not found: %s", csv_path)
         return None
 
     try:
         result = document_service.process_csv(csv_path)
-        logger.info(f"✓ Ingested {result['documents_processed']} documents with {result['total_chunks']} chunks")
-
-        if result.get('errors'):
-            logger.warning(f"Encountered {len(result['errors'])} errors during ingestion")
-            for error in result['errors'][:5]:
-                logger.warning(f"  - {error}")
+        _log_result(result, "documents")
 
         return result
 
     except Exception as e:
-        logger.error(f"Error ingesting CSV file: {e}")
+        logger.error("Error ingesting CSV file: %s", e)
         return None
 
 
-def ingest_pdf_directory(document_service: DocumentService, pdf_dir: str):
+def ingest_pdf_directory(document_service: DocumentService, pdf_dir: str, num_workers: int = None):
     """
     Ingest all PDF files from a directory
 
     Args:
         document_service: DocumentService instance
         pdf_dir: Path to directory containing PDFs
+        num_workers: PDF extraction processes (defaults to PDF_BATCH_WORKERS)
     """
-    logger.info(f"Ingesting PDFs from directory: {pdf_dir}")
+    logger.info("Ingesting PDFs from directory: %s", pdf_dir)
 
     if not os.path.exists(pdf_dir):
-        logger.error(f"Directory not found: {pdf_dir}")
+        logger.error("Directory not found: %s", pdf_dir)
         return None
 
     try:
-        result = document_service.process_batch_pdfs(pdf_dir)
-        logger.info(f"✓ Ingested {result['documents_processed']} PDFs with {result['total_chunks']} chunks")
-
-        if result.get('errors'):
-            logger.warning(f"Encountered {len(result['errors'])} errors during ingestion")
-            for error in result['errors'][:5]:
-                logger.warning(f"  - {error}")
+        result = document_service.process_batch_pdfs(pdf_dir, num_workers=num_workers)
+        _log_result(result, "PDFs")
 
         return result
 
     except Exception as e:
-        logger.error(f"Error ingesting PDFs: {e}")
+        logger.error("Error ingesting PDFs: %s", e)
         return None
 
 
-def ingest_image_directory(document_service: DocumentService, image_dir: str):
+def ingest_image_directory(document_service: DocumentService, image_dir: str, ocr_workers: int = None):
     """
     Ingest all image files from a directory using OCR
 
     Args:
         document_service: DocumentService instance
         image_dir: Path to directory containing images
+        ocr_workers: OCR threads (defaults to the CPU count)
     """
-    logger.info(f"Ingesting images from directory: {image_dir}")
+    logger.info("Ingesting images from directory: %s", image_dir)
 
     if not os.path.exists(image_dir):
-        logger.error(f"Directory not found: {image_dir}")
+        logger.error("Directory not found: %s", image_dir)
         return None
 
     try:
-        result = document_service.process_batch_images(image_dir)
-        logger.info(f"✓ Ingested {result['documents_processed']} images with {result['total_chunks']} chunks")
-
-        if result.get('errors'):
-            logger.warning(f"Encountered {len(result['errors'])} errors during ingestion")
-            for error in result['errors'][:5]:
-                logger.warning(f"  - {error}")
+        result = document_service.process_batch_images(image_dir, ocr_workers=ocr_workers)
+        _log_result(result, "images")
 
         return result
 
     except Exception as e:
-        logger.error(f"Error ingesting images: {e}")
+        logger.error("Error ingesting images: %s", e)
         return None
 
 
-def main():
+async def main():
     """Main function to orchestrate synthetic data ingestion"""
     parser = argparse.ArgumentParser(
         description='Ingest synthetic data into RAG system'
@@ -189,6 +201,54 @@ def main():
         action='store_true',
         help='Clear existing data before ingestion'
     )
+    parser.add_argument(
+        '--num-workers',
+        type=int,
+        default=None,
+        help='Processes used to extract PDFs (default: PDF_BATCH_WORKERS)'
+    )
+    parser.add_argument(
+        '--ocr-workers',
+        type=int,
+        default=None,
+        help='Threads used to OCR images (default: CPU count)'
+    )
+    parser.add_argument(
+        '--dedupe-threshold',
+        type=float,
+        default=None,
+        help='Skip chunks whose cosine similarity to an existing cluster exceeds this (default: SEMANTIC_DEDUPE_THRESHOLD)'
+    )
+    parser.add_argument(
+        '--verify-final-count',
+        action='store_true',
+        help='Query ChromaDB for the final totals instead of deriving them from this run'
+    )
+    parser.add_argument(
+        '--precision',
+        type=str,
+        choices=list(PRECISION_DTYPES),
+        default=None,
+        help='Precision of stored embeddings (default: EMBEDDING_DTYPE)'
+    )
+    parser.add_argument(
+        '--chroma-batch-size',
+        type=int,
+        default=None,
+        help='Records per ChromaDB add call (default: CHROMA_ADD_BATCH_SIZE, capped by the server)'
+    )
+    parser.add_argument(
+        '--embed-workers',
+        type=int,
+        default=0,
+        help='Persistent embedding request threads shared by all formats (0: per-call pools)'
+    )
+    parser.add_argument(
+        '--embed-batch-size',
+        type=int,
+        default=None,
+        help='Chunks per embedding request (default: EMBEDDING_SUB_BATCH_SIZE)'
+    )
 
     args = parser.parse_args()
 
@@ -201,17 +261,26 @@ def main():
     pdf_dir = project_root / args.pdfs
     image_dir = project_root / args.images
 
-    logger.info("="*70)
+    logger.info(_BANNER)
     logger.info("Synthetic Data Ingestion Script")
-    logger.info("="*70)
-    logger.info(f"Project root: {project_root}")
-    logger.info(f"Format: {args.format}")
+    logger.info(_BANNER)
+    logger.info("Project root: %s", project_root)
+    logger.info("Format: %s", args.format)
 
+    embedding_service = None
     try:
         # Initialize services
         logger.info("Initializing services...")
         embedding_service = EmbeddingService()
-        document_service = DocumentService(embedding_service)
+        if args.embed_workers > 0:
+            embedding_service.start_pool(args.embed_workers)
+        document_service = DocumentService(
+            embedding_service,
+            embed_batch_size=args.embed_batch_size,
+            dedupe_threshold=args.dedupe_threshold,
+            chroma_batch_size=args.chroma_batch_size,
+            embedding_dtype=PRECISION_DTYPES.get(args.precision)
+        )
 
         # Health check
         if not document_service.health_check():
@@ -229,59 +298,61 @@ def main():
 
         # Get stats before ingestion
         stats_before = document_service.get_stats()
-        logger.info(f"Current state: {stats_before['total_documents']} documents, {stats_before['total_chunks']} chunks")
+        logger.info("Current state: %s documents, %s chunks", stats_before['total_documents'], stats_before['total_chunks'])
 
-        # Ingest based on format
-        results = []
+        # JSON and CSV only parse and embed, so they run concurrently and share
+        # the DocumentService write buffer; PDFs and images then run one at a
+        # time, since each starts its own worker process pool
+        tasks = []
 
         if args.format == 'json' or args.format == 'all':
-            logger.info("\n" + "="*70)
             logger.info("Ingesting JSON data...")
-            logger.info("="*70)
-            result = ingest_json_file(document_service, str(json_path))
-            if result:
-                results.append(result)
+            tasks.append(asyncio.to_thread(ingest_json_file, document_service, str(json_path)))
 
         if args.format == 'csv' or args.format == 'all':
-            logger.info("\n" + "="*70)
             logger.info("Ingesting CSV data...")
-            logger.info("="*70)
-            result = ingest_csv_file(document_service, str(csv_path))
-            if result:
-                results.append(result)
+            tasks.append(asyncio.to_thread(ingest_csv_file, document_service, str(csv_path)))
+
+        results = list(await asyncio.gather(*tasks))
 
         if args.format == 'pdfs' or args.format == 'all':
-            logger.info("\n" + "="*70)
             logger.info("Ingesting PDF brochures...")
-            logger.info("="*70)
-            result = ingest_pdf_directory(document_service, str(pdf_dir))
-            if result:
-                results.append(result)
+            results.append(await asyncio.to_thread(
+                ingest_pdf_directory, document_service, str(pdf_dir), num_workers=args.num_workers
+            ))
 
         if args.format == 'images' or args.format == 'all':
-            logger.info("\n" + "="*70)
             logger.info("Ingesting marketing images (PNG) with OCR...")
-            logger.info("="*70)
-            result = ingest_image_directory(document_service, str(image_dir))
-            if result:
-                results.append(result)
+            results.append(await asyncio.to_thread(
+                ingest_image_directory, document_service, str(image_dir), ocr_workers=args.ocr_workers
+            ))
 
-        # Get stats after ingestion
-        stats_after = document_service.get_stats()
-
-        # Summary
-        logger.info("\n" + "="*70)
-        logger.info("INGESTION COMPLETE")
-        logger.info("="*70)
+        results = [result for result in results if result]
 
         total_docs = sum(r.get('documents_processed', 0) for r in results)
         total_chunks = sum(r.get('total_chunks', 0) for r in results)
 
-        logger.info(f"Documents ingested: {total_docs}")
-        logger.info(f"Chunks created: {total_chunks}")
-        logger.info(f"Total documents in DB: {stats_after['total_documents']}")
-        logger.info(f"Total chunks in DB: {stats_after['total_chunks']}")
-        logger.info(f"Collection: {stats_after['collection_name']}")
+        # Derive stats after ingestion from the counts above unless asked to re-query
+        if args.verify_final_count:
+            stats_after = document_service.get_stats()
+        else:
+            stats_after = {
+                **stats_before,
+                'total_documents': stats_before['total_documents'] + total_docs,
+                'total_chunks': stats_before['total_chunks'] + total_chunks
+            }
+        document_service.close()
+
+        # Summary
+        logger.info("\n%s", _BANNER)
+        logger.info("INGESTION COMPLETE")
+        logger.info(_BANNER)
+
+        logger.info("Documents ingested: %s", total_docs)
+        logger.info("Chunks created: %s", total_chunks)
+        logger.info("Total documents in DB: %s", stats_after['total_documents'])
+        logger.info("Total chunks in DB: %s", stats_after['total_chunks'])
+        logger.info("Collection: %s", stats_after['collection_name'])
 
         logger.info("\n✓ Synthetic data successfully ingested into RAG system!")
         logger.info("\nYou can now query the data using the RAG query service:")
@@ -292,9 +363,12 @@ def main():
     except KeyboardInterrupt:
         logger.info("\nIngestion interrupted by user")
     except Exception as e:
-        logger.error(f"Error during ingestion: {e}", exc_info=True)
+        logger.error("Error during ingestion: %s", e, exc_info=True)
         sys.exit(1)
+    finally:
+        if embedding_service:
+            embedding_service.stop_pool()
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,10 +1,14 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import asyncio
 import logging
 import os
-import shutil
+import uuid
+from pathlib import Path
+import aiofiles
 from config import settings
 from embedding_service import EmbeddingService
 from document_service import DocumentService
@@ -17,7 +21,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="RAG CRUD Service",
     description="Document management service for RAG system",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -76,66 +81,188 @@ embedding_service = None
 document_service = None
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup"""
+async def _load_services():
+    """Create the services off the event loop, warm them up and mark the app ready"""
     global embedding_service, document_service
 
-    logger.info("Starting RAG CRUD Service...")
-
     try:
         # Initialize services
-        embedding_service = EmbeddingService()
-        document_service = DocumentService(embedding_service)
+        embedding_service = await asyncio.to_thread(EmbeddingService)
+        document_service = await asyncio.to_thread(DocumentService, embedding_service)
 
-        # Health checks
-        if not embedding_service.health_check():
+        # Health checks; the embedding check also opens the API connection
+        # so the first real request doesn't pay for it
+        if not await asyncio.to_thread(embedding_service.health_check):
             logger.warning("Embedding service health check failed")
 
-        if not document_service.health_check():
+        if not await asyncio.to_thread(document_service.health_check):
             logger.warning("ChromaDB health check failed")
 
         logger.info("RAG CRUD Service is ready!")
 
     except Exception as e:
         logger.error(f"Failed to initialize services: {e}")
-        raise
+        app.state.startup_error = e
+
+    finally:
+        app.state.ready.set()
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Start loading services in the background so the server accepts connections immediately"""
+    logger.info("Starting RAG CRUD Service...")
+
+    app.state.ready = asyncio.Event()
+    app.state.startup_error = None
+    app.state.loader = asyncio.create_task(_load_services())
+
+
+async def require_ready():
+    """Wait for startup to finish; fail with 503 if the services could not be created"""
+    await app.state.ready.wait()
+    if app.state.startup_error is not None:
+        raise HTTPException(status_code=503, detail="Service failed to initialize")
+
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Write buffered records and stop background workers"""
+    if document_service:
+        await asyncio.to_thread(document_service.close)
+
+
+# Bounds embedding-heavy requests so concurrent uploads don't flood the embedding API
+_ingest_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_INGESTS)
+
+
+async def _run_ingest(func, *args):
+    """Run a blocking indexing call in a worker thread, at most MAX_CONCURRENT_INGESTS at once"""
+    async with _ingest_semaphore:
+        return await asyncio.to_thread(func, *args)
+
+
+# Bytes read from an upload per await
+_UPLOAD_READ_SIZE = 1 << 20
+
+# Upload reads gathered into a single vectored write, where os.pwritev exists
+_UPLOAD_WRITE_CHUNKS = 8
+
+# JSON/CSV uploads up to this size skip the temp file
+_IN_MEMORY_UPLOAD_MAX_BYTES = settings.IN_MEMORY_UPLOAD_MAX_MB * 1024 * 1024
+
+
+# Accepted upload extensions per endpoint, compared case-insensitively
+_ALLOWED_EXTENSIONS = {
+    'pdf': frozenset({'.pdf'}),
+    'json': frozenset({'.json'}),
+    'csv': frozenset({'.csv'})
+}
+
+
+def _upload_temp_path(file: UploadFile, allowed: frozenset) -> Path:
+    """
+    Validate an upload's extension and return the temp path it is saved to
+
+    Args:
+        file: Uploaded file
+        allowed: Accepted lowercase extensions, including the dot
 
-@app.post("/documents", response_model=DocumentResponse)
+    Returns:
+        Path under UPLOAD_DIR, unique to this upload so concurrent uploads of
+        the same filename don't share a file
+    """
+    if Path(file.filename).suffix.lower() not in allowed:
+        kinds = "/".join(sorted(ext.lstrip('.').upper() for ext in allowed))
+        raise HTTPException(status_code=400, detail=f"Only {kinds} files are supported")
+    return Path(settings.UPLOAD_DIR) / f"{uuid.uuid4().hex}_{Path(file.filename).name}"
+
+
+def _pwritev_all(fd: int, chunks: List[bytes], offset: int) -> None:
+    """Write chunks at offset with vectored writes, resuming after short writes"""
+    while chunks:
+        n = os.pwritev(fd, chunks, offset)
+        offset += n
+        while chunks and n >= len(chunks[0]):
+            n -= len(chunks[0])
+            chunks = chunks[1:]
+        if chunks and n:
+            chunks = [chunks[0][n:], *chunks[1:]]
+
+
+async def _write_chunks(buffer, chunks: List[bytes], offset: int) -> None:
+    """
+    Append chunks to an open upload file
+
+    Uses one pwritev syscall for the whole group on platforms that have it
+    (Linux, macOS) and falls back to sequential aiofiles writes elsewhere.
+    """
+    if hasattr(os, "pwritev"):
+        await asyncio.to_thread(_pwritev_all, buffer.fileno(), chunks, offset)
+    else:
+        for chunk in chunks:
+            await buffer.write(chunk)
+
+
+async def _save_upload(
+    file: UploadFile,
+    path: Path,
+    max_bytes: Optional[int] = None,
+    head: bytes = b""
+) -> int:
+    """
+    Stream an uploaded file to disk without blocking the event loop
+
+    Args:
+        file: Uploaded file
+        path: Destination path
+        max_bytes: Abort with HTTP 400 once the upload grows past this size;
+            the caller removes the partial file
+        head: Bytes already read from the upload, written first
+
+    Returns:
+        Number of bytes written
+    """
+    size = len(head)
+    written = 0
+    pending = [head] if head else []
+    async with aiofiles.open(path, "wb") as buffer:
+        while True:
+            chunk = await file.read(_UPLOAD_READ_SIZE)
+            if chunk:
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File size exceeds maximum ({settings.MAX_UPLOAD_SIZE_MB}MB)"
+                    )
+                pending.append(chunk)
+
+            if pending and (not chunk or len(pending) >= _UPLOAD_WRITE_CHUNKS):
+                await _write_chunks(buffer, pending, written)
+                written = size
+                pending = []
+
+            if not chunk:
+                return size
+
+
+@app.post("/documents", response_model=DocumentResponse, dependencies=[Depends(require_ready)])
 async def upload_and_index_document(file: UploadFile = File(...)):
     """
     Upload and index a PDF document
 
     The file is processed, chunked, embedded, and stored in ChromaDB.
     """
-    # Validate file type
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are supported")
-
-    # Validate file size (rough estimate)
-    file_size_mb = 0
+    temp_path = _upload_temp_path(file, _ALLOWED_EXTENSIONS['pdf'])
     try:
-        # Save file temporarily
-        temp_path = os.path.join(settings.UPLOAD_DIR, file.filename)
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Check file size
-        file_size_mb = os.path.getsize(temp_path) / (1024 * 1024)
-        if file_size_mb > settings.MAX_UPLOAD_SIZE_MB:
-            os.remove(temp_path)
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size ({file_size_mb:.2f}MB) exceeds maximum ({settings.MAX_UPLOAD_SIZE_MB}MB)"
-            )
+        # Save file temporarily, rejecting it as soon as it exceeds the size limit
+        await _save_upload(file, temp_path, max_bytes=settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024)
 
         # Process the PDF
         logger.info(f"Processing uploaded file: {file.filename}")
-        result = document_service.process_pdf(temp_path, file.filename)
-
-        # Clean up temp file
-        os.remove(temp_path)
+        async with _ingest_semaphore:
+            result = await document_service.process_pdf_async(str(temp_path), file.filename)
 
         if result['status'] == 'failed':
             raise HTTPException(status_code=500, detail=result.get('error', 'Processing failed'))
@@ -145,33 +272,33 @@ async def upload_and_index_document(file: UploadFile = File(...)):
     except HTTPException:
         raise
     except Exception as e:
-        # Clean up on error
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
         logger.error(f"Error processing upload: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Clean up temp file
+        temp_path.unlink(missing_ok=True)
 
 
-@app.get("/documents", response_model=List[DocumentListItem])
-async def list_documents():
+@app.get("/documents", response_model=List[DocumentListItem], dependencies=[Depends(require_ready)])
+async def list_documents(document_id: Optional[List[str]] = Query(None)):
     """
-    List all indexed documents
+    List indexed documents, optionally restricted to the given document_id values
     """
     try:
-        documents = document_service.list_documents()
+        documents = await asyncio.to_thread(document_service.list_documents, document_id)
         return documents
     except Exception as e:
         logger.error(f"Error listing documents: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.delete("/documents/{document_id}", response_model=DeleteResponse)
+@app.delete("/documents/{document_id}", response_model=DeleteResponse, dependencies=[Depends(require_ready)])
 async def delete_document(document_id: str):
     """
     Delete a document and all its chunks
     """
     try:
-        result = document_service.delete_document(document_id)
+        result = await asyncio.to_thread(document_service.delete_document, document_id)
 
         if result['status'] == 'not_found':
             raise HTTPException(status_code=404, detail="Document not found")
@@ -184,7 +311,7 @@ async def delete_document(document_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/rebuild", response_model=RebuildResponse)
+@app.post("/rebuild", response_model=RebuildResponse, dependencies=[Depends(require_ready)])
 async def rebuild_index():
     """
     Delete all documents and rebuild the index from scratch
@@ -192,20 +319,20 @@ async def rebuild_index():
     WARNING: This will delete all indexed documents!
     """
     try:
-        result = document_service.rebuild_index()
+        result = await asyncio.to_thread(document_service.rebuild_index)
         return result
     except Exception as e:
         logger.error(f"Error rebuilding index: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/stats", response_model=StatsResponse)
+@app.get("/stats", response_model=StatsResponse, dependencies=[Depends(require_ready)])
 async def get_stats():
     """
     Get statistics about indexed documents
     """
     try:
-        stats = document_service.get_stats()
+        stats = await asyncio.to_thread(document_service.get_stats)
         return stats
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
@@ -215,8 +342,11 @@ async def get_stats():
 @app.get("/health", response_model=HealthResponse)
 async def health():
     """Check health status of all services"""
-    chromadb_healthy = document_service.health_check() if document_service else False
-    embeddings_healthy = embedding_service.health_check() if embedding_service else False
+    if not app.state.ready.is_set():
+        raise HTTPException(status_code=503, detail="Services are starting")
+
+    chromadb_healthy = await asyncio.to_thread(document_service.health_check) if document_service else False
+    embeddings_healthy = await asyncio.to_thread(embedding_service.health_check) if embedding_service else False
 
     status = "healthy" if all([chromadb_healthy, embeddings_healthy]) else "degraded"
 
@@ -227,71 +357,73 @@ async def health():
     }
 
 
-@app.post("/documents/json")
+@app.post("/documents/json", dependencies=[Depends(require_ready)])
 async def upload_json_file(file: UploadFile = File(...)):
     """
     Upload and process a JSON file
 
     Supports both generic JSON format and synthetic data format
     """
-    if not file.filename.endswith('.json'):
-        raise HTTPException(status_code=400, detail="Only JSON files are supported")
-
+    temp_path = _upload_temp_path(file, _ALLOWED_EXTENSIONS['json'])
+    wrote_temp_file = False
     try:
-        # Save file temporarily
-        temp_path = os.path.join(settings.UPLOAD_DIR, file.filename)
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Small files are processed straight from memory
+        payload = await file.read(_IN_MEMORY_UPLOAD_MAX_BYTES + 1)
+        if len(payload) <= _IN_MEMORY_UPLOAD_MAX_BYTES:
+            logger.info(f"Processing JSON file: {file.filename}")
+            return await _run_ingest(document_service.process_json, payload, file.filename)
+
+        # Save larger files temporarily
+        wrote_temp_file = True
+        await _save_upload(file, temp_path, head=payload)
 
         # Process the JSON
         logger.info(f"Processing JSON file: {file.filename}")
-        result = document_service.process_json(temp_path)
-
-        # Clean up temp file
-        os.remove(temp_path)
-
-        return result
+        return await _run_ingest(document_service.process_json, str(temp_path), file.filename)
 
     except Exception as e:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
         logger.error(f"Error processing JSON upload: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Clean up temp file, if this request wrote one
+        if wrote_temp_file:
+            temp_path.unlink(missing_ok=True)
 
 
-@app.post("/documents/csv")
+@app.post("/documents/csv", dependencies=[Depends(require_ready)])
 async def upload_csv_file(file: UploadFile = File(...)):
     """
     Upload and process a CSV file
 
     Each row will be indexed as a separate document
     """
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are supported")
-
+    temp_path = _upload_temp_path(file, _ALLOWED_EXTENSIONS['csv'])
+    wrote_temp_file = False
     try:
-        # Save file temporarily
-        temp_path = os.path.join(settings.UPLOAD_DIR, file.filename)
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Small files are processed straight from memory
+        payload = await file.read(_IN_MEMORY_UPLOAD_MAX_BYTES + 1)
+        if len(payload) <= _IN_MEMORY_UPLOAD_MAX_BYTES:
+            logger.info(f"Processing CSV file: {file.filename}")
+            return await _run_ingest(document_service.process_csv, payload, None, file.filename)
+
+        # Save larger files temporarily
+        wrote_temp_file = True
+        await _save_upload(file, temp_path, head=payload)
 
         # Process the CSV
         logger.info(f"Processing CSV file: {file.filename}")
-        result = document_service.process_csv(temp_path)
-
-        # Clean up temp file
-        os.remove(temp_path)
-
-        return result
+        return await _run_ingest(document_service.process_csv, str(temp_path), None, file.filename)
 
     except Exception as e:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
         logger.error(f"Error processing CSV upload: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Clean up temp file, if this request wrote one
+        if wrote_temp_file:
+            temp_path.unlink(missing_ok=True)
 
 
-@app.post("/documents/batch-pdfs")
+@app.post("/documents/batch-pdfs", dependencies=[Depends(require_ready)])
 async def batch_upload_pdfs(directory_path: str):
     """
     Process multiple PDF files from a local directory
@@ -306,14 +438,15 @@ async def batch_upload_pdfs(directory_path: str):
         raise HTTPException(status_code=400, detail="Path is not a directory")
 
     try:
-        result = document_service.process_batch_pdfs(directory_path)
+        async with _ingest_semaphore:
+            result = await document_service.process_batch_pdfs_async(directory_path)
         return result
     except Exception as e:
         logger.error(f"Error processing batch PDFs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/documents/batch-images")
+@app.post("/documents/batch-images", dependencies=[Depends(require_ready)])
 async def batch_upload_images(directory_path: str):
     """
     Process multiple image files from a local directory using OCR
@@ -330,7 +463,8 @@ async def batch_upload_images(directory_path: str):
         raise HTTPException(status_code=400, detail="Path is not a directory")
 
     try:
-        result = document_service.process_batch_images(directory_path)
+        async with _ingest_semaphore:
+            result = await document_service.process_batch_images_async(directory_path)
         return result
     except Exception as e:
         logger.error(f"Error processing batch images: {e}")
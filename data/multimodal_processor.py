@@ -5,31 +5,366 @@ Extracts images from PDFs and converts them to text using OCR and image captioni
 This allows images to be indexed as regular text chunks in the existing pipeline.
 """
 
-from typing import List, Dict, Any, Optional
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 import logging
+import multiprocessing
 from PIL import Image
 import io
 import os
-from pypdf import PdfReader
-import base64
+import queue
+import tempfile
+import threading
+from pdf_reader import open_pdf
+import binascii
+import mimetypes
+import numpy as np
+from image_text_cache import ImageTextCache
 
 logger = logging.getLogger(__name__)
 
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+    logger.warning("pymupdf not available, extracting PDF images with pypdf")
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+    logger.warning("tesserocr not available, OCR will run the tesseract executable")
+
+# PyTessBaseAPI is not thread-safe, so each thread (and process) keeps its own
+_tess_local = threading.local()
+
+
+def _tess_api():
+    """Return this thread's PyTessBaseAPI, initializing the engine on first use"""
+    api = getattr(_tess_local, 'api', None)
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.AUTO)
+        _tess_local.api = api
+    return api
+
+
+def _init_ocr_worker() -> None:
+    """Load the Tesseract engine when an OCR worker process starts"""
+    if tesserocr is not None:
+        try:
+            _tess_api()
+        except Exception as e:
+            logger.warning(f"Could not initialize Tesseract engine: {e}")
+
+
+def _ocr_with_tesserocr(image: Image.Image) -> str:
+    """Run OCR on a decoded image with this thread's in-process Tesseract engine"""
+    api = _tess_api()
+    api.SetImage(image)
+    return api.GetUTF8Text()
+
+
+# OCR processes are spawned, not forked, so they never inherit locks held by
+# this process's threads (image cache, captioning pool, ChromaDB writer)
+_PROCESS_CONTEXT = multiprocessing.get_context("spawn")
+
+
+# DCT-II basis for the 32x32 perceptual hash
+_PHASH_SIZE = 32
+_DCT_MATRIX = np.cos(
+    np.pi * np.outer(np.arange(_PHASH_SIZE), 2 * np.arange(_PHASH_SIZE) + 1) / (2 * _PHASH_SIZE)
+)
+
+
+def _phash(data: bytes) -> np.uint64:
+    """
+    Compute the 64-bit perceptual hash (pHash) of an encoded image
+
+    The image is reduced to 32x32 grayscale, transformed with a 2-D DCT, and
+    the 8x8 lowest frequencies are thresholded at their median, so small
+    pixel-level edits leave most bits unchanged.
+    """
+    image = Image.open(io.BytesIO(data))
+    image.draft('L', (_PHASH_SIZE * 4, _PHASH_SIZE * 4))
+    pixels = np.asarray(
+        image.convert('L').resize((_PHASH_SIZE, _PHASH_SIZE), Image.LANCZOS), dtype=np.float64
+    )
+    low_freq = (_DCT_MATRIX @ pixels @ _DCT_MATRIX.T)[:8, :8]
+    bits = (low_freq > np.median(low_freq)).ravel()
+    return np.packbits(bits).view('>u8')[0].astype(np.uint64)
+
+
+class _ImageDeduplicator:
+    """
+    Map each image onto a representative hash shared with identical or near-identical images
+
+    Watermarks, headers and repeated figures are often re-encoded with a few
+    pixels changed, which defeats the content hash, so images with the same
+    dimensions whose pHash is within max_distance bits of an earlier image
+    map onto that image's hash and reuse its OCR text and caption. Since a
+    small pHash distance does not guarantee identical text, keep
+    max_distance at 0 or below; a negative max_distance only merges
+    byte-identical images. Images can be added incrementally, e.g. as they
+    are extracted.
+    """
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        self._alias: Dict[bytes, bytes] = {}
+        self._keys: List[bytes] = []
+        self._sizes: List[Tuple[int, int]] = []
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+        # The first image is only pHashed once there is a second one to compare it with
+        self._unhashed: Optional[Tuple[bytes, bytes]] = None
+
+    def add(self, data: bytes) -> Tuple[bytes, bool]:
+        """
+        Add an image
+
+        Args:
+            data: Encoded image bytes
+
+        Returns:
+            Tuple of (representative hash, whether the image is the first with it)
+        """
+        key = ImageTextCache.hash_image(data)
+        if key in self._alias:
+            return self._alias[key], False
+
+        representative = key
+        if self.max_distance >= 0:
+            if not self._alias:
+                self._unhashed = (key, data)
+            else:
+                if self._unhashed is not None:
+                    self._index(*self._unhashed)
+                    self._unhashed = None
+                representative = self._index(key, data)
+
+        if representative != key:
+            logger.debug("Skipping near-duplicate image")
+        self._alias[key] = representative
+        return representative, representative == key
+
+    def _index(self, key: bytes, data: bytes) -> bytes:
+        """pHash an image and return the key of its nearest same-sized indexed image, or index it"""
+        try:
+            size = Image.open(io.BytesIO(data)).size
+            h = _phash(data)
+        except Exception as e:
+            logger.debug(f"Could not compute pHash: {e}")
+            return key
+
+        if len(self._hashes):
+            xor = np.bitwise_xor(self._hashes, h)
+            distances = np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+            same_size = np.array([indexed == size for indexed in self._sizes])
+            distances = np.where(same_size, distances, self.max_distance + 1)
+            nearest = int(distances.argmin())
+            if distances[nearest] <= self.max_distance:
+                return self._keys[nearest]
+
+        self._keys.append(key)
+        self._sizes.append(size)
+        self._hashes = np.append(self._hashes, h)
+        return key
+
+
+# Extracted images waiting for OCR/captioning, and the marker closing the stream
+_IMAGE_QUEUE_SIZE = 32
+_END_OF_IMAGES = object()
+
+# Fixed text part of every captioning request
+_CAPTION_PROMPT_PART = {
+    "type": "text",
+    "text": "Describe this image in detail. Include any text, charts, diagrams, or important visual elements."
+}
+
+# Input bytes per base64 step; a multiple of 3 so the encoded pieces concatenate
+_BASE64_CHUNK = 3 * (1 << 16)
+
+
+def _data_url(data: bytes, mime_type: str) -> str:
+    """
+    Build a base64 data URL for image bytes
+
+    The encoded payload is written piecewise into one preallocated buffer
+    (already holding the "data:" prefix) through a memoryview, so only that
+    buffer and the final string exist alongside the image bytes.
+    """
+    prefix = f"data:{mime_type};base64,".encode('ascii')
+    view = memoryview(data)
+    buf = bytearray(len(prefix) + 4 * -(-len(view) // 3))
+    buf[:len(prefix)] = prefix
+
+    pos = len(prefix)
+    for start in range(0, len(view), _BASE64_CHUNK):
+        encoded = binascii.b2a_base64(view[start:start + _BASE64_CHUNK], newline=False)
+        buf[pos:pos + len(encoded)] = encoded
+        pos += len(encoded)
+
+    return buf.decode('ascii')
+
+
+def _fit_image(data: bytes, max_side: int) -> bytes:
+    """
+    Downsample an encoded image so neither side exceeds max_side
+
+    Only the header is read for images that already fit, which are returned
+    unchanged; larger ones are resized with Lanczos filtering and re-encoded
+    as lossless PNG.
+    """
+    image = Image.open(io.BytesIO(data))
+    if max(image.size) <= max_side:
+        return data
+
+    image.thumbnail((max_side, max_side), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _ocr_worker(
+    images: List[bytes],
+    tesseract_cmd: Optional[str] = None,
+    max_side: int = 2000
+) -> List[str]:
+    """
+    Extract text from a group of encoded images
+
+    With tesserocr installed, each image is decoded once and passed to the
+    worker's persistent Tesseract engine. Otherwise the images are written
+    to a scratch directory in their original encoding (pytesseract would
+    re-encode each one to PNG), Tesseract reads the list from a text file
+    and separates the output of each image with a form feed, so its startup
+    cost is paid once per group instead of once per image.
+    Runs in an OCR worker process, so it only returns plain strings.
+
+    Args:
+        images: Encoded image bytes (JPEG, PNG, ...)
+        tesseract_cmd: Path to the Tesseract executable, if not on PATH
+        max_side: Longest side images are downsampled to before OCR
+
+    Returns:
+        Extracted text per image, in the same order
+    """
+    if tesserocr is not None:
+        texts = []
+        for i, data in enumerate(images):
+            try:
+                image = Image.open(io.BytesIO(data))
+                image.thumbnail((max_side, max_side), Image.LANCZOS)
+                texts.append(_ocr_with_tesserocr(image))
+            except Exception as e:
+                logger.warning(f"OCR failed for image {i}: {e}")
+                texts.append("")
+        return texts
+
+    import pytesseract
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    fitted = []
+    for i, data in enumerate(images):
+        try:
+            fitted.append(_fit_image(data, max_side))
+        except Exception as e:
+            logger.debug(f"Could not downsample image {i}: {e}")
+            fitted.append(data)
+    images = fitted
+
+    if len(images) > 1:
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                image_paths = []
+                for i, data in enumerate(images):
+                    image_path = os.path.join(tmp_dir, f"image{i}")
+                    with open(image_path, 'wb') as f:
+                        f.write(data)
+                    image_paths.append(image_path)
+
+                list_path = os.path.join(tmp_dir, 'images.txt')
+                with open(list_path, 'w', encoding='utf-8') as f:
+                    f.write("\n".join(image_paths) + "\n")
+
+                output_base = os.path.join(tmp_dir, 'ocr')
+                pytesseract.run_tesseract(list_path, output_base, extension='txt', lang=None)
+
+                with open(f"{output_base}.txt", 'r', encoding='utf-8') as f:
+                    pages = f.read().split('\x0c')
+
+            if len(pages) >= len(images):
+                return pages[:len(images)]
+
+            logger.warning(f"Batch OCR returned {len(pages)} pages for {len(images)} images, retrying per image")
+
+        except Exception as e:
+            logger.warning(f"Batch OCR failed, falling back to per-image OCR: {e}")
+
+    texts = []
+    for i, data in enumerate(images):
+        try:
+            texts.append(pytesseract.image_to_string(Image.open(io.BytesIO(data))))
+        except Exception as e:
+            logger.warning(f"OCR failed for image {i}: {e}")
+            texts.append("")
+    return texts
+
 
 class MultimodalProcessor:
     """Process images from PDFs and convert to text"""
 
-    def __init__(self, config):
+    # Executors are shared by every processor in the process and reused across
+    # PDFs, so OCR worker processes are only spawned once
+    _ocr_executor: Optional[ProcessPoolExecutor] = None
+    _caption_executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, config, ocr_workers: Optional[int] = None):
         self.config = config
         self.enable_ocr = getattr(config, 'ENABLE_OCR', True)
         self.enable_captioning = getattr(config, 'ENABLE_IMAGE_CAPTIONING', False)
         self.image_storage_path = getattr(config, 'IMAGE_STORAGE_PATH', 'image_store')
+        self.persist_images = getattr(config, 'PERSIST_IMAGES', False)
+        self.image_store_format = getattr(config, 'IMAGE_STORE_FORMAT', 'native')
+        self.ocr_workers = ocr_workers or getattr(config, 'OCR_WORKERS', 0) or os.cpu_count() or 1
+        self.caption_workers = getattr(config, 'CAPTION_WORKERS', 8)
+        self.caption_max_concurrency = getattr(config, 'CAPTION_MAX_CONCURRENCY', 16)
+        self.tesseract_cmd = getattr(config, 'TESSERACT_CMD', None) or None
+        self.max_ocr_side = getattr(config, 'MAX_OCR_SIDE', 2000)
+        self.max_caption_side = getattr(config, 'MAX_CAPTION_SIDE', 1024)
+        self.phash_max_distance = getattr(config, 'IMAGE_PHASH_MAX_DISTANCE', -1)
+        self.min_ocr_side = getattr(config, 'MIN_OCR_SIDE', 32)
 
         # Create image storage directory
         os.makedirs(self.image_storage_path, exist_ok=True)
 
+        # Initialize OCR/caption result cache if enabled
+        self.text_cache = None
+        if getattr(config, 'ENABLE_IMAGE_TEXT_CACHE', False):
+            self.text_cache = ImageTextCache(
+                getattr(config, 'IMAGE_TEXT_CACHE_PATH', 'image_text_cache.db'),
+                ttl_seconds=getattr(config, 'IMAGE_TEXT_CACHE_TTL_DAYS', 30) * 86400 or None
+            )
+
+        # Initialize GPU OCR if selected; Tesseract below stays as the fallback
+        self._paddle = None
+        self._paddle_lock = threading.Lock()
+        if self.enable_ocr and getattr(config, 'OCR_BACKEND', 'tesseract') == 'paddle_gpu':
+            try:
+                from paddleocr import PaddleOCR
+                self._paddle = PaddleOCR(use_angle_cls=False, lang='en', use_gpu=True, show_log=False)
+                logger.info("OCR enabled with PaddleOCR on GPU")
+            except Exception as e:
+                logger.warning(f"PaddleOCR not available, using Tesseract for OCR: {e}")
+
         # Initialize OCR if enabled
-        if self.enable_ocr:
+        self.pytesseract = None
+        if self.enable_ocr and tesserocr is not None:
+            logger.info("OCR enabled with tesserocr")
+        elif self.enable_ocr:
             try:
                 import pytesseract
                 # Set tesseract path if configured
@@ -40,14 +375,17 @@ class MultimodalProcessor:
                     logger.info("OCR enabled with pytesseract (using PATH)")
                 self.pytesseract = pytesseract
             except ImportError:
-                logger.warning("pytesseract not available, OCR disabled")
-                self.enable_ocr = False
+                if self._paddle is None:
+                    logger.warning("pytesseract not available, OCR disabled")
+                self.enable_ocr = self._paddle is not None
                 self.pytesseract = None
+        self._tesseract_available = tesserocr is not None or self.pytesseract is not None
 
         # Initialize captioning service if enabled
         if self.enable_captioning:
             try:
-                from openai import OpenAI
+                import httpx
+                from openai import AsyncOpenAI, OpenAI
                 nvidia_api_key = getattr(config, 'NVIDIA_API_KEY', '')
                 nvidia_base_url = getattr(config, 'NVIDIA_BASE_URL', '')
                 if nvidia_api_key:
@@ -55,7 +393,20 @@ class MultimodalProcessor:
                         base_url=nvidia_base_url,
                         api_key=nvidia_api_key
                     )
+                    # Pooled keep-alive connections for concurrent async captioning
+                    self.async_vision_client = AsyncOpenAI(
+                        base_url=nvidia_base_url,
+                        api_key=nvidia_api_key,
+                        http_client=httpx.AsyncClient(
+                            limits=httpx.Limits(max_keepalive_connections=32)
+                        )
+                    )
                     self.vision_model = getattr(config, 'VISION_MODEL', 'microsoft/phi-3-vision-128k-instruct')
+                    self._caption_request_template = {
+                        "model": self.vision_model,
+                        "max_tokens": 300,
+                        "temperature": 0.2
+                    }
                     logger.info(f"Image captioning enabled with model: {self.vision_model}")
                 else:
                     logger.warning("NVIDIA API key not configured, image captioning disabled")
@@ -64,6 +415,35 @@ class MultimodalProcessor:
                 logger.warning("OpenAI client not available, image captioning disabled")
                 self.enable_captioning = False
 
+    @classmethod
+    def _get_ocr_executor(cls, max_workers: int) -> ProcessPoolExecutor:
+        """Return the shared OCR process pool, creating it on first use"""
+        with cls._executor_lock:
+            if cls._ocr_executor is None:
+                cls._ocr_executor = ProcessPoolExecutor(
+                    max_workers=max_workers, initializer=_init_ocr_worker, mp_context=_PROCESS_CONTEXT
+                )
+                logger.info(f"Started OCR process pool with {max_workers} workers")
+            return cls._ocr_executor
+
+    @classmethod
+    def _get_caption_executor(cls, max_workers: int) -> ThreadPoolExecutor:
+        """Return the shared captioning thread pool, creating it on first use"""
+        with cls._executor_lock:
+            if cls._caption_executor is None:
+                cls._caption_executor = ThreadPoolExecutor(max_workers=max_workers)
+            return cls._caption_executor
+
+    @classmethod
+    def shutdown_executors(cls) -> None:
+        """Shut down the shared OCR and captioning pools"""
+        with cls._executor_lock:
+            for executor in (cls._ocr_executor, cls._caption_executor):
+                if executor is not None:
+                    executor.shutdown(wait=True)
+            cls._ocr_executor = None
+            cls._caption_executor = None
+
     def extract_images_from_pdf(self, pdf_path: str, document_id: str) -> List[Dict[str, Any]]:
         """
         Extract images from PDF file
@@ -73,79 +453,231 @@ class MultimodalProcessor:
             document_id: Unique document identifier
 
         Returns:
-            List of image metadata dictionaries
+            List of image dictionaries, as yielded by iter_images_from_pdf
+        """
+        images = list(self.iter_images_from_pdf(pdf_path, document_id))
+        logger.info(f"Extracted {len(images)} images from PDF")
+        return images
+
+    def iter_images_from_pdf(self, pdf_path: str, document_id: str) -> Iterator[Dict[str, Any]]:
         """
-        images = []
+        Extract images from PDF file one at a time
+
+        Embedded JPEG and PNG streams are kept verbatim; other encodings are
+        decoded once and re-encoded as PNG. Images stay in memory and are only
+        written to IMAGE_STORAGE_PATH, in IMAGE_STORE_FORMAT, when PERSIST_IMAGES
+        is set.
+
+        Args:
+            pdf_path: Path to PDF file
+            document_id: Unique document identifier
+
+        Yields:
+            Image dictionaries with the encoded bytes ('data'), their
+            'mime_type', 'page_number', 'image_index', 'document_id' and, when
+            persisted, 'image_path'
+        """
+        yielded = 0
 
         try:
-            reader = PdfReader(pdf_path)
+            if pymupdf is not None:
+                try:
+                    for img_info in self._iter_images_pymupdf(pdf_path, document_id):
+                        yielded += 1
+                        yield img_info
+                    return
+                except Exception as e:
+                    # Images already handed out cannot be taken back, so only fall back before the first
+                    if yielded:
+                        raise
+                    logger.warning(f"pymupdf could not extract images from {pdf_path}, falling back to pypdf: {e}")
 
-            for page_num, page in enumerate(reader.pages):
-                # Extract images from page
-                if '/XObject' in page['/Resources']:
-                    xobjects = page['/Resources']['/XObject'].get_object()
+            yield from self._iter_images_pypdf(pdf_path, document_id)
 
-                    for obj_name in xobjects:
-                        obj = xobjects[obj_name]
+        except Exception as e:
+            logger.error(f"Error extracting images from PDF: {e}")
 
-                        if obj['/Subtype'] == '/Image':
-                            try:
-                                # Extract image data
-                                image_data = self._extract_image_data(obj)
+    def _make_image(
+        self,
+        document_id: str,
+        page_number: int,
+        image_index: int,
+        data: bytes,
+        ext: str
+    ) -> Optional[Dict[str, Any]]:
+        """Build the dictionary for an extracted image, writing it to storage if configured"""
+        if self._is_trivial_image(data):
+            logger.debug(f"Skipping trivial image on page {page_number}")
+            return None
 
-                                if image_data:
-                                    # Save image
-                                    image_filename = f"{document_id}_page{page_num + 1}_img{len(images)}.png"
-                                    image_path = os.path.join(self.image_storage_path, image_filename)
-                                    image_data.save(image_path, 'PNG')
+        image_info = {
+            'data': data,
+            'mime_type': mimetypes.guess_type(f"image.{ext}")[0] or 'image/png',
+            'page_number': page_number,
+            'image_index': image_index,
+            'document_id': document_id
+        }
 
-                                    images.append({
-                                        'image_path': image_path,
-                                        'page_number': page_num + 1,
-                                        'image_index': len(images),
-                                        'document_id': document_id
-                                    })
+        if self.persist_images:
+            image_info['image_path'] = self._store_image(
+                data, ext, f"{document_id}_page{page_number}_img{image_index}"
+            )
 
-                                    logger.debug(f"Extracted image from page {page_num + 1}")
+        logger.debug(f"Extracted image from page {page_number}")
+        return image_info
 
-                            except Exception as e:
-                                logger.warning(f"Could not extract image from page {page_num + 1}: {e}")
-                                continue
+    def _store_image(self, data: bytes, ext: str, name: str) -> str:
+        """
+        Write an extracted image to IMAGE_STORAGE_PATH in IMAGE_STORE_FORMAT
 
-            logger.info(f"Extracted {len(images)} images from PDF")
+        "native" writes the extracted bytes unchanged. "webp" re-encodes
+        everything except JPEGs with the fastest WEBP encoder (quality 85),
+        which avoids PNG's DEFLATE cost; "raw" skips encoding altogether and
+        saves the decoded pixels as a .npy array.
 
-        except Exception as e:
-            logger.error(f"Error extracting images from PDF: {e}")
+        Args:
+            data: Encoded image bytes
+            ext: File extension matching the encoded bytes
+            name: File name without extension
 
-        return images
+        Returns:
+            Path of the written file
+        """
+        base_path = os.path.join(self.image_storage_path, name)
+
+        if self.image_store_format == 'raw':
+            image_path = f"{base_path}.npy"
+            np.save(image_path, np.asarray(Image.open(io.BytesIO(data))))
+
+        elif self.image_store_format == 'webp' and ext not in ('jpg', 'jpeg'):
+            image_path = f"{base_path}.webp"
+            image = Image.open(io.BytesIO(data))
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'A' in image.mode or 'transparency' in image.info else 'RGB')
+            image.save(image_path, 'WEBP', quality=85, method=0)
 
-    def _extract_image_data(self, image_obj) -> Optional[Image.Image]:
+        else:
+            image_path = f"{base_path}.{ext}"
+            with open(image_path, 'wb') as f:
+                f.write(data)
+
+        return image_path
+
+    @staticmethod
+    def _read_image_file(image_path: str) -> Tuple[bytes, str]:
         """
-        Extract PIL Image from PDF image object
+        Read an image file, including raw .npy arrays from the image store
 
         Args:
-            image_obj: PDF image object
+            image_path: Path to image file
 
         Returns:
-            PIL Image or None
+            Tuple of (encoded image bytes, their MIME type)
+        """
+        if image_path.endswith('.npy'):
+            # Raw pixels are encoded once with the fastest PNG setting for OCR and captioning
+            buffer = io.BytesIO()
+            Image.fromarray(np.load(image_path)).save(buffer, format='PNG', compress_level=1)
+            return buffer.getvalue(), 'image/png'
+
+        with open(image_path, 'rb') as f:
+            data = f.read()
+        return data, mimetypes.guess_type(image_path)[0] or 'image/png'
+
+    def _is_trivial_image(self, data: bytes) -> bool:
+        """
+        Check whether an image is too small or too flat to be worth OCR and captioning
+
+        Icons and spacers are rejected by their smallest side (read from the
+        header alone), then solid fills by the near-zero variance of a
+        box-downscaled grayscale copy. Bilevel scans (black text on white)
+        have only two gray levels but plenty of variance, so they are kept.
+
+        Args:
+            data: Encoded image bytes
+
+        Returns:
+            True if the image should be skipped
         """
         try:
-            size = (image_obj['/Width'], image_obj['/Height'])
-            data = image_obj.get_data()
-
-            # Handle different color spaces
-            if image_obj['/ColorSpace'] == '/DeviceRGB':
-                mode = 'RGB'
-            elif image_obj['/ColorSpace'] == '/DeviceGray':
-                mode = 'L'
-            else:
-                mode = 'RGB'
+            image = Image.open(io.BytesIO(data))
+            if min(image.size) < self.min_ocr_side:
+                return True
 
-            return Image.frombytes(mode, size, data)
+            # Averaging 8x8 blocks keeps thin strokes that strided sampling could miss
+            gray = image.convert('L')
+            sample = np.asarray(gray.reduce(min(8, min(gray.size))))
+            return bool(sample.std() < 1)
 
         except Exception as e:
-            logger.debug(f"Could not convert image data: {e}")
-            return None
+            logger.debug(f"Could not inspect image: {e}")
+            return False
+
+    def _iter_images_pymupdf(self, pdf_path: str, document_id: str) -> Iterator[Dict[str, Any]]:
+        """Extract images with PyMuPDF, keeping JPEG and PNG streams undecoded"""
+        image_index = 0
+
+        doc = pymupdf.open(pdf_path)
+        try:
+            for page_num, page in enumerate(doc):
+                for img in page.get_images(full=True):
+                    xref = img[0]
+                    try:
+                        extracted = doc.extract_image(xref)
+                        if not extracted:
+                            continue
+
+                        # Skip small images before decoding anything
+                        if min(extracted['width'], extracted['height']) < self.min_ocr_side:
+                            continue
+
+                        ext = extracted['ext']
+                        is_cmyk = extracted.get('colorspace') == 4
+                        if ext in ('jpeg', 'jpg', 'png') and not is_cmyk:
+                            data = extracted['image']
+                        else:
+                            # CMYK JPEGs, JPX, JBIG2, CCITT etc. are decoded and saved as RGB/gray PNG
+                            pix = pymupdf.Pixmap(doc, xref)
+                            if pix.n - pix.alpha >= 4:
+                                pix = pymupdf.Pixmap(pymupdf.csRGB, pix)
+                            data, ext = pix.tobytes('png'), 'png'
+
+                        image_info = self._make_image(document_id, page_num + 1, image_index, data, ext)
+
+                    except Exception as e:
+                        logger.warning(f"Could not extract image from page {page_num + 1}: {e}")
+                        continue
+
+                    if image_info is not None:
+                        image_index += 1
+                        yield image_info
+        finally:
+            doc.close()
+
+    def _iter_images_pypdf(self, pdf_path: str, document_id: str) -> Iterator[Dict[str, Any]]:
+        """Extract images with pypdf, which also keeps JPEG streams undecoded"""
+        image_index = 0
+
+        with open_pdf(pdf_path) as reader:
+            for page_num, page in enumerate(reader.pages):
+                try:
+                    page_images = list(page.images)
+                except Exception as e:
+                    logger.warning(f"Could not read images on page {page_num + 1}: {e}")
+                    continue
+
+                for image_file in page_images:
+                    try:
+                        ext = os.path.splitext(image_file.name)[1].lstrip('.').lower() or 'png'
+                        image_info = self._make_image(document_id, page_num + 1, image_index, image_file.data, ext)
+
+                    except Exception as e:
+                        logger.warning(f"Could not extract image from page {page_num + 1}: {e}")
+                        continue
+
+                    if image_info is not None:
+                        image_index += 1
+                        yield image_info
 
     def process_image_to_text(self, image_path: str, page_number: int = None) -> str:
         """
@@ -155,6 +687,143 @@ class MultimodalProcessor:
             image_path: Path to image file
             page_number: Page number where image was found
 
+        Returns:
+            Text description of the image
+        """
+        data, mime_type = self._read_image_file(image_path)
+
+        keys, _, ocr_by_key, caption_by_key = self._lookup_image_texts([{'data': data}])
+        key = keys[0]
+
+        new_ocr = {}
+        if self.enable_ocr and key not in ocr_by_key:
+            try:
+                image = Image.open(io.BytesIO(data))
+                image.thumbnail((self.max_ocr_side, self.max_ocr_side), Image.LANCZOS)
+                new_ocr[key] = self._extract_text_with_ocr(image)
+            except Exception as e:
+                logger.warning(f"Could not open {image_path} for OCR: {e}")
+
+        new_captions = {}
+        if self.enable_captioning and key not in caption_by_key:
+            new_captions[key] = self._generate_image_caption(data, mime_type)
+
+        ocr_texts, captions = self._merge_image_texts(keys, ocr_by_key, caption_by_key, new_ocr, new_captions)
+        return self._describe_image(page_number, ocr_texts[0], captions[0])
+
+    @property
+    def _ocr_kind(self) -> str:
+        """Cache kind for OCR text, so changing the OCR engine or MAX_OCR_SIDE invalidates it"""
+        if self._paddle is not None:
+            backend = "paddle"
+        elif tesserocr is not None:
+            backend = "tesserocr"
+        else:
+            backend = "pytesseract"
+        return f"ocr:{backend}:{self.max_ocr_side}"
+
+    @property
+    def _caption_kind(self) -> str:
+        """Cache kind for captions, so changing the vision model invalidates them"""
+        return f"caption:{self.vision_model}"
+
+    def _lookup_image_texts(
+        self,
+        images: List[Dict[str, Any]]
+    ) -> Tuple[List[bytes], Dict[bytes, Dict[str, Any]], Dict[bytes, str], Dict[bytes, str]]:
+        """
+        Hash images and look up OCR text and captions already in the cache
+
+        Identical images (and, if IMAGE_PHASH_MAX_DISTANCE is enabled,
+        same-sized images within that many pHash bits) share one
+        representative hash and are only processed once.
+
+        Args:
+            images: Image dictionaries with encoded 'data'
+
+        Returns:
+            Tuple of (representative hash per image, first image per
+            representative hash, cached OCR text by hash, cached caption by hash)
+        """
+        deduplicator = _ImageDeduplicator(self.phash_max_distance)
+        keys, unique = [], {}
+        for img_info in images:
+            key, is_new = deduplicator.add(img_info['data'])
+            keys.append(key)
+            if is_new:
+                unique[key] = img_info
+
+        ocr_by_key, caption_by_key = self._cached_image_texts(list(unique))
+        return keys, unique, ocr_by_key, caption_by_key
+
+    def _cached_image_texts(self, keys: List[bytes]) -> Tuple[Dict[bytes, str], Dict[bytes, str]]:
+        """
+        Look up OCR text and captions already in the cache
+
+        Args:
+            keys: Image hashes
+
+        Returns:
+            Tuple of (cached OCR text by hash, cached caption by hash)
+        """
+        ocr_by_key, caption_by_key = {}, {}
+        if self.text_cache and keys:
+            if self.enable_ocr:
+                ocr_by_key = self.text_cache.get_many(keys, self._ocr_kind)
+            if self.enable_captioning:
+                caption_by_key = self.text_cache.get_many(keys, self._caption_kind)
+
+            cached = len(set(ocr_by_key) | set(caption_by_key))
+            if cached:
+                logger.debug(f"Reusing cached OCR/caption results for {cached} images")
+
+        return ocr_by_key, caption_by_key
+
+    def _merge_image_texts(
+        self,
+        keys: List[bytes],
+        ocr_by_key: Dict[bytes, str],
+        caption_by_key: Dict[bytes, str],
+        new_ocr: Dict[bytes, str],
+        new_captions: Dict[bytes, str]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Cache newly computed results and return the OCR text and caption per image
+
+        Empty results are not cached, so failed OCR or captioning calls are retried.
+
+        Args:
+            keys: Hash per image
+            ocr_by_key: Cached OCR text by hash
+            caption_by_key: Cached captions by hash
+            new_ocr: Freshly computed OCR text by hash
+            new_captions: Freshly computed captions by hash
+
+        Returns:
+            Tuple of (OCR text per image, caption per image)
+        """
+        if self.text_cache:
+            self.text_cache.put_many({k: v for k, v in new_ocr.items() if v and v.strip()}, self._ocr_kind)
+            if self.enable_captioning:
+                self.text_cache.put_many({k: v for k, v in new_captions.items() if v}, self._caption_kind)
+
+        ocr_by_key = {**ocr_by_key, **new_ocr}
+        caption_by_key = {**caption_by_key, **new_captions}
+        return (
+            [ocr_by_key.get(key, "") for key in keys],
+            [caption_by_key.get(key, "") for key in keys]
+        )
+
+    @staticmethod
+    def _describe_image(page_number: Optional[int], ocr_text: str, caption: str) -> str:
+        """
+        Combine an image's OCR text and caption into its indexed description
+
+        Args:
+            page_number: Page number where image was found
+            ocr_text: Text extracted from the image by OCR
+            caption: Caption generated by the vision model
+
         Returns:
             Text description of the image
         """
@@ -164,17 +833,13 @@ class MultimodalProcessor:
         if page_number:
             text_parts.append(f"[Image from Page {page_number}]")
 
-        # Extract text from image using OCR
-        if self.enable_ocr:
-            ocr_text = self._extract_text_with_ocr(image_path)
-            if ocr_text and ocr_text.strip():
-                text_parts.append(f"Text in image: {ocr_text.strip()}")
+        # Text extracted from image using OCR
+        if ocr_text and ocr_text.strip():
+            text_parts.append(f"Text in image: {ocr_text.strip()}")
 
-        # Generate image caption/description
-        if self.enable_captioning:
-            caption = self._generate_image_caption(image_path)
-            if caption:
-                text_parts.append(f"Image description: {caption}")
+        # Image caption/description
+        if caption:
+            text_parts.append(f"Image description: {caption}")
 
         # If no text was extracted, add a placeholder
         if len(text_parts) <= 1:  # Only has page number
@@ -182,35 +847,188 @@ class MultimodalProcessor:
 
         return "\n".join(text_parts)
 
-    def _extract_text_with_ocr(self, image_path: str) -> str:
+    def _extract_text_with_ocr(self, image: Image.Image) -> str:
         """
         Extract text from image using OCR
 
         Args:
-            image_path: Path to image file
+            image: Decoded PIL image
 
         Returns:
             Extracted text
         """
-        if not self.enable_ocr or not self.pytesseract:
+        if not self.enable_ocr:
             return ""
 
+        if self._paddle is not None:
+            try:
+                return self._ocr_with_paddle(image)
+            except Exception as e:
+                if not self._tesseract_available:
+                    logger.warning(f"OCR failed: {e}")
+                    return ""
+                logger.warning(f"PaddleOCR failed, falling back to Tesseract: {e}")
+
         try:
-            image = Image.open(image_path)
-            text = self.pytesseract.image_to_string(image)
-            logger.debug(f"OCR extracted {len(text)} characters from {image_path}")
+            if tesserocr is not None:
+                text = _ocr_with_tesserocr(image)
+            else:
+                text = self.pytesseract.image_to_string(image)
+            logger.debug(f"OCR extracted {len(text)} characters")
             return text
 
         except Exception as e:
-            logger.warning(f"OCR failed for {image_path}: {e}")
+            logger.warning(f"OCR failed: {e}")
             return ""
 
-    def _generate_image_caption(self, image_path: str) -> str:
+    def _extract_text_with_ocr_batch(self, images: List[bytes]) -> List[str]:
+        """
+        Extract text from several images, spreading them over the OCR process pool
+
+        Args:
+            images: Encoded image bytes
+
+        Returns:
+            Extracted text per image, in the same order
+        """
+        return self._collect_ocr_batch(self._submit_ocr_batch(images))
+
+    def _submit_ocr_batch(self, images: List[bytes]) -> List[Tuple[List[bytes], Future]]:
+        """
+        Start extracting text from several images without waiting for the results
+
+        Each pool worker OCRs a contiguous group of images in one Tesseract run.
+        Without a pool (single worker or PaddleOCR) the batch is OCR'd in the
+        calling thread and returned as already-completed futures.
+
+        Args:
+            images: Encoded image bytes
+
+        Returns:
+            List of (image group, future of its texts), in image order
+        """
+        texts = None
+        if not self.enable_ocr:
+            texts = [""] * len(images)
+        elif self._paddle is not None:
+            texts = self._extract_text_with_ocr_batch_gpu(images)
+            if texts is None and not self._tesseract_available:
+                texts = [""] * len(images)
+
+        workers = min(self.ocr_workers, len(images))
+        if texts is None and workers > 1:
+            group_size = -(-len(images) // workers)
+            groups = [images[i:i + group_size] for i in range(0, len(images), group_size)]
+
+            try:
+                executor = self._get_ocr_executor(self.ocr_workers)
+                return [
+                    (group, executor.submit(_ocr_worker, group, self.tesseract_cmd, self.max_ocr_side))
+                    for group in groups
+                ]
+            except Exception as e:
+                logger.warning(f"OCR process pool failed, running OCR in-process: {e}")
+
+        if texts is None:
+            texts = _ocr_worker(images, self.tesseract_cmd, self.max_ocr_side)
+
+        done = Future()
+        done.set_result(texts)
+        return [(images, done)]
+
+    def _collect_ocr_batch(self, pending: List[Tuple[List[bytes], Future]]) -> List[str]:
+        """
+        Wait for OCR started by _submit_ocr_batch, redoing failed groups in-process
+
+        Args:
+            pending: (image group, future of its texts) pairs
+
+        Returns:
+            Extracted text per image, in the order submitted
+        """
+        texts = []
+        for group, future in pending:
+            try:
+                texts.extend(future.result())
+            except Exception as e:
+                logger.warning(f"OCR process pool failed, running OCR in-process: {e}")
+                texts.extend(_ocr_worker(group, self.tesseract_cmd, self.max_ocr_side))
+        return texts
+
+    def _ocr_with_paddle(self, image: Image.Image) -> str:
+        """Run OCR on a decoded image with the GPU PaddleOCR pipeline"""
+        # PaddleOCR expects BGR pixel order
+        pixels = np.asarray(image.convert('RGB'))[:, :, ::-1]
+        with self._paddle_lock:
+            result = self._paddle.ocr(pixels, cls=False)
+
+        lines = result[0] if result else None
+        return "\n".join(line[1][0] for line in lines or [])
+
+    def _extract_text_with_ocr_batch_gpu(self, images: List[bytes]) -> Optional[List[str]]:
+        """
+        Extract text from several images with PaddleOCR on the GPU
+
+        Args:
+            images: Encoded image bytes
+
+        Returns:
+            Extracted text per image, or None if the GPU pipeline failed
+            (e.g. out of memory) and the batch should go to Tesseract
+        """
+        texts = []
+        for i, data in enumerate(images):
+            try:
+                image = Image.open(io.BytesIO(data))
+                image.thumbnail((self.max_ocr_side, self.max_ocr_side), Image.LANCZOS)
+            except Exception as e:
+                logger.warning(f"Could not decode image {i} for OCR: {e}")
+                texts.append("")
+                continue
+
+            try:
+                texts.append(self._ocr_with_paddle(image))
+            except Exception as e:
+                logger.warning(f"PaddleOCR failed, falling back to Tesseract: {e}")
+                return None
+
+        return texts
+
+    def _caption_payload(self, data: bytes, mime_type: str) -> Tuple[bytes, str]:
+        """
+        Prepare image bytes for the vision model
+
+        JPEGs that already fit within MAX_CAPTION_SIDE are sent unchanged;
+        anything else is downsampled and re-encoded as JPEG (quality 85),
+        which keeps the upload well below the size of a full-resolution PNG.
+
+        Args:
+            data: Encoded image bytes
+            mime_type: MIME type of the encoded bytes
+
+        Returns:
+            Tuple of (bytes to send, their MIME type)
+        """
+        image = Image.open(io.BytesIO(data))
+        max_side = self.max_caption_side
+        if mime_type == 'image/jpeg' and max(image.size) <= max_side:
+            return data, mime_type
+
+        image.thumbnail((max_side, max_side), Image.LANCZOS)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=85)
+        return buffer.getvalue(), 'image/jpeg'
+
+    def _generate_image_caption(self, data: bytes, mime_type: str = 'image/png') -> str:
         """
         Generate caption for image using vision model
 
         Args:
-            image_path: Path to image file
+            data: Encoded image bytes
+            mime_type: MIME type of the encoded bytes
 
         Returns:
             Generated caption
@@ -219,40 +1037,61 @@ class MultimodalProcessor:
             return ""
 
         try:
-            # Read and encode image
-            with open(image_path, 'rb') as f:
-                image_data = base64.b64encode(f.read()).decode('utf-8')
-
             # Call vision model
             response = self.vision_client.chat.completions.create(
-                model=self.vision_model,
-                messages=[{
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": "Describe this image in detail. Include any text, charts, diagrams, or important visual elements."
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/png;base64,{image_data}"
-                            }
-                        }
-                    ]
-                }],
-                max_tokens=300,
-                temperature=0.2
+                **self._caption_request(data, mime_type)
             )
 
             caption = response.choices[0].message.content
-            logger.debug(f"Generated caption for {image_path}")
+            logger.debug(f"Generated caption ({mime_type}, {len(data)} bytes)")
             return caption
 
         except Exception as e:
-            logger.warning(f"Image captioning failed for {image_path}: {e}")
+            logger.warning(f"Image captioning failed: {e}")
             return ""
 
+    async def _generate_image_caption_async(self, data: bytes, mime_type: str = 'image/png') -> str:
+        """
+        Generate caption for image using vision model, without blocking the event loop
+
+        Args:
+            data: Encoded image bytes
+            mime_type: MIME type of the encoded bytes
+
+        Returns:
+            Generated caption
+        """
+        if not self.enable_captioning:
+            return ""
+
+        try:
+            request = await asyncio.to_thread(self._caption_request, data, mime_type)
+            response = await self.async_vision_client.chat.completions.create(**request)
+
+            caption = response.choices[0].message.content
+            logger.debug(f"Generated caption ({mime_type}, {len(data)} bytes)")
+            return caption
+
+        except Exception as e:
+            logger.warning(f"Image captioning failed: {e}")
+            return ""
+
+    def _caption_request(self, data: bytes, mime_type: str) -> Dict[str, Any]:
+        """Build the chat completion arguments for captioning an image"""
+        data, mime_type = self._caption_payload(data, mime_type)
+
+        # Only the image part is built per call; the prompt part is shared and never mutated
+        return {
+            **self._caption_request_template,
+            "messages": [{
+                "role": "user",
+                "content": [
+                    _CAPTION_PROMPT_PART,
+                    {"type": "image_url", "image_url": {"url": _data_url(data, mime_type)}}
+                ]
+            }]
+        }
+
     def process_pdf_with_images(
         self,
         pdf_path: str,
@@ -262,6 +1101,145 @@ class MultimodalProcessor:
         """
         Process PDF to extract both text and images, converting images to text
 
+        Images are extracted in a background thread and handed over in chunks,
+        so OCR and captioning of earlier images run while later pages are
+        still being decoded.
+
+        Args:
+            pdf_path: Path to PDF file
+            document_id: Document identifier
+            text_content: Already extracted text content
+
+        Returns:
+            Dictionary with combined content and metadata
+        """
+        images, keys = [], []
+        deduplicator = _ImageDeduplicator(self.phash_max_distance)
+        ocr_by_key, caption_by_key = {}, {}
+        ocr_pending = []
+        caption_futures = {}
+
+        # Enough images per chunk to give every OCR worker a few
+        chunk_size = max(self.ocr_workers, 1) * 4
+
+        for chunk in self._iter_image_chunks(pdf_path, document_id, chunk_size):
+            unique = {}
+            for img_info in chunk:
+                key, is_new = deduplicator.add(img_info['data'])
+                images.append(img_info)
+                keys.append(key)
+                if is_new:
+                    unique[key] = img_info
+
+            chunk_ocr, chunk_captions = self._cached_image_texts(list(unique))
+            ocr_by_key.update(chunk_ocr)
+            caption_by_key.update(chunk_captions)
+
+            # Start the captioning requests and this chunk's OCR, then go back for more images
+            caption_todo = [key for key in unique if self.enable_captioning and key not in chunk_captions]
+            if caption_todo:
+                executor = self._get_caption_executor(self.caption_workers)
+                for key in caption_todo:
+                    caption_futures[key] = executor.submit(
+                        self._generate_image_caption, unique[key]['data'], unique[key]['mime_type']
+                    )
+
+            ocr_todo = [key for key in unique if self.enable_ocr and key not in chunk_ocr]
+            if ocr_todo:
+                ocr_pending.append((ocr_todo, self._submit_ocr_batch([unique[key]['data'] for key in ocr_todo])))
+
+        logger.info(f"Extracted {len(images)} images from PDF")
+
+        if not images:
+            logger.info(f"No images found in PDF {document_id}")
+            return {
+                'content': text_content,
+                'has_images': False,
+                'image_count': 0
+            }
+
+        new_ocr = {}
+        for ocr_todo, pending in ocr_pending:
+            new_ocr.update(zip(ocr_todo, self._collect_ocr_batch(pending)))
+        new_captions = {key: future.result() for key, future in caption_futures.items()}
+
+        ocr_texts, captions = self._merge_image_texts(keys, ocr_by_key, caption_by_key, new_ocr, new_captions)
+
+        return self._combine_image_texts(document_id, text_content, images, ocr_texts, captions)
+
+    def _iter_image_chunks(
+        self,
+        pdf_path: str,
+        document_id: str,
+        chunk_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Extract images in a background thread and yield them in chunks as they arrive
+
+        The producer thread feeds a bounded queue, so at most IMAGE_QUEUE_SIZE
+        extracted images wait for the consumer at any time.
+
+        Args:
+            pdf_path: Path to PDF file
+            document_id: Document identifier
+            chunk_size: Maximum number of images per chunk
+
+        Yields:
+            Lists of image dictionaries, in extraction order
+        """
+        image_queue = queue.Queue(maxsize=_IMAGE_QUEUE_SIZE)
+        stop = threading.Event()
+
+        def put(item: Any) -> bool:
+            # Give up once the consumer has gone away instead of blocking forever
+            while not stop.is_set():
+                try:
+                    image_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            try:
+                for img_info in self.iter_images_from_pdf(pdf_path, document_id):
+                    if not put(img_info):
+                        return
+            finally:
+                put(_END_OF_IMAGES)
+
+        producer = threading.Thread(target=produce, name=f"extract-images-{document_id}", daemon=True)
+        producer.start()
+
+        try:
+            finished = False
+            while not finished:
+                chunk = []
+                while len(chunk) < chunk_size:
+                    item = image_queue.get()
+                    if item is _END_OF_IMAGES:
+                        finished = True
+                        break
+                    chunk.append(item)
+
+                if chunk:
+                    yield chunk
+        finally:
+            stop.set()
+            producer.join()
+
+    async def process_pdf_with_images_async(
+        self,
+        pdf_path: str,
+        document_id: str,
+        text_content: str
+    ) -> Dict[str, Any]:
+        """
+        Async variant of process_pdf_with_images
+
+        Extraction and OCR run in worker threads while the captioning requests
+        are sent concurrently, at most CAPTION_MAX_CONCURRENCY at a time.
+
         Args:
             pdf_path: Path to PDF file
             document_id: Document identifier
@@ -270,8 +1248,7 @@ class MultimodalProcessor:
         Returns:
             Dictionary with combined content and metadata
         """
-        # Extract images
-        images = self.extract_images_from_pdf(pdf_path, document_id)
+        images = await asyncio.to_thread(self.extract_images_from_pdf, pdf_path, document_id)
 
         if not images:
             logger.info(f"No images found in PDF {document_id}")
@@ -281,23 +1258,67 @@ class MultimodalProcessor:
                 'image_count': 0
             }
 
-        # Process each image to text
+        keys, unique, ocr_by_key, caption_by_key = await asyncio.to_thread(self._lookup_image_texts, images)
+        ocr_todo = [key for key in unique if self.enable_ocr and key not in ocr_by_key]
+        caption_todo = [key for key in unique if self.enable_captioning and key not in caption_by_key]
+
+        semaphore = asyncio.Semaphore(self.caption_max_concurrency)
+
+        async def caption(img_info: Dict[str, Any]) -> str:
+            async with semaphore:
+                return await self._generate_image_caption_async(img_info['data'], img_info['mime_type'])
+
+        ocr_results, *caption_results = await asyncio.gather(
+            asyncio.to_thread(self._extract_text_with_ocr_batch, [unique[key]['data'] for key in ocr_todo]),
+            *(caption(unique[key]) for key in caption_todo)
+        )
+        new_ocr = dict(zip(ocr_todo, ocr_results))
+        new_captions = dict(zip(caption_todo, caption_results))
+
+        ocr_texts, captions = await asyncio.to_thread(
+            self._merge_image_texts, keys, ocr_by_key, caption_by_key, new_ocr, new_captions
+        )
+
+        return self._combine_image_texts(document_id, text_content, images, ocr_texts, captions)
+
+    def _combine_image_texts(
+        self,
+        document_id: str,
+        text_content: str,
+        images: List[Dict[str, Any]],
+        ocr_texts: List[str],
+        captions: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Describe each image and append the descriptions to the document text
+
+        Args:
+            document_id: Document identifier
+            text_content: Already extracted text content
+            images: Extracted image dictionaries
+            ocr_texts: OCR text per image
+            captions: Caption per image
+
+        Returns:
+            Dictionary with combined content and metadata
+        """
         image_texts = []
-        for img_info in images:
-            img_text = self.process_image_to_text(
-                img_info['image_path'],
-                img_info['page_number']
-            )
+        for img_info, ocr_text, caption in zip(images, ocr_texts, captions):
+            img_text = self._describe_image(img_info['page_number'], ocr_text, caption)
             image_texts.append(img_text)
 
-            # Update image info with text
+            # Update image info with text; the encoded bytes are no longer needed
             img_info['extracted_text'] = img_text
+            del img_info['data']
 
-        # Combine text and image descriptions
+        # Combine text and image descriptions in one join, copying the page text once
         combined_content = text_content
         if image_texts:
-            combined_content += "\n\n--- Images Found in Document ---\n\n"
-            combined_content += "\n\n".join(image_texts)
+            combined_content = "".join([
+                text_content,
+                "\n\n--- Images Found in Document ---\n\n",
+                "\n\n".join(image_texts)
+            ])
 
         logger.info(f"Processed {len(images)} images from PDF {document_id}")
 
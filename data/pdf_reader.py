@@ -0,0 +1,36 @@
+"""
+Memory-mapped PDF opening for RAG System
+
+pypdf copies the whole file into memory when given a path. Opening it over a
+read-only memory map instead lets the OS page the file in on demand and share
+those pages between worker processes reading the same PDF.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+import mmap
+import os
+from pypdf import PdfReader
+
+
+@contextmanager
+def open_pdf(file_path: str) -> Iterator[PdfReader]:
+    """
+    Open a PDF with pypdf backed by a read-only memory map of the file
+
+    The reader parses lazily, so it must only be used inside the with block.
+
+    Args:
+        file_path: Path to the PDF file
+
+    Yields:
+        PdfReader over the mapped file
+    """
+    with open(file_path, 'rb') as f:
+        # Empty files cannot be mapped; let pypdf raise its usual error
+        if os.fstat(f.fileno()).st_size == 0:
+            yield PdfReader(f)
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield PdfReader(mapped)
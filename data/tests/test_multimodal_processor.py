@@ -0,0 +1,47 @@
+"""
+Tests for the image filtering in MultimodalProcessor
+"""
+
+from types import SimpleNamespace
+import io
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+# The data service uses flat imports (from config import settings, ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from multimodal_processor import MultimodalProcessor
+
+
+def _encode(image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _is_trivial(data: bytes, min_ocr_side: int = 32) -> bool:
+    return MultimodalProcessor._is_trivial_image(SimpleNamespace(min_ocr_side=min_ocr_side), data)
+
+
+def test_bilevel_text_image_is_not_trivial():
+    image = Image.new("1", (400, 120), 1)
+    ImageDraw.Draw(image).text((10, 10), "Revenue grew 12% in Q3 2024", fill=0)
+
+    assert not _is_trivial(_encode(image))
+
+
+def test_solid_fill_is_trivial():
+    assert _is_trivial(_encode(Image.new("L", (400, 120), 255)))
+
+
+def test_image_below_min_side_is_trivial():
+    image = Image.new("1", (400, 20), 1)
+    ImageDraw.Draw(image).line((0, 10, 400, 10), fill=0)
+
+    assert _is_trivial(_encode(image))
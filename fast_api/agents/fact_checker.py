@@ -3,12 +3,14 @@ from typing import TypedDict, List, Dict, Any
 from langgraph.graph import StateGraph, START, END
 from langchain.agents import create_agent
 import asyncio
-import psycopg
+from psycopg_pool import AsyncConnectionPool
 from langchain_ollama import ChatOllama
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.tools import tool
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.prompts import PromptTemplate
 from langchain_tavily import TavilySearch
-from typing_extensions import TypedDict, List, Optional, Dict
+from typing_extensions import TypedDict, List, Optional, Dict, Callable
 from langgraph.graph import START, StateGraph, END
 from langgraph.types import Command
 import json
@@ -18,8 +20,15 @@ from newsapi import NewsApiClient
 from dotenv import load_dotenv
 import os
 import sys
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+import hashlib
+import time
 from ddgs import DDGS
+import re
 import requests
+from requests.adapters import HTTPAdapter
 
 # Load variables from secrets.env
 # Works in both Docker (file mounted at /app/secrets.env) and local dev
@@ -38,6 +47,71 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
+from agents.tool_cache import ToolResultCache, memoize
+
+# region LLM Response Cache
+class CachedLLM:
+    """
+    Wraps a temperature-0 chat model with an exact-match response cache.
+    Prompts are keyed by the SHA-256 of their raw text, so only byte-identical
+    prompts are answered from the cache: a paraphrase, or just different
+    casing ("US" vs "us"), can change the meaning of a claim, and the cached
+    analysis (including its normalised claim) would then be wrong for it.
+    """
+
+    def __init__(self, llm, ttl_seconds: float = 3600.0, maxsize: int = 1024):
+        self.llm = llm
+        self.model_name = getattr(llm, "model", None) or llm.__class__.__name__
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        # key -> (created_at, response), least recently used first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, prompt: str, kind: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{kind}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def _get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created_at, response = entry
+        if self.ttl_seconds and time.time() - created_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    async def ainvoke(self, prompt: str, kind: str, cache_if: Optional[Callable[[Any], bool]] = None):
+        """Answer from the cache or the LLM; responses rejected by cache_if are returned but not cached"""
+        key = self._key(prompt, kind)
+
+        cached = self._get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        response = await self.llm.ainvoke(prompt)
+        if cache_if is None or cache_if(response):
+            self._entries[key] = (time.time(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return response
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+# endregion
+
 # region LangGraph State
 class FactCheckState(TypedDict):
     claim_id: str
@@ -47,19 +121,16 @@ class FactCheckState(TypedDict):
 
     # progressively added fields:
     analyzed_claim: Dict
+    search_plan: List[Dict]
+    raw_verdict: str
     claim_verdict: Dict
     evidence_log: List[Dict]
 
 
-# --- 2. Node Functions (The actual work) ---
-async def analyze_node(state: FactCheckState) -> Command:
-    print("Step 1/4: Analyzing claim...")
-    """Analyse the claim and normalise it if needed + Identify sourcing strategy"""
+# region Prompt Templates
+# Parsed once at import; nodes only fill in the variables
 
-    claim = state["original_claim"]
-    client_context = state["client_context"]
-
-    prompt = f"""
+ANALYZE_PROMPT = PromptTemplate.from_template("""
     You are a fact-checking assistant helping a salesperson prepare for a client presentation.
 
     Analyse the following claim carefully. Also ensure that the claims are specific and unambiguous.
@@ -88,42 +159,18 @@ async def analyze_node(state: FactCheckState) -> Command:
 
     Claim: "{claim}"
     Client Context (for background only): "{client_context}"
-    """
-    response = await llm.ainvoke(prompt)
+    """)
 
-    try:
-        analyzed_claim = json.loads(response.content)
-    except json.JSONDecodeError:
-        # fallback in case the LLM outputs plain text instead of valid JSON
-        analyzed_claim = response.content
-
-    print(f"Claim analysis complete")
-    return Command(
-        update={"analyzed_claim": analyzed_claim}
-    )
-
-async def search_claim(state: FactCheckState) -> FactCheckState:
-    print(f"Step 2/4: Starting search for claim...")
-    """Search for claim with its strategy"""
-    
-    analyzed_claim = state['analyzed_claim']
-    claim = analyzed_claim['claim']
-    strategy = analyzed_claim['analysis']
-    
-    prompt = f"""
+_SEARCH_REQUIREMENTS = """
     You are fact-checking this claim: {claim}
 
     REQUIREMENTS:
-    - Find at least {strategy.get('num_sources_needed', 3)} credible sources
-    - Prioritize these source types: {', '.join(strategy.get('source_types', ['news', 'academic', 'government']))}
-    - Focus on: {', '.join(strategy.get('focus_areas', ['accuracy', 'context']))}
-
-    TOOLS:
-    - Use the web search tools to find sources
-    - Start with simple, broad queries, then refine if needed
-    - Do NOT repeat identical queries for the same tool (same input = same output)
-    - Stop after 5-7 unique searches if you haven't found sufficient reliable information
+    - Find at least {num_sources_needed} credible sources
+    - Prioritize these source types: {source_types}
+    - Focus on: {focus_areas}
+    """
 
+_VERDICT_INSTRUCTIONS = """
     EVALUATION CRITERIA:
     - Assess source credibility (authoritative, recent, primary when possible)
     - Look for corroboration across multiple independent sources
@@ -141,133 +188,338 @@ async def search_claim(state: FactCheckState) -> FactCheckState:
     2. Explanation: A concise explanation of how you arrived at the verdict    
     """
 
-    response = await agent.ainvoke(
-        {"messages": [{"role": "user", "content": prompt}]}
-    )
+# Single verdict call when the planned searches already found enough sources
+VERDICT_PROMPT = PromptTemplate.from_template(_SEARCH_REQUIREMENTS + """
+    Use only the search results below as your sources.
+    """ + _VERDICT_INSTRUCTIONS + """
+    SEARCH RESULTS:
+    {evidence}
+    """)
 
-    tools_evidence = []
+# ReAct agent prompt when more searching is needed
+AGENT_SEARCH_PROMPT = PromptTemplate.from_template(_SEARCH_REQUIREMENTS + """
+    TOOLS:
+    - Use the web search tools to find sources
+    - Start with simple, broad queries, then refine if needed
+    - Do NOT repeat identical queries for the same tool (same input = same output)
+    - Stop after 5-7 unique searches if you haven't found sufficient reliable information
+    """ + _VERDICT_INSTRUCTIONS + """
+    INITIAL SEARCH RESULTS (already gathered - do not repeat these searches):
+    {evidence}
+    """)
 
-    messages = response.get('messages')
-    
-    # --- Part 1: Get the Verdict and Explanation ---
-    # Find the *last* AIMessage that has non-empty content
-    for msg in reversed(messages):
-        # Check type by class name (to avoid import issues)
-        if msg.__class__.__name__ == 'AIMessage' and msg.content:
-            final_ai_message_content = msg.content
-            break
-
-    # --- Part 2: Get the Tools Used (Evidence) ---
-    tool_calls = []
-    # Use a dict to map responses back to calls by their unique ID
-    tool_responses = {} 
-    
-    for msg in messages:
-        # Find the message with the tool *calls*
-        if msg.__class__.__name__ == 'AIMessage' and hasattr(msg, 'tool_calls') and msg.tool_calls:
-            # msg.tool_calls is a list of dicts
-            tool_calls.extend(msg.tool_calls)
-        
-        # Find the messages with tool *responses*
-        if msg.__class__.__name__ == 'ToolMessage':
-            # msg.tool_call_id links it to the original call
-            tool_responses[msg.tool_call_id] = msg.content
-    
-    # Now, combine them into a single evidence log
-    for call in tool_calls:
-        call_id = call.get('id')
-        tools_evidence.append({
-            "tool_called": call.get('name'),
-            "tool_input": call.get('args'),
-            "tool_output": tool_responses.get(call_id, "No response found for this call")
-        })
+# endregion
 
-    print(f"Search complete for {claim}.")
-    return Command(
-        update={"raw_verdict": final_ai_message_content, "evidence_log": tools_evidence}
-    )
 
-async def process_search_result(state: FactCheckState) -> FactCheckState:
-    print("Step 3/4: Processing results...")
-    """Process the result from search_single_claim and update the claim_verdicts list"""
-    raw_verdict = state.get("raw_verdict", {})
-    evidence_log = state.get("evidence_log", [])
-    original_claim = state.get("original_claim", "Unknown Claim")
-    prompt = f"""
-    Verdict: {raw_verdict}
-    Evidence Log: {json.dumps(evidence_log, indent=2)}
-
-    Given this verdict from the agent, determine if the claim should be passed onto a materials generation agent that creates sales presentation materials.
-    Typically, false claims should not be passed on, while true claims can be, as you won't want to create materials based on false information.
-    However, if you believe certain caveats can be used to present the claim accurately, you may choose to pass it on with appropriate notes.
-    At the same time, extract the info in the following JSON format:
-    {{
-        "overall_verdict": "<TRUE/FALSE/CANNOT BE DETERMINED>",
-        "explanation": "<concise explanation>",
-        "main_evidence": [
-            {{
-                "source": "<actual source name or URL>",
-                "summary": "<one line summary of the evidence>"
-            }},
-            ...
-        ],
-        "pass_to_materials_agent": <true/false>
-    }}
-    
-    Do not provide any other text outside the JSON block. Do not write code.
-    """
+# --- 2. Node Functions (The actual work) ---
+def _is_json_response(response) -> bool:
+    """Whether an LLM response's content parses as JSON"""
+    try:
+        json.loads(response.content)
+        return True
+    except (json.JSONDecodeError, TypeError):
+        return False
+
+async def analyze_node(state: FactCheckState) -> Command:
+    print("Step 1/4: Analyzing claim...")
+    """Analyse the claim and normalise it if needed + Identify sourcing strategy"""
+
+    claim = state["original_claim"]
+    client_context = state["client_context"]
+
+    prompt = ANALYZE_PROMPT.format(claim=claim, client_context=client_context)
+    response = await get_cached_llm().ainvoke(prompt, "analyze", cache_if=_is_json_response)
 
-    response = await llm.ainvoke(prompt)
     try:
-        claim_result = json.loads(response.content)
-        
+        analyzed_claim = json.loads(response.content)
     except json.JSONDecodeError:
         # fallback in case the LLM outputs plain text instead of valid JSON
-        claim_result = response.content
-
-    def _normalize_bool(value):
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, str):
-            normalized = value.strip().lower()
-            return normalized in {"true", "yes", "y", "1", "pass", "approve"}
-        if value is None:
-            return None
-        return bool(value)
-
-    def _is_positive_verdict(verdict: str) -> bool:
-        verdict_upper = (verdict or "").upper()
-        return verdict_upper in {
-            "TRUE",
-            "SUPPORTED",
-            "ACCURATE",
-            "VERIFIED",
-            "YES",
-            "PASS",
+        analyzed_claim = response.content
+
+    print(f"Claim analysis complete")
+    return Command(
+        update={"analyzed_claim": analyzed_claim}
+    )
+
+# --- Search planning ---
+# Max search requests in flight at once, to stay within the providers' rate limits
+SEARCH_CONCURRENCY = 8
+
+# Web search always runs; these add sources for the source types the analysis asks for
+DEFAULT_PLAN_TOOLS = ["tavily_search", "duckduckgo_search_text"]
+SOURCE_TYPE_TOOLS = {
+    "news": ["get_news_articles"],
+    "academic": ["search_wikipedia"],
+    "encyclopedia": ["search_wikipedia"],
+    "wiki": ["search_wikipedia"],
+    "government": ["search_wikipedia"],
+}
+
+def _initial_queries(claim: str, strategy: Dict) -> List[str]:
+    """The claim itself, plus the claim narrowed to the first focus area"""
+    queries = [claim]
+    focus_areas = strategy.get('focus_areas') or []
+    if focus_areas:
+        queries.append(f"{claim} {focus_areas[0]}")
+    return queries
+
+def plan_searches(claim: str, strategy: Dict) -> List[Dict]:
+    """
+    Map the analysed sourcing strategy onto a fixed list of tool calls,
+    e.g. [{"tool": "tavily_search", "query": "..."}, {"tool": "get_news_articles", "query": "..."}]
+    """
+    tool_names = list(DEFAULT_PLAN_TOOLS)
+    for source_type in strategy.get('source_types', ['news', 'academic', 'government']):
+        for key, names in SOURCE_TYPE_TOOLS.items():
+            if key in str(source_type).lower():
+                tool_names.extend(name for name in names if name not in tool_names)
+
+    return [
+        {"tool": name, "query": query}
+        for query in _initial_queries(claim, strategy)
+        for name in tool_names
+    ]
+
+async def execute_plan(plan: List[Dict]) -> List[Dict]:
+    """
+    Run every planned search concurrently, instead of waiting for the agent to
+    call the tools one round trip at a time.
+    Failed searches are logged as evidence entries with the error as output.
+    """
+    semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+
+    async def run(call: Dict):
+        async with semaphore:
+            return await asyncio.to_thread(PLAN_SEARCH_SOURCES[call["tool"]], call["query"])
+
+    results = await asyncio.gather(*[run(call) for call in plan], return_exceptions=True)
+
+    return [
+        {
+            "tool_called": call["tool"],
+            "tool_input": {"query": call["query"]},
+            "tool_output": f"Search failed: {result}" if isinstance(result, Exception) else result
         }
+        for call, result in zip(plan, results)
+    ]
 
-    if isinstance(claim_result, dict):
-        verdict_flag = _normalize_bool(claim_result.get("pass_to_materials_agent"))
-        overall_verdict = claim_result.get("overall_verdict")
+def _evidence_sources(evidence_log: List[Dict]) -> set:
+    """Distinct sources (URLs and Wikipedia pages) in an evidence log"""
+    return {item["source"] for entry in evidence_log for item in _evidence_items(entry)}
 
-        if verdict_flag is None:
-            verdict_flag = _is_positive_verdict(overall_verdict)
+async def plan_node(state: FactCheckState) -> Command:
+    print("Step 2/4: Planning searches...")
+    """Turn the analysed strategy into a batch of searches to run in parallel"""
+    analyzed_claim = state['analyzed_claim']
+    plan = plan_searches(analyzed_claim['claim'], analyzed_claim['analysis'])
+    return Command(update={"search_plan": plan})
 
-        if _is_positive_verdict(overall_verdict):
-            verdict_flag = True
+async def search_claim(state: FactCheckState) -> FactCheckState:
+    print(f"Step 2/4: Starting search for claim...")
+    """Search for claim with its strategy"""
+    
+    analyzed_claim = state['analyzed_claim']
+    claim = analyzed_claim['claim']
+    strategy = analyzed_claim['analysis']
+    # The LLM may give this as a string or a range ("5", "3-5")
+    try:
+        num_sources_needed = int(strategy.get('num_sources_needed', 3))
+    except (TypeError, ValueError):
+        num_sources_needed = 3
+
+    # Run the planned searches all at once
+    plan = state.get('search_plan') or plan_searches(claim, strategy)
+    initial_evidence = await execute_plan(plan)
+
+    tools_evidence = list(initial_evidence)
+    prompt_vars = {
+        "claim": claim,
+        "num_sources_needed": num_sources_needed,
+        "source_types": ', '.join(strategy.get('source_types', ['news', 'academic', 'government'])),
+        "focus_areas": ', '.join(strategy.get('focus_areas', ['accuracy', 'context'])),
+        # Compact JSON: fewer prompt tokens and faster to serialize than indent=2
+        "evidence": json.dumps(initial_evidence, separators=(',', ':'), default=str),
+    }
+
+    if len(_evidence_sources(initial_evidence)) >= num_sources_needed:
+        # Enough sources already: one verdict call instead of a multi-turn agent loop
+        prompt = VERDICT_PROMPT.format(**prompt_vars)
+        response = await get_big_llm().ainvoke(prompt)
+        final_ai_message_content = response.content
+
+        print(f"Search complete for {claim}.")
+        return Command(
+            update={"raw_verdict": final_ai_message_content, "evidence_log": tools_evidence}
+        )
+
+    # Not enough coverage: let the agent search further, starting from what was found
+    prompt = AGENT_SEARCH_PROMPT.format(**prompt_vars)
+
+    # Record evidence as each tool returns instead of scanning the finished trace
+    final_ai_message_content = ""
+    async for event in get_agent().astream_events(
+        {"messages": [{"role": "user", "content": prompt}]},
+        version="v2"
+    ):
+        kind = event["event"]
+
+        if kind == "on_tool_end":
+            output = event["data"].get("output")
+            tools_evidence.append({
+                "tool_called": event["name"],
+                "tool_input": event["data"].get("input"),
+                # ToolNode wraps results in a ToolMessage
+                "tool_output": output.content if isinstance(output, ToolMessage) else output
+            })
 
-        claim_result["pass_to_materials_agent"] = bool(verdict_flag)
+        elif kind == "on_chat_model_end":
+            # The last model turn with text is the verdict
+            output = event["data"].get("output")
+            if isinstance(output, AIMessage) and output.content:
+                final_ai_message_content = _message_text(output.content)
 
-        # Ensure optional fields have sensible defaults
-        claim_result.setdefault("main_evidence", [])
-        claim_result.setdefault("explanation", "")
-        if "confidence" not in claim_result:
-            claim_result["confidence"] = 0.85 if claim_result["pass_to_materials_agent"] else 0.5
+    print(f"Search complete for {claim}.")
+    return Command(
+        update={"raw_verdict": final_ai_message_content, "evidence_log": tools_evidence}
+    )
+
+# --- Verdict parsing ---
+VERDICT_PATTERN = re.compile(r"Overall\s+Verdict\W*(CANNOT\s+BE\s+DETERMINED|TRUE|FALSE)", re.IGNORECASE)
+EXPLANATION_PATTERN = re.compile(r"Explanation\W*(.+)", re.IGNORECASE | re.DOTALL)
+URL_PATTERN = re.compile(r"https?://[^\s\"'<>\]\)]+")
+MAX_MAIN_EVIDENCE = 10
+# Tool outputs starting with these are errors or empty results, not evidence
+FAILED_SEARCH_PREFIXES = ("Search failed", "Error", "No Wikipedia page", "Page does not exist")
+
+def _message_text(content) -> str:
+    """Text of a chat message's content, which some providers return as a list of parts"""
+    if isinstance(content, list):
+        return "\n".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+    return str(content or "")
+
+def _evidence_items(entry: Dict) -> List[Dict]:
+    """(source, summary) pairs from one evidence log entry, whichever tool produced it"""
+    output = entry.get("tool_output")
+    if isinstance(output, str) and output.startswith(FAILED_SEARCH_PREFIXES):
+        return []
+
+    if entry.get("tool_called") == "search_wikipedia" and isinstance(output, str) and output:
+        page = entry.get("tool_input", {}).get("query") or entry.get("tool_input", {}).get("page_title")
+        return [{"source": f"Wikipedia: {page}", "summary": output.split("\n")[0][:300]}]
+
+    if isinstance(output, dict):
+        # Tavily: {"results": [{"title", "url", "content"}, ...]}
+        output = output.get("results", [])
+
+    if isinstance(output, list):
+        items = []
+        for result in output:
+            if not isinstance(result, dict):
+                continue
+            url = result.get("url") or result.get("href")
+            if url:
+                items.append({
+                    "source": url,
+                    "summary": (result.get("title") or result.get("description") or result.get("body") or result.get("content") or "")[:300]
+                })
+        return items
+
+    # Agent tool outputs arrive as text; keep the URLs they mention
+    return [{"source": url, "summary": ""} for url in URL_PATTERN.findall(str(output))]
+
+def parse_verdict(raw_verdict: str, evidence_log: List[Dict]) -> Dict:
+    """
+    Turn the search step's "Overall Verdict: ... / Explanation: ..." answer into
+    the verdict record without an LLM call.
+
+    main_evidence only lists sources the verdict text cites (URLs, or Wikipedia
+    pages named in it), with summaries from the evidence log where available.
+    Unlike the old LLM-formatted record, pass_to_materials_agent is True only
+    for a TRUE verdict (no "pass with caveats" for other verdicts), and
+    confidence is fixed at 0.85 when passed and 0.5 otherwise.
+    """
+    match = VERDICT_PATTERN.search(raw_verdict)
+    overall_verdict = " ".join(match.group(1).upper().split()) if match else "CANNOT BE DETERMINED"
+
+    match = EXPLANATION_PATTERN.search(raw_verdict)
+    explanation = (match.group(1) if match else raw_verdict).strip().strip("*").strip()
+
+    cited = [url.rstrip(".,;:") for url in URL_PATTERN.findall(raw_verdict)]
+    verdict_lower = raw_verdict.lower()
+
+    evidence_by_source = {}
+    for entry in evidence_log:
+        for item in _evidence_items(entry):
+            source = item["source"]
+            if source in evidence_by_source:
+                continue
+            page = source[len("Wikipedia: "):] if source.startswith("Wikipedia: ") else ""
+            if source in cited or (page not in ("", "None") and page.lower() in verdict_lower):
+                evidence_by_source[source] = item
+
+    # Cited URLs the log has no summary for (e.g. found by the agent in free text)
+    for url in cited:
+        evidence_by_source.setdefault(url, {"source": url, "summary": ""})
+
+    pass_to_materials_agent = overall_verdict == "TRUE"
+    return {
+        "overall_verdict": overall_verdict,
+        "explanation": explanation,
+        "main_evidence": list(evidence_by_source.values())[:MAX_MAIN_EVIDENCE],
+        "pass_to_materials_agent": pass_to_materials_agent,
+        "confidence": 0.85 if pass_to_materials_agent else 0.5,
+    }
+
+async def process_search_result(state: FactCheckState) -> FactCheckState:
+    print("Step 3/4: Processing results...")
+    """Parse the verdict from the search step into the claim verdict record, without another LLM call"""
+    raw_verdict = _message_text(state.get("raw_verdict", ""))
+    evidence_log = state.get("evidence_log", [])
+
+    claim_result = parse_verdict(raw_verdict, evidence_log)
 
     print("Processed search result for claim.")
     
     return {"claim_verdict": claim_result}
 
+# --- Database connection pool ---
+# Opened on the first save and shared by every verdict written afterwards
+_db_pool: Optional[AsyncConnectionPool] = None
+_db_pool_lock = asyncio.Lock()
+
+async def get_db_pool() -> AsyncConnectionPool:
+    """Return the shared Postgres pool, opening it on first use."""
+    global _db_pool
+    async with _db_pool_lock:
+        if _db_pool is None:
+            pool = AsyncConnectionPool(
+                conninfo=(
+                    f"dbname={os.getenv('POSTGRES_DB')} "
+                    f"user={os.getenv('POSTGRES_USER')} "
+                    f"password={os.getenv('POSTGRES_PASSWORD')} "
+                    f"host={os.getenv('POSTGRES_HOST')} "
+                    f"port={os.getenv('POSTGRES_PORT')}"
+                ),
+                min_size=int(os.getenv("POSTGRES_POOL_MIN_SIZE", "2")),
+                max_size=int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10")),
+                kwargs={"autocommit": True},
+                open=False
+            )
+            await pool.open()
+            _db_pool = pool
+    return _db_pool
+
+async def close_db_pool():
+    """Close the shared Postgres pool, if it was opened."""
+    global _db_pool
+    async with _db_pool_lock:
+        if _db_pool is not None:
+            await _db_pool.close()
+            _db_pool = None
+
 async def save_to_db(state: FactCheckState) -> Command:
     """
     Save the verdict to the database (asynchronously)
@@ -279,13 +531,9 @@ async def save_to_db(state: FactCheckState) -> Command:
     original_claim = state.get("original_claim", "Unknown Claim")
     
     try: 
-        async with await psycopg.AsyncConnection.connect(
-            f"dbname={os.getenv('POSTGRES_DB')} "
-            f"user={os.getenv('POSTGRES_USER')} "
-            f"password={os.getenv('POSTGRES_PASSWORD')} "
-            f"host={os.getenv('POSTGRES_HOST')} "
-            f"port={os.getenv('POSTGRES_PORT')}"
-        ) as aconn:
+        pool = await get_db_pool()
+        # Fail fast like a direct connect would when the database is down
+        async with pool.connection(timeout=10) as aconn:
             # Extract data from verdict
             original_claim = state.get('claim', 'Unknown Claim')
             overall_verdict = str(verdict.get('overall_verdict', 'Cannot be determined')).upper()
@@ -321,6 +569,7 @@ async def save_to_db(state: FactCheckState) -> Command:
 
 # --- 3. Progress Steps (Specific to this agent) ---
 AGENT_PROGRESS_STEPS = [
+    {"value": 40, "text": "Step 2/4: Planning searches..."},
     {"value": 50, "text": "Step 2/4: Searching the web to gain evidence and make a verdict..."},
     {"value": 75, "text": "Step 3/4: Processing results..."},
     {"value": 90, "text": "Step 4/4: Saving verdict..."},
@@ -328,18 +577,22 @@ AGENT_PROGRESS_STEPS = [
 ]
 
 # --- 4. Graph Builder Function ---
+@lru_cache(maxsize=1)
 def get_fact_check_graph():
     """
     Builds and returns the compiled LangGraph agent.
+    Compiled once on first call; every caller shares the same instance.
     """
     graph = StateGraph(FactCheckState)
     graph.add_node("analyze", analyze_node)
+    graph.add_node("plan", plan_node)
     graph.add_node("search", search_claim)
     graph.add_node("process", process_search_result)
     graph.add_node("save", save_to_db)
 
     graph.add_edge(START, "analyze")
-    graph.add_edge("analyze", "search")
+    graph.add_edge("analyze", "plan")
+    graph.add_edge("plan", "search")
     graph.add_edge("search", "process")
     graph.add_edge("process", "save")
     graph.add_edge("save", END)
@@ -347,9 +600,74 @@ def get_fact_check_graph():
     # Return the compiled, runnable agent
     return graph.compile()
 
+async def check_claims(
+    graph,
+    states: List[FactCheckState],
+    batch_size: int = 5,
+    delay_between_batches: float = 0.0
+) -> List[Any]:
+    """
+    Fact-check several claims through the compiled graph with graph.abatch, so
+    their LLM and search calls overlap instead of running claim after claim.
+    Claims are sent in batches of batch_size, optionally pausing between
+    batches to respect provider rate limits.
+    Returns the final state per claim, or the exception that claim raised.
+    """
+    results = []
+    for start in range(0, len(states), batch_size):
+        if start and delay_between_batches:
+            await asyncio.sleep(delay_between_batches)
+        batch = states[start:start + batch_size]
+        results.extend(await graph.abatch(
+            batch,
+            config={"max_concurrency": batch_size},
+            return_exceptions=True
+        ))
+    return results
+
 
 # region TOOLS
 
+# --- Search result cache ---
+# Wikipedia and web results are stable for a day; news changes faster.
+# The database is opened on the first search, not at import
+@lru_cache(maxsize=1)
+def get_tool_cache() -> ToolResultCache:
+    return ToolResultCache(os.getenv("TOOL_CACHE_PATH", os.path.join(PROJECT_ROOT, ".tool_cache.db")))
+
+WIKIPEDIA_CACHE_TTL = 24 * 3600
+WEB_SEARCH_CACHE_TTL = 24 * 3600
+NEWS_CACHE_TTL = 3600
+
+# --- Shared search clients ---
+# Built once and reused so tool calls keep their HTTP connections alive
+# instead of paying a new TCP/TLS handshake per search
+
+@lru_cache(maxsize=1)
+def _wiki_client() -> wikipediaapi.Wikipedia:
+    return wikipediaapi.Wikipedia(
+        user_agent='Rags2Riches-Bot/0.0 (locally-run; yongray.teo.2022@scis.smu.edu.sg)', 
+        language='en'
+    )
+
+@lru_cache(maxsize=1)
+def _news_client() -> NewsApiClient:
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+    return NewsApiClient(api_key=os.getenv("NEWS_API_KEY"), session=session)
+
+@lru_cache(maxsize=1)
+def _tavily_client() -> TavilySearch:
+    return TavilySearch(max_results=5)
+
+# DDGS is not documented as thread-safe, so each worker thread keeps its own
+_ddgs_local = threading.local()
+
+def _ddgs_client() -> DDGS:
+    if not hasattr(_ddgs_local, "client"):
+        _ddgs_local.client = DDGS()
+    return _ddgs_local.client
+
 # --- Wikipedia Page Name ---
 @tool
 async def get_wikipedia_page_name(query: str) -> list:
@@ -366,19 +684,24 @@ async def get_wikipedia_page_name(query: str) -> list:
 
 # --- Wikipedia Search Summary ---
 
+@memoize(get_tool_cache, expire=WIKIPEDIA_CACHE_TTL)
 def _blocking_search_wikipedia(page_title: str) -> str:
     """Internal blocking function for wikipediaapi search."""
     print("Searching Wikipedia (blocking thread)...")
-    wiki = wikipediaapi.Wikipedia(
-        user_agent='Rags2Riches-Bot/0.0 (locally-run; yongray.teo.2022@scis.smu.edu.sg)', 
-        language='en'
-    )
-    page = wiki.page(page_title)
+    page = _wiki_client().page(page_title)
     if page.exists():
         return page.summary
     else:
         return "Page does not exist."
 
+@memoize(get_tool_cache, expire=WIKIPEDIA_CACHE_TTL)
+def _blocking_wikipedia_lookup(query: str) -> str:
+    """Internal blocking function: summary of the best-matching Wikipedia page for a free-text query."""
+    titles = wikipedia.search(query, results=1)
+    if not titles:
+        return "No Wikipedia page found."
+    return _blocking_search_wikipedia(titles[0])
+
 @tool
 async def search_wikipedia(page_title: str) -> str:
     """
@@ -394,6 +717,8 @@ async def search_wikipedia(page_title: str) -> str:
 
 # --- News Articles ---
 
+# Errors come back as an empty list, which is not cached
+@memoize(get_tool_cache, expire=NEWS_CACHE_TTL, cache_if=bool)
 def _blocking_get_news_articles(query: str) -> list:
     """Internal blocking function for NewsAPI fetch."""
     print("Performing News API search (blocking thread)...")
@@ -403,8 +728,7 @@ def _blocking_get_news_articles(query: str) -> list:
         return []
 
     try:
-        newsapi = NewsApiClient(api_key=news_api_key)
-        all_articles = newsapi.get_everything(
+        all_articles = _news_client().get_everything(
             q=query,
             language='en',
             sort_by='relevancy',
@@ -440,11 +764,13 @@ async def get_news_articles(query: str) -> list:
 
 # --- DuckDuckGo Search ---
 
+# Errors come back as a message string, which is not cached
+@memoize(get_tool_cache, expire=WEB_SEARCH_CACHE_TTL, cache_if=lambda results: not isinstance(results, str))
 def _blocking_duckduckgo_search(query: str) -> str:
     """Internal blocking function for DuckDuckGo search."""
     print("Performing DuckDuckGo search (blocking thread)...")
     try:
-        results = DDGS().text(query, max_results=10)
+        results = _ddgs_client().text(query, max_results=10)
         return results
     except Exception as e:
         print(f"DuckDuckGo search error: {e}")
@@ -469,8 +795,7 @@ def _blocking_tavily_search(query: str) -> str:
     """Internal blocking function for Tavily search."""
     print("Performing Tavily search (blocking thread)...")
     try:
-        search = TavilySearch(max_results=5)
-        results = search.run(query)
+        results = _tavily_client().run(query)
         return results
     except Exception as e:
         print(f"Tavily search error: {e}")
@@ -520,13 +845,39 @@ async def query_rag_system(refined_query: str) -> str:
 
 # endregion
 
-llm = ChatOllama(model="llama3.2:3b", temperature=0)
-bigLM = ChatGoogleGenerativeAI(
-    model="gemini-2.5-pro",
-    temperature=0,
-    google_api_key=os.getenv("GOOGLE_API_KEY")
-)
+# --- Models and agent ---
+# Built on first use and then shared, so importing this module stays cheap
+
+@lru_cache(maxsize=1)
+def get_llm() -> ChatOllama:
+    return ChatOllama(model="llama3.2:3b", temperature=0)
+
+@lru_cache(maxsize=1)
+def get_cached_llm() -> CachedLLM:
+    return CachedLLM(
+        get_llm(),
+        ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+    )
+
+@lru_cache(maxsize=1)
+def get_big_llm() -> ChatGoogleGenerativeAI:
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.5-pro",
+        temperature=0,
+        google_api_key=os.getenv("GOOGLE_API_KEY")
+    )
+
+# Blocking search functions that plan entries can name, run concurrently in worker threads
+PLAN_SEARCH_SOURCES = {
+    "duckduckgo_search_text": _blocking_duckduckgo_search,
+    "tavily_search": _blocking_tavily_search,
+    "search_wikipedia": _blocking_wikipedia_lookup,
+    "get_news_articles": _blocking_get_news_articles,
+}
 
 tools = [duckduckgo_search_text, tavily_search, search_wikipedia, get_news_articles, query_rag_system] # Agent needs the search tools, the scraper and the RAG query tool
-agent = create_agent(bigLM, tools)
+
+@lru_cache(maxsize=1)
+def get_agent():
+    return create_agent(get_big_llm(), tools)
 
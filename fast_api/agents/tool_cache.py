@@ -0,0 +1,117 @@
+"""
+Disk cache for the fact checker's search tools
+
+Wikipedia, DuckDuckGo and NewsAPI results only change slowly, so they are
+kept in SQLite keyed by function and arguments, each with its own TTL.
+Repeated queries within a burst of claims (or across retries) then skip the
+network, which also keeps us under Wikipedia's rate limits.
+"""
+
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class ToolResultCache:
+    """SQLite-backed (function, arguments) -> JSON result cache with per-function TTLs"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        # Tool calls run in worker threads, so the connection is shared behind a lock
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tool_results (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, expire: float) -> Optional[Any]:
+        """Return the cached result for key if it is younger than expire seconds, else None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM tool_results WHERE key = ? AND created_at >= ?",
+                (key, time.time() - expire)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, result: Any) -> None:
+        """Store a JSON-serializable result under key"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_results (key, result, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(result, default=str), time.time())
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of stored results"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM tool_results").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "size": size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def memoize(get_cache: Callable[[], ToolResultCache], expire: float, cache_if: Optional[Callable[[Any], bool]] = None):
+    """
+    Decorate a blocking tool function so its results are cached for expire seconds
+
+    Args:
+        get_cache: Returns the cache to use; called on each call, so the
+            database is only opened once a tool actually runs
+        expire: TTL in seconds
+        cache_if: Predicate on the result; results it rejects (e.g. error
+            messages) are returned but not cached
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = get_cache()
+            key = f"{func.__name__}:{json.dumps([args, kwargs], sort_keys=True, default=str)}"
+
+            cached = cache.get(key, expire)
+            if cached is not None:
+                return cached
+
+            result = func(*args, **kwargs)
+            if cache_if is None or cache_if(result):
+                cache.set(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
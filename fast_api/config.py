@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     CHROMADB_HOST: str = "localhost"
     CHROMADB_PORT: int = 8000
     CHROMA_COLLECTION_NAME: str = "rag_documents"
+    CHROMA_DOCUMENTS_COLLECTION_NAME: str = "rag_documents_meta"  # Registry whose index_version marks index changes
 
     # NVIDIA NIM Configuration
     NVIDIA_API_KEY: str = ""
@@ -31,6 +32,12 @@ class Settings(BaseSettings):
     # Query Defaults
     DEFAULT_K: int = 5
 
+    # Response Cache
+    RESPONSE_CACHE_SIZE: int = 1024  # 0 disables the cache
+    RESPONSE_CACHE_SIMILARITY: float = 0.0  # Min cosine similarity for a semantic hit (0 = exact matches only)
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+    RESPONSE_CACHE_VERSION_CHECK_SECONDS: float = 5.0  # How often the data service's index version is re-read
+
     # Evaluation Configuration
     EVAL_OUTPUT_DIR: str = "evaluations"
 
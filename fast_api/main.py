@@ -1,12 +1,15 @@
 import uvicorn
+import asyncio
 import json
+import orjson
+import time
 import uuid
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import os
 from pathlib import Path
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 import logging
 from typing import List, Dict, Any, Optional
@@ -24,6 +27,7 @@ from rag_services.embedding_service import EmbeddingService
 from rag_services.llm_service import LLMService
 from rag_services.rag_service import RAGService
 from rag_services.query_builder import QueryBuilder
+from rag_services.response_cache import ResponseCache
 
 # Configure logging
 logging.basicConfig(level=settings.LOG_LEVEL)
@@ -32,6 +36,10 @@ logger = logging.getLogger(__name__)
 # --- 1. Import agents and their specific types/data ---
 from agents.fact_checker import (
     get_fact_check_graph, 
+    check_claims,
+    close_db_pool,
+    get_cached_llm as get_fact_check_llm,
+    get_tool_cache as get_fact_check_tool_cache,
     FactCheckState, 
     AGENT_PROGRESS_STEPS
 )
@@ -42,24 +50,164 @@ from agents.materials_decision_agent import (
     MaterialsDecisionState
 )
 
-# --- 2. Build agents ONCE at startup ---
-fact_check_agent_app = get_fact_check_graph()
-embedding_service = EmbeddingService()
-llm_service = LLMService()
-rag_service = RAGService(embedding_service, llm_service)
-query_builder = QueryBuilder(rag_service)
+# --- 2. Agents are compiled once, on first use (get_fact_check_graph is cached) ---
 # rag_agent_app = get_rag_graph()
 # marketing_agent_app = get_marketing_graph()
 
+# RAG services load models and connect to ChromaDB, so they are built in the
+# background after startup (or on first use) instead of at import
+embedding_service = None
+llm_service = None
+rag_service = None
+query_builder = None
+_services_lock = asyncio.Lock()
+
+
+async def _warm_services():
+    """Construct the RAG services in worker threads, once"""
+    global embedding_service, llm_service, rag_service, query_builder
+    async with _services_lock:
+        if query_builder is not None:
+            return
+        embedding_service = await asyncio.to_thread(EmbeddingService)
+        llm_service = await asyncio.to_thread(LLMService)
+        rag_service = await asyncio.to_thread(RAGService, embedding_service, llm_service)
+        query_builder = QueryBuilder(rag_service)
+        logger.info("RAG services ready")
+
+
+async def _warm_services_in_background():
+    """Warm the RAG services, leaving a failed attempt to be retried on first use"""
+    try:
+        await _warm_services()
+    except Exception as e:
+        logger.error(f"Failed to initialize RAG services: {e}")
+
+
+async def require_services():
+    """Dependency that waits for the RAG services, building them if needed"""
+    if query_builder is None:
+        await _warm_services()
+
+
+# Cache of RAG responses: exact matches, plus semantic matches if RESPONSE_CACHE_SIMILARITY is set
+response_cache = ResponseCache(
+    maxsize=settings.RESPONSE_CACHE_SIZE,
+    similarity_threshold=settings.RESPONSE_CACHE_SIMILARITY,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS
+) if settings.RESPONSE_CACHE_SIZE else None
+
+# Data service's index version the cached responses were computed against,
+# and when it was last read from ChromaDB
+_cached_index_version = None
+_index_version_checked_at = float("-inf")
+
+
+async def _sync_response_cache() -> bool:
+    """
+    Clear the response cache if documents were added or deleted since it was filled
+
+    The version is read at most every RESPONSE_CACHE_VERSION_CHECK_SECONDS,
+    in a worker thread so the event loop is not blocked.
+
+    Returns:
+        Whether the cache can be used; False while the index version is unknown
+    """
+    global _cached_index_version, _index_version_checked_at
+    now = time.monotonic()
+    if now - _index_version_checked_at >= settings.RESPONSE_CACHE_VERSION_CHECK_SECONDS:
+        _index_version_checked_at = now
+        version = await asyncio.to_thread(rag_service.index_version)
+        if version is None or version != _cached_index_version:
+            response_cache.clear()
+        _cached_index_version = version
+
+    return _cached_index_version is not None
+
+
+def _is_grounded(result: Dict[str, Any]) -> bool:
+    """Whether a response was answered from retrieved documents, rather than a fallback message"""
+    return bool(result.get("sources") or result.get("results_count"))
+
+
+async def _cached_query(query: str, params: tuple, run) -> Dict[str, Any]:
+    """
+    Serve a RAG response from the response cache, or run the query and cache it
+
+    Only responses backed by retrieved documents are cached, so "no documents"
+    answers are not replayed once documents are indexed. While the index
+    version cannot be read, the cache is bypassed.
+
+    Args:
+        query: User query
+        params: Request parameters the response depends on
+        run: Callable taking the query embedding (or None) and returning the response
+    """
+    if response_cache is None or not await _sync_response_cache():
+        return run(None)
+
+    semantic = settings.RESPONSE_CACHE_SIMILARITY > 0
+
+    cached = response_cache.get_exact(query, params, count_miss=not semantic)
+    if cached is not None:
+        return cached
+
+    query_embedding = None
+    if semantic:
+        # The embedding is reused by the retrieval step on a miss
+        query_embedding = embedding_service.embed_text(query)
+        cached = response_cache.get_similar(query_embedding, params)
+        if cached is not None:
+            return cached
+
+    result = run(query_embedding)
+    if _is_grounded(result):
+        response_cache.put(query, params, result, query_embedding)
+    return result
+
+
 # --- 3. Create the FastAPI app ---
-app = FastAPI()
+# orjson serializes the nested sources lists (and numpy scores) much faster than json
+app = FastAPI(default_response_class=ORJSONResponse)
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Start warming the RAG services without delaying startup"""
+    app.state.warm_task = asyncio.create_task(_warm_services_in_background())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the fact checker's database connections"""
+    await close_db_pool()
 
 # Ensure generated content directory exists and mount it for static serving
 GENERATED_CONTENT_DIR = Path(__file__).resolve().parent / "generated_content"
 GENERATED_CONTENT_DIR.mkdir(parents=True, exist_ok=True)
 app.mount("/generated_content", StaticFiles(directory=GENERATED_CONTENT_DIR), name="generated_content")
 
-# CORS middleware
+@app.middleware("http")
+async def add_elapsed_header(request: Request, call_next):
+    """
+    Stamp each response with the time spent handling the request
+
+    Unexpected endpoint errors are logged and turned into a 500 here rather
+    than in an exception handler, which would run outside this and the CORS
+    middleware and so return the error without their headers.
+    """
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception as exc:
+        logger.exception(f"Error processing {request.method} {request.url.path}")
+        response = ORJSONResponse(status_code=500, content={"detail": str(exc)})
+    response.headers["X-Elapsed-ms"] = f"{(time.perf_counter() - start) * 1000:.1f}"
+    return response
+
+
+# CORS middleware; added last so it wraps the timing middleware and also
+# covers the 500 responses produced there
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -74,6 +222,13 @@ class FactCheckRequest(BaseModel):
     salesperson_id: str
     client_context: str
 
+class BatchFactCheckRequest(BaseModel):
+    claims: List[str]
+    salesperson_id: str
+    client_context: str
+    batch_size: int = Field(5, ge=1, description="Claims fact-checked concurrently")
+    delay_between_batches: float = Field(0.0, ge=0, description="Seconds to wait between batches")
+
 class RAGQueryRequest(BaseModel):
     query: str = Field(..., description="The question to ask")
     k: Optional[int] = Field(None, description="Number of documents to retrieve")
@@ -94,6 +249,10 @@ class MaterialsRequest(BaseModel):
 # (Define other request models for RAG, Marketing, etc.)
 
 # --- 5. Define the Streaming Generator ---
+def _ndjson_line(data: Dict[str, Any]) -> bytes:
+    """Serialize one progress/result message as a newline-terminated JSON line"""
+    return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
 async def stream_fact_check(initial_state: FactCheckState):
     """
     This generator function runs the agent and yields progress 
@@ -103,10 +262,10 @@ async def stream_fact_check(initial_state: FactCheckState):
         update_count = 0
         final_state = None
         # Use the imported agent app
-        async for update in fact_check_agent_app.astream(initial_state):
+        async for update in get_fact_check_graph().astream(initial_state):
             progress_data = AGENT_PROGRESS_STEPS[update_count].copy()
             progress_data["type"] = "progress"
-            yield f"{json.dumps(progress_data)}\n"
+            yield _ndjson_line(progress_data)
             update_count += 1
             final_state = update
         
@@ -119,7 +278,7 @@ async def stream_fact_check(initial_state: FactCheckState):
             "status_code": 200,
             "final_verdict": claim_verdict
         }
-        yield f"{json.dumps(final_update)}\n"
+        yield _ndjson_line(final_update)
 
     except Exception as e:
         final_update = {
@@ -127,7 +286,7 @@ async def stream_fact_check(initial_state: FactCheckState):
             "status_code": 500,
             "error": f"Agent failed: {str(e)}"
         }
-        yield f"{json.dumps(final_update)}\n"
+        yield _ndjson_line(final_update)
 
 # --- 6. Define the API Endpoint ---
 @app.post("/check-claim")
@@ -151,44 +310,104 @@ async def check_claim_endpoint(request: FactCheckRequest):
         media_type="application/x-ndjson"
     )
 
-@app.post("/query_rag")
+@app.post("/check-claims")
+async def check_claims_endpoint(request: BatchFactCheckRequest):
+    """
+    Fact-check several claims at once, returning every verdict when all are done
+    """
+    initial_states = [
+        FactCheckState(
+            claim_id=str(uuid.uuid4()),
+            original_claim=claim,
+            salesperson_id=request.salesperson_id,
+            client_context=request.client_context,
+            analyzed_claim="",
+            claim_verdict={},
+            evidence_log=[],
+        )
+        for claim in request.claims
+    ]
+
+    final_states = await check_claims(
+        get_fact_check_graph(),
+        initial_states,
+        batch_size=request.batch_size,
+        delay_between_batches=request.delay_between_batches
+    )
+
+    results = []
+    for state, final_state in zip(initial_states, final_states):
+        if isinstance(final_state, Exception):
+            results.append({
+                "claim_id": state["claim_id"],
+                "claim": state["original_claim"],
+                "status_code": 500,
+                "error": f"Agent failed: {str(final_state)}"
+            })
+        else:
+            results.append({
+                "claim_id": state["claim_id"],
+                "claim": state["original_claim"],
+                "status_code": 200,
+                "final_verdict": final_state.get("claim_verdict")
+            })
+
+    return {"results": results}
+
+@app.post("/query_rag", dependencies=[Depends(require_services)])
 async def query(request: RAGQueryRequest):
     """
     Answer a question using RAG (Retrieval-Augmented Generation)
 
     Retrieves relevant documents from the vector database and uses an LLM to generate an answer.
     """
-    try:
-        result = rag_service.query(
+    return await _cached_query(
+        request.query,
+        ("query_rag", request.k, request.include_sources),
+        lambda query_embedding: rag_service.query(
             query=request.query,
             k=request.k,
-            include_sources=request.include_sources
+            include_sources=request.include_sources,
+            query_embedding=query_embedding
         )
-        return result
-    except Exception as e:
-        logger.error(f"Error processing query: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    )
     
-@app.post("/query_rag/builder")
+@app.post("/query_rag/builder", dependencies=[Depends(require_services)])
 async def query_with_builder(request: BuilderQueryRequest):
     """
     Execute a structured query with filters and advanced options
 
     Allows filtering by metadata, setting score thresholds, and more control over results.
     """
-    try:
-        result = query_builder.build_query(
+    return await _cached_query(
+        request.query,
+        (
+            "query_rag/builder",
+            json.dumps(request.filters, sort_keys=True, default=str),
+            request.k,
+            request.score_threshold,
+            request.include_sources
+        ),
+        lambda query_embedding: query_builder.build_query(
             query=request.query,
             filters=request.filters,
             k=request.k,
             score_threshold=request.score_threshold,
-            include_sources=request.include_sources
+            include_sources=request.include_sources,
+            query_embedding=query_embedding
         )
-        return result
-    except Exception as e:
-        logger.error(f"Error processing builder query: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    )
     
+@app.get("/health")
+async def health():
+    """Report whether the RAG services are ready, with response, LLM and search cache hit rates"""
+    return {
+        "status": "healthy" if query_builder is not None else "starting",
+        "response_cache": response_cache.stats() if response_cache else None,
+        "fact_check_llm_cache": get_fact_check_llm().stats(),
+        "fact_check_tool_cache": get_fact_check_tool_cache().stats()
+    }
+
 @app.post("/generate-materials")
 async def generate_materials_endpoint(request: MaterialsRequest):
     """
@@ -8,6 +8,7 @@ This module provides Retrieval-Augmented Generation (RAG) functionality includin
 - Query building and filtering
 - Cross-encoder reranking
 - Evaluation metrics (LLM-as-judge and non-LLM)
+- Exact and semantic response caching
 """
 
 from .embedding_service import EmbeddingService
@@ -15,11 +16,13 @@ from .llm_service import LLMService
 from .rag_service import RAGService
 from .query_builder import QueryBuilder
 from .rag_evaluators import RAGEvaluator
+from .response_cache import ResponseCache
 
 __all__ = [
     "EmbeddingService",
     "LLMService",
     "RAGService",
     "QueryBuilder",
-    "RAGEvaluator"
+    "RAGEvaluator",
+    "ResponseCache"
 ]
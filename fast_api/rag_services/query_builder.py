@@ -49,7 +49,8 @@ class QueryBuilder:
         filters: Optional[Dict[str, Any]] = None,
         k: Optional[int] = None,
         score_threshold: Optional[float] = None,
-        include_sources: bool = True
+        include_sources: bool = True,
+        query_embedding: Optional[List[float]] = None
     ) -> Dict[str, Any]:
         """
         Build and execute a structured query with filters
@@ -60,6 +61,7 @@ class QueryBuilder:
             k: Number of results to return
             score_threshold: Minimum similarity score (0.0-1.0)
             include_sources: Whether to include source documents
+            query_embedding: Precomputed embedding of query, if the caller already has one
 
         Returns:
             Query results with answer and sources
@@ -72,7 +74,8 @@ class QueryBuilder:
                 query=query,
                 filters=filters,
                 k=k,
-                score_threshold=score_threshold
+                score_threshold=score_threshold,
+                query_embedding=query_embedding
             )
 
             if not search_results:
@@ -120,7 +123,8 @@ class QueryBuilder:
         query: str,
         filters: Optional[Dict[str, Any]] = None,
         k: Optional[int] = None,
-        score_threshold: Optional[float] = None
+        score_threshold: Optional[float] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Perform search with metadata filters and score threshold
@@ -130,12 +134,13 @@ class QueryBuilder:
             filters: Metadata filters
             k: Number of results
             score_threshold: Minimum score threshold
+            query_embedding: Precomputed embedding of query
 
         Returns:
             Filtered search results
         """
         # Get initial search results
-        results = self.rag_service.search(query, k)
+        results = self.rag_service.search(query, k, query_embedding=query_embedding)
 
         # Apply metadata filters if provided
         if filters:
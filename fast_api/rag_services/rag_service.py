@@ -1,5 +1,5 @@
 import chromadb
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 from sentence_transformers import CrossEncoder
 from config import settings
@@ -42,13 +42,19 @@ class RAGService:
             logger.warning(f"Collection {settings.CHROMA_COLLECTION_NAME} not found, will be created by CRUD service")
             self.collection = None
 
-    def search(self, query: str, k: int = None) -> List[Dict[str, Any]]:
+    def search(
+        self,
+        query: str,
+        k: int = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Perform similarity search in the vector database, followed by re-ranking.
 
         Args:
             query: Search query string
             k: Number of *initial* results to retrieve (before re-ranking)
+            query_embedding: Precomputed embedding of query, if the caller already has one
 
         Returns:
             List of re-ranked and filtered search results
@@ -62,7 +68,8 @@ class RAGService:
 
         try:
             # Generate query embedding
-            query_embedding = self.embedding_service.embed_text(query)
+            if query_embedding is None:
+                query_embedding = self.embedding_service.embed_text(query)
 
             # Search in ChromaDB
             results = self.collection.query(
@@ -149,7 +156,13 @@ class RAGService:
             logger.error(f"Error during search: {e}")
             raise
 
-    def query(self, query: str, k: int = None, include_sources: bool = True) -> Dict[str, Any]:
+    def query(
+        self,
+        query: str,
+        k: int = None,
+        include_sources: bool = True,
+        query_embedding: Optional[List[float]] = None
+    ) -> Dict[str, Any]:
         """
         Perform RAG query: retrieve, re-rank, and generate.
 
@@ -157,6 +170,7 @@ class RAGService:
             query: User's question
             k: Number of *initial* documents to retrieve
             include_sources: Whether to include source documents in response
+            query_embedding: Precomputed embedding of query, if the caller already has one
 
         Returns:
             Dictionary containing answer and optionally sources
@@ -170,7 +184,7 @@ class RAGService:
         try:
             # Retrieve and re-rank relevant documents
             initial_k = k or settings.DEFAULT_INITIAL_K
-            search_results = self.search(query, k=initial_k)
+            search_results = self.search(query, k=initial_k, query_embedding=query_embedding)
 
             if not search_results:
                 return {
@@ -235,6 +249,20 @@ class RAGService:
             logger.error(f"Error during RAG query: {e}")
             raise
 
+    def index_version(self) -> Optional[str]:
+        """
+        Return the marker the data service changes whenever documents are added or deleted
+
+        Returns:
+            The registry's index_version, or None if it cannot be read
+        """
+        try:
+            registry = self.chroma_client.get_collection(name=settings.CHROMA_DOCUMENTS_COLLECTION_NAME)
+            return (registry.metadata or {}).get("index_version")
+        except Exception as e:
+            logger.debug(f"Could not read index version: {e}")
+            return None
+
     def health_check(self) -> bool:
         """
         Check if ChromaDB connection is healthy
@@ -0,0 +1,172 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import hashlib
+import logging
+import threading
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Two-tier LRU cache of RAG responses
+
+    The exact tier matches the canonicalized query text (lowercased, whitespace
+    collapsed); the semantic tier matches queries whose embedding has cosine
+    similarity above a threshold with a cached query. Both tiers only match
+    entries made with the same request parameters (k, filters, ...).
+    """
+
+    def __init__(self, maxsize: int = 1024, similarity_threshold: float = 0.97, ttl_seconds: float = 300.0):
+        self.maxsize = maxsize
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        # (query hash, params) -> (created_at, response)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+        # Unit query embeddings, row-aligned with _vector_keys
+        self._vectors: Optional[np.ndarray] = None
+        self._vector_keys: List[Tuple[str, Hashable]] = []
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _query_hash(query: str) -> str:
+        """SHA-256 of the lowercased, whitespace-normalized query"""
+        canonical = " ".join(query.lower().split())
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _fresh(self, key: Tuple[str, Hashable]) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key if present and unexpired, marking it recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        created_at, response = entry
+        if self.ttl_seconds and time.time() - created_at > self.ttl_seconds:
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    def _remove(self, key: Tuple[str, Hashable]) -> None:
+        """Drop an entry from both tiers"""
+        self._entries.pop(key, None)
+        if key in self._vector_keys:
+            row = self._vector_keys.index(key)
+            del self._vector_keys[row]
+            self._vectors = np.delete(self._vectors, row, axis=0)
+
+    def get_exact(self, query: str, params: Hashable, count_miss: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Look up a response by canonicalized query text
+
+        Args:
+            query: User query
+            params: Hashable request parameters the response depends on
+            count_miss: Count a failed lookup as a miss (when no semantic lookup follows)
+
+        Returns:
+            Cached response, or None
+        """
+        with self._lock:
+            response = self._fresh((self._query_hash(query), params))
+            if response is not None:
+                self.exact_hits += 1
+            elif count_miss:
+                self.misses += 1
+            return response
+
+    def get_similar(self, embedding: List[float], params: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Look up a response for the nearest cached query embedding
+
+        Args:
+            embedding: Query embedding
+            params: Hashable request parameters the response depends on
+
+        Returns:
+            Cached response if a query with the same params is within the
+            similarity threshold, otherwise None (counted as a miss)
+        """
+        with self._lock:
+            if self._vectors is not None and len(self._vector_keys):
+                q = np.asarray(embedding, dtype=np.float32)
+                q = q / max(float(np.linalg.norm(q)), 1e-12)
+
+                sims = self._vectors @ q
+                same_params = np.fromiter(
+                    (key[1] == params for key in self._vector_keys), dtype=bool, count=len(self._vector_keys)
+                )
+                sims[~same_params] = -1.0
+
+                best = int(sims.argmax())
+                if sims[best] >= self.similarity_threshold:
+                    response = self._fresh(self._vector_keys[best])
+                    if response is not None:
+                        self.semantic_hits += 1
+                        return response
+
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        query: str,
+        params: Hashable,
+        response: Dict[str, Any],
+        embedding: Optional[List[float]] = None
+    ) -> None:
+        """
+        Store a response in the exact tier and, if an embedding is given, the semantic tier
+
+        Args:
+            query: User query
+            params: Hashable request parameters the response depends on
+            response: Response to cache
+            embedding: Query embedding
+        """
+        key = (self._query_hash(query), params)
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.time(), response)
+
+            if embedding is not None:
+                vector = np.asarray(embedding, dtype=np.float32)
+                vector = vector / max(float(np.linalg.norm(vector)), 1e-12)
+                if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                    self._vectors = np.empty((0, vector.shape[0]), dtype=np.float32)
+                    self._vector_keys = []
+                self._vectors = np.vstack([self._vectors, vector])
+                self._vector_keys.append(key)
+
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after the underlying index changed"""
+        with self._lock:
+            self._entries.clear()
+            self._vectors = None
+            self._vector_keys = []
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.exact_hits + self.semantic_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0
+            }